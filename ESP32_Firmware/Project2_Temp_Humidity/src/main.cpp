@@ -27,6 +27,12 @@ DHTesp dht;
 WiFiClient espClient;
 PubSubClient client(espClient);
 
+// Presence: retained "online" on connect and as heartbeat, "offline" as Last Will
+const char* PRESENCE_TOPIC = "boards/weather/status";
+const char* BOARD_ID = "weather";  // Answers "status_request weather #<id>"
+const unsigned long HEARTBEAT_INTERVAL = 30000;  // Heartbeat every 30 s
+unsigned long lastHeartbeat = 0;
+
 // Thresholds with safe defaults
 float temp_threshold = 30.0;
 float hum_threshold = 70.0;
@@ -140,9 +146,16 @@ void callback(char* topic, byte* payload, unsigned int length) {
     systemActive = false;
     Serial.println("System Deactivated ");
   }
-  if (String(topic) == STATUS_REQUEST_TOPIC && message == "status_request") {
+  String addressed = String("status_request ") + BOARD_ID;
+  if (String(topic) == STATUS_REQUEST_TOPIC && (message == "status_request" || message.startsWith(addressed + " #"))) {
     systemActive = true;
-    client.publish(STATUS_RESPONSE_TOPIC, "Board : ESP32 Status : Connected");
+    // A bare request gets the bare reply; an addressed one names this board and
+    // echoes the " #<id>" token, so the dashboard matches it to the request
+    String reply = "Board : ESP32 Status : Connected";
+    if (message != "status_request") {
+      reply += String(" @") + BOARD_ID + message.substring(addressed.length());
+    }
+    client.publish(STATUS_RESPONSE_TOPIC, reply.c_str());
     Serial.println("System activated by status request");
   }
   else if (String(topic) == THRESHOLD_TOPIC) {
@@ -154,8 +167,11 @@ void callback(char* topic, byte* payload, unsigned int length) {
 void reconnect() {
   while (!client.connected()) {
     Serial.print("MQTT connection...");
-    if (client.connect("ESP32Client", mqtt_username, mqtt_password)) {
+    if (client.connect("ESP32Client", mqtt_username, mqtt_password,
+                       PRESENCE_TOPIC, 1, true, "offline")) {
       Serial.println("connected!");
+      client.publish(PRESENCE_TOPIC, "online", true);  // Birth message
+      lastHeartbeat = millis();
       client.subscribe(STATUS_REQUEST_TOPIC);
       client.subscribe(THRESHOLD_TOPIC);
     } else {
@@ -187,6 +203,13 @@ void loop() {
     reconnect();
   }
   client.loop();
+
+  // Heartbeat refreshes the retained presence message
+  if (client.connected() && millis() - lastHeartbeat >= HEARTBEAT_INTERVAL) {
+    client.publish(PRESENCE_TOPIC, "online", true);
+    lastHeartbeat = millis();
+  }
+
   check_buzzer();
 
   // Only run main logic if system is active
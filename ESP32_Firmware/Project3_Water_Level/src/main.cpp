@@ -30,6 +30,12 @@ const int echoPin  = 23;  // Ultrasonic sensor echo
 WiFiClient espClient;
 PubSubClient mqttClient(espClient);
 
+// Presence: retained "online" on connect and as heartbeat, "offline" as Last Will
+const char* mqttTopicPresence = "boards/water_level/status";
+const char* boardId = "water_level";  // Answers "status_request water_level #<id>"
+const unsigned long heartbeatInterval = 30000;  // Heartbeat every 30 s
+unsigned long lastHeartbeat = 0;
+
 // Last publish time for rate limiting
 unsigned long lastPublishTime = 0;
 const int publishInterval = 500;  // 500ms between publishes
@@ -68,9 +74,16 @@ void handleMQTTCallback(char* topic, byte* payload, unsigned int length) {
         systemActive = false;
         Serial.println("System Deactivated ");
     }
-    if (topicStr == mqttTopicRequest && message == "status_request") {
+    String addressed = String("status_request ") + boardId;
+    if (topicStr == mqttTopicRequest && (message == "status_request" || message.startsWith(addressed + " #"))) {
         systemActive = true;
-        mqttClient.publish(mqttTopicResponse, "Board : ESP32 Status : Connected");
+        // A bare request gets the bare reply; an addressed one names this board and
+        // echoes the " #<id>" token, so the dashboard matches it to the request
+        String reply = "Board : ESP32 Status : Connected";
+        if (message != "status_request") {
+            reply += String(" @") + boardId + message.substring(addressed.length());
+        }
+        mqttClient.publish(mqttTopicResponse, reply.c_str());
         Serial.println("System activated by status request");
     } 
     if(systemActive){
@@ -115,8 +128,11 @@ void reconnectMQTT() {
         Serial.print("Attempting MQTT connection...");
         String clientId = "ESP32Client-" + String(random(0xffff), HEX);
         
-        if (mqttClient.connect(clientId.c_str(), mqttUsername, mqttPassword)) {
+        if (mqttClient.connect(clientId.c_str(), mqttUsername, mqttPassword,
+                               mqttTopicPresence, 1, true, "offline")) {
             Serial.println("Connected to MQTT broker");
+            mqttClient.publish(mqttTopicPresence, "online", true);  // Birth message
+            lastHeartbeat = millis();
             mqttClient.subscribe(mqttTopicSensorControl);
             mqttClient.subscribe(mqttTopicSensor);
             mqttClient.subscribe(mqttTopicRequest);
@@ -176,6 +192,12 @@ void loop() {
         reconnectMQTT();
     }
     mqttClient.loop();
+
+    // Heartbeat refreshes the retained presence message
+    if (mqttClient.connected() && millis() - lastHeartbeat >= heartbeatInterval) {
+        mqttClient.publish(mqttTopicPresence, "online", true);
+        lastHeartbeat = millis();
+    }
     
     // Measure and publish water level if system is active
     if (systemActive) {
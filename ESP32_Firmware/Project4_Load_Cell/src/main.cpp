@@ -26,6 +26,12 @@ const char* mqttTopicResponse = "mqtt/response";
 WiFiClient espClient;
 PubSubClient client(espClient);
 
+// Presence: retained "online" on connect and as heartbeat, "offline" as Last Will
+const char* mqttTopicPresence = "boards/load_cell/status";
+const char* boardId = "load_cell";  // Answers "status_request load_cell #<id>"
+const unsigned long heartbeatInterval = 30000;  // Heartbeat every 30 s
+unsigned long lastHeartbeat = 0;
+
 unsigned long lastMsg = 0;
 float loadCellValue = 0;
 const int numUpdates = 100; // Number of LoadCell.update() calls before publishing
@@ -71,9 +77,16 @@ void callback(char* topic, byte* payload, unsigned int length) {
         systemActive = false;
         Serial.println("System Deactivated ");
     }
-    if (topicStr == mqttTopicRequest && message == "status_request") {
+    String addressed = String("status_request ") + boardId;
+    if (topicStr == mqttTopicRequest && (message == "status_request" || message.startsWith(addressed + " #"))) {
         systemActive = true;
-        client.publish(mqttTopicResponse, "Board : ESP32 Status : Connected");
+        // A bare request gets the bare reply; an addressed one names this board and
+        // echoes the " #<id>" token, so the dashboard matches it to the request
+        String reply = "Board : ESP32 Status : Connected";
+        if (message != "status_request") {
+            reply += String(" @") + boardId + message.substring(addressed.length());
+        }
+        client.publish(mqttTopicResponse, reply.c_str());
         Serial.println("System activated by status request");
     }
 }
@@ -85,8 +98,11 @@ void reconnect() {
     clientId += String(random(0xffff), HEX);
 
     // Connect with username and password
-    if (client.connect(clientId.c_str(), mqtt_username, mqtt_password)) {
+    if (client.connect(clientId.c_str(), mqtt_username, mqtt_password,
+                       mqttTopicPresence, 1, true, "offline")) {
       Serial.println("Connected");
+      client.publish(mqttTopicPresence, "online", true);  // Birth message
+      lastHeartbeat = millis();
       client.subscribe("mqtt/request");  // Add this line to subscribe to status requests
       client.subscribe ("mqtt/responce");
       client.subscribe("arduino/LoadCell"); // Subscribe to the LoadCell topic
@@ -132,6 +148,13 @@ void loop() {
     reconnect();
   }
   client.loop();
+
+  // Heartbeat refreshes the retained presence message
+  if (client.connected() && millis() - lastHeartbeat >= heartbeatInterval) {
+    client.publish(mqttTopicPresence, "online", true);
+    lastHeartbeat = millis();
+  }
+
     if (systemActive) {
       // Read load cell data and publish after 5 updates
       unsigned long now = millis();
@@ -19,6 +19,12 @@ const char* mqtt_topic = "arduino/MPU6050";
 
 WiFiClient espClient;
 PubSubClient client(espClient);
+
+// Presence: retained "online" on connect and as heartbeat, "offline" as Last Will
+const char* presence_topic = "boards/accelerometer/status";
+const char* board_id = "accelerometer";  // Answers "status_request accelerometer #<id>"
+const unsigned long heartbeat_interval = 30000;  // Heartbeat every 30 s
+unsigned long lastHeartbeat = 0;
 Adafruit_MPU6050 mpu;
 
 unsigned long lastMsg = 0;
@@ -65,10 +71,17 @@ void callback(char* topic, byte* payload, unsigned int length) {
         systemActive = false;
         Serial.println("System Deactivated ");
     }
-  if (String(topic) == "mqtt/request" && message == "status_request") {
+  String addressed = String("status_request ") + board_id;
+  if (String(topic) == "mqtt/request" && (message == "status_request" || message.startsWith(addressed + " #"))) {
     systemActive = true;
 
-    client.publish("mqtt/response", "Board : ESP32 Status : Connected");
+    // A bare request gets the bare reply; an addressed one names this board and
+    // echoes the " #<id>" token, so the dashboard matches it to the request
+    String reply = "Board : ESP32 Status : Connected";
+    if (message != "status_request") {
+      reply += String(" @") + board_id + message.substring(addressed.length());
+    }
+    client.publish("mqtt/response", reply.c_str());
     return;  // Exit after handling the status request
   }
 }
@@ -80,8 +93,11 @@ void reconnect() {
     clientId += String(random(0xffff), HEX);
 
     // Connect with username and password
-    if (client.connect(clientId.c_str(), mqtt_username, mqtt_password)) {
+    if (client.connect(clientId.c_str(), mqtt_username, mqtt_password,
+                       presence_topic, 1, true, "offline")) {
       Serial.println("Connected");
+      client.publish(presence_topic, "online", true);  // Birth message
+      lastHeartbeat = millis();
       client.subscribe("mqtt/request");  // Add this line to subscribe to status requests
     } else {
       Serial.print("failed, rc=");
@@ -126,6 +142,13 @@ void loop() {
     reconnect();
   }
   client.loop();
+
+  // Heartbeat refreshes the retained presence message
+  if (client.connected() && millis() - lastHeartbeat >= heartbeat_interval) {
+    client.publish(presence_topic, "online", true);
+    lastHeartbeat = millis();
+  }
+
   if (systemActive){
     // Read and publish sensor data every 2 seconds
     unsigned long now = millis();
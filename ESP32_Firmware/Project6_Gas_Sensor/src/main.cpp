@@ -31,6 +31,12 @@ const char* mqtt_password = "azerty";       // MQTT password
 WiFiClient espClient;
 PubSubClient client(espClient);
 
+// Presence: retained "online" on connect and as heartbeat, "offline" as Last Will
+const char* presence_topic = "boards/gas_sensor/status";
+const char* board_id = "gas_sensor";  // Answers "status_request gas_sensor #<id>"
+const unsigned long heartbeat_interval = 30000;  // Heartbeat every 30 s
+unsigned long lastHeartbeat = 0;
+
 int gas_value_ppm = 0;
 float voltage_value = 0.0;
 unsigned long lastMsg = 0;
@@ -97,10 +103,17 @@ void callback(char* topic, byte* payload, unsigned int length) {
         systemActive = false;
         Serial.println("System Deactivated ");
     }
-  if (String(topic) == "mqtt/request" && message == "status_request") {
+  String addressed = String("status_request ") + board_id;
+  if (String(topic) == "mqtt/request" && (message == "status_request" || message.startsWith(addressed + " #"))) {
     systemActive = true;
 
-    client.publish("mqtt/response", "Board : ESP32 Status : Connected");
+    // A bare request gets the bare reply; an addressed one names this board and
+    // echoes the " #<id>" token, so the dashboard matches it to the request
+    String reply = "Board : ESP32 Status : Connected";
+    if (message != "status_request") {
+      reply += String(" @") + board_id + message.substring(addressed.length());
+    }
+    client.publish("mqtt/response", reply.c_str());
     return;  // Exit after handling the status request
   }
 }
@@ -115,8 +128,11 @@ void reconnect() {
   clientId += String(random(0xffff), HEX);
 
   // Connect with username and password
-  if (client.connect(clientId.c_str(), mqtt_username, mqtt_password)) {
+  if (client.connect(clientId.c_str(), mqtt_username, mqtt_password,
+                     presence_topic, 1, true, "offline")) {
     Serial.println("Connected");
+    client.publish(presence_topic, "online", true);  // Birth message
+    lastHeartbeat = millis();
     client.subscribe("mqtt/request");  // Subscribe to status requests
     client.subscribe("mqtt/respence");
   } else {
@@ -182,6 +198,12 @@ void loop() {
     reconnect();
   }
   client.loop();
+
+  // Heartbeat refreshes the retained presence message
+  if (client.connected() && millis() - lastHeartbeat >= heartbeat_interval) {
+    client.publish(presence_topic, "online", true);
+    lastHeartbeat = millis();
+  }
   
   if (systemActive) {
     // Read sensor data
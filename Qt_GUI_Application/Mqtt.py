@@ -1,8 +1,35 @@
 # ========================
 #         Imports
 # ========================
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
 import paho.mqtt.client as mqtt
+import itertools
+import threading
+from collections import deque
+
+from topic_router import TopicRouter
+from mqtt_rpc import RpcClient
+from board_presence import BoardPresence
+import wire_format
+from data import MQTT_TOPIC_MQTT_Rq
+from app_log import get_logger
+
+log = get_logger("mqtt")
+
+
+def _text_handler(handler):
+    # --- Adapt a handler expecting str payloads to the raw bytes ---
+    def handle(topic, payload):
+        handler(topic, payload.decode())
+    return handle
+
+
+def _reading_handler(handler, schema):
+    # --- Hand over a typed reading (None if invalid), whatever the wire format ---
+    read = wire_format.read
+    def handle(topic, payload):
+        handler(topic, read(schema, payload))
+    return handle
 
 
 # ========================
@@ -12,70 +39,243 @@ class MqttClient(QObject):
     # --- Signal emitted when data is received ---
     data_received = pyqtSignal(str)
 
+    # --- Outcome signals of connect_to_broker_async (GUI thread) ---
+    connected = pyqtSignal()
+    connection_refused = pyqtSignal(int)         # CONNACK result code
+    connection_timeout = pyqtSignal()
+
+    # --- Internal: carries on_connect from the network thread to the GUI thread ---
+    _connect_finished = pyqtSignal(int)
+
+    # --- Internal: one queued event per batch of received messages ---
+    _batch_pending = pyqtSignal()
+
     # ========================
     #     Initialization
     # ========================
-    def __init__(self):
+    def __init__(self, batch_interval_ms=0, batch_capacity=4096, preferred_wire_format=wire_format.WIRE_TEXT):
         super().__init__()
         self._connection_result = None           # Store connection result
+        self._connect_pending = False            # Async connection attempt in progress
 
         # --- MQTT Client Setup ---
-        self.client = mqtt.Client()
-        self.client.on_connect = self.on_connect
-        self.client.on_message = self.on_message
+        self.client = self._create_client()
 
         # --- Internal State ---
         self._topics_to_subscribe = []           # Topics queued for subscription after connect
-        self._topic_handlers = {}                # Handlers registered per topic
+        tokens = itertools.count(1)
+        self._topic_handlers = TopicRouter(tokens)   # Lossless handlers per topic filter
+        self._latest_handlers = TopicRouter(tokens)  # Conflated handlers: newest payload per batch only
+        self._network_handlers = TopicRouter(tokens) # Handlers that always run on the network thread
+        self._routers = (self._topic_handlers, self._latest_handlers, self._network_handlers)
+
+        # --- Wire Format Negotiation ---
+        self.preferred_wire_format = preferred_wire_format
+        self._wire_formats = {}                  # Topic -> (requested format, schema)
+
+        # --- Async Connection Timeout ---
+        self._connect_timer = QTimer(self)
+        self._connect_timer.setSingleShot(True)
+        self._connect_timer.timeout.connect(self._on_connect_timeout)
+        self._connect_finished.connect(self._on_connect_finished)
+
+        # --- Batched Delivery to the GUI Thread ---
+        # Messages are buffered on the network thread and handed to the GUI
+        # thread once per tick. With an interval of 0 handlers run directly
+        # on the network thread.
+        self._batch_interval_ms = batch_interval_ms
+        self._inbox = deque(maxlen=batch_capacity)  # Bounded ring, oldest dropped when full
+        self._flush_scheduled = False
+        self.dropped_messages = 0                # Messages lost to a full ring
+        self.conflated_messages = 0              # Payloads superseded before reaching conflated handlers
+        self._conflated_per_topic = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_batch)
+        self._batch_pending.connect(self._on_batch_pending)
+
+        # --- Request/Response ---
+        self.rpc = RpcClient(self)               # Status requests and their replies
+        self.presence = BoardPresence(self)      # Board online/offline from retained birth and Last Will
+
+    def _create_client(self):
+        client = mqtt.Client()
+        client.on_connect = self.on_connect
+        client.on_message = self.on_message
+        return client
 
     # ========================
     #      MQTT Callbacks
     # ========================
     def on_connect(self, client, userdata, flags, rc):
         # --- Called upon successful or failed connection ---
-        print(f"Connected to MQTT broker with result code {rc}")
+        if client is not self.client:
+            return                               # Late answer to an abandoned attempt
+        log.info("Connected to MQTT broker with result code %s", rc)
         self._connection_result = rc
         if rc == 0:
             # --- Subscribe to all queued topics ---
             for topic in self._topics_to_subscribe:
                 self.client.subscribe(topic)
-                print(f"Subscribed to topic: {topic}")
+                log.info("Subscribed to topic: %s", topic)
+            # --- Repeat format requests for boards that missed them ---
+            for topic, (requested, schema) in list(self._wire_formats.items()):
+                if requested != wire_format.WIRE_TEXT:
+                    self.client.publish(MQTT_TOPIC_MQTT_Rq, wire_format.format_request(topic, requested, schema))
         else:
-            print(f"Connection failed with result code {rc}")
+            log.warning("Connection failed with result code %s", rc)
+        self._connect_finished.emit(rc)
 
     def on_message(self, client, userdata, msg):
         # --- Called when a message is received ---
+        # Payloads stay bytes here; text handlers decode them on delivery
         topic = msg.topic
-        payload = msg.payload.decode()
+        payload = msg.payload
+
+        # --- Network-thread consumers (e.g. recording) never wait for the GUI ---
+        for handler in self._network_handlers.match(topic):
+            handler(topic, payload)
 
-        # --- Dispatch message to registered handler ---
-        if topic in self._topic_handlers:
-            self._topic_handlers[topic](topic, payload)
+        if not self._batch_interval_ms:
+            self._dispatch(topic, payload)
+            return
+
+        # --- Queue for the GUI thread; only the first message of a batch posts an event ---
+        inbox = self._inbox
+        if len(inbox) == inbox.maxlen:
+            self.dropped_messages += 1
+        inbox.append((topic, payload))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._batch_pending.emit()
+
+    def _dispatch(self, topic, payload):
+        # --- Dispatch message to handlers of every matching filter ---
+        for handler in self._topic_handlers.match(topic):
+            handler(topic, payload)
+        if not self._batch_interval_ms:
+            # Without batching there is nothing to conflate
+            for handler in self._latest_handlers.match(topic):
+                handler(topic, payload)
+
+    # ========================
+    #     Batched Delivery
+    # ========================
+    def set_batch_interval(self, interval_ms):
+        # --- Change the delivery tick; 0 restores direct network-thread dispatch ---
+        if not interval_ms:
+            self._flush_batch()
+        self._batch_interval_ms = interval_ms
+
+    @pyqtSlot()
+    def _on_batch_pending(self):
+        # --- First message of a batch arrived: flush it at the next tick ---
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self._batch_interval_ms)
+
+    @pyqtSlot()
+    def _flush_batch(self):
+        # --- Deliver everything queued so far on the GUI thread ---
+        self._flush_scheduled = False
+        inbox = self._inbox
+        latest = {}                              # Topic -> (newest payload, message count)
+
+        # Messages arriving during the flush schedule the next batch
+        for _ in range(len(inbox)):
+            topic, payload = inbox.popleft()
+            self._dispatch(topic, payload)
+            entry = latest.get(topic)
+            latest[topic] = (payload, entry[1] + 1 if entry else 1)
+
+        # --- Conflated handlers only see the newest payload of each topic ---
+        if not len(self._latest_handlers):
+            return
+        for topic, (payload, count) in latest.items():
+            handlers = self._latest_handlers.match(topic)
+            if not handlers:
+                continue
+            if count > 1:
+                self.conflated_messages += count - 1
+                self._conflated_per_topic[topic] = self._conflated_per_topic.get(topic, 0) + count - 1
+            for handler in handlers:
+                handler(topic, payload)
+
+    def conflation_stats(self):
+        # --- Number of conflated (dropped) payloads per topic ---
+        return dict(self._conflated_per_topic)
 
     # ========================
     #     Topic Management
     # ========================
-    def subscribe_to_topic(self, topic, handler=None):
+    def subscribe_to_topic(self, topic, handler=None, conflate=False, on_network_thread=False, raw=False,
+                           schema=None):
         # --- Subscribe immediately if connected, else queue it ---
         if self.client.is_connected():
             self.client.subscribe(topic)
-            print(f"Subscribed to topic: {topic}")
-        else:
+            log.info("Subscribed to topic: %s", topic)
+        elif topic not in self._topics_to_subscribe:
             self._topics_to_subscribe.append(topic)
-            print(f"Topic '{topic}' queued for subscription after connection.")
+            log.debug("Topic '%s' queued for subscription after connection.", topic)
 
-        # --- Register handler if provided ---
+        # --- Register handler if provided, alongside existing subscribers ---
+        # Conflated handlers receive only the newest payload of each batch,
+        # lossless ones receive every message. Network-thread handlers get
+        # every message straight from paho and must not touch widgets.
+        # Raw handlers receive the payload bytes, handlers with a wire
+        # schema a typed reading, all others a str.
+        if schema is not None and topic not in self._wire_formats:
+            self.set_wire_format(topic, self.preferred_wire_format, schema)
         if handler:
-            self._topic_handlers[topic] = handler
+            if schema is not None:
+                handler = _reading_handler(handler, schema)
+            elif not raw:
+                handler = _text_handler(handler)
+            if on_network_thread:
+                router = self._network_handlers
+            elif conflate:
+                router = self._latest_handlers
+            else:
+                router = self._topic_handlers
+            return router.add(topic, handler)
+        return None
+
+    def set_wire_format(self, topic, requested, schema=None):
+        # --- Ask the publisher of topic for text or binary frames ---
+        # Received payloads are detected per message, so this only changes
+        # what boards that understand the request send.
+        previous = self._wire_formats.get(topic, (wire_format.WIRE_TEXT, None))[0]
+        self._wire_formats[topic] = (requested, schema)
+        if requested == previous or not self.client.is_connected():
+            return                               # Sent from on_connect otherwise
+        self.client.publish(MQTT_TOPIC_MQTT_Rq, wire_format.format_request(topic, requested, schema))
+
+    def requested_wire_format(self, topic):
+        return self._wire_formats.get(topic, (wire_format.WIRE_TEXT, None))[0]
+
+    def unsubscribe_from_topic(self, topic, token=None):
+        # --- Remove one subscriber by token, or every subscriber of the topic ---
+        for router in self._routers:
+            if token is None:
+                router.remove_filter(topic)
+                continue
+            subscribed = router.filter_of(token)
+            if subscribed is None:
+                continue
+            if subscribed != topic:
+                # Would drop one topic's handler and another topic's broker subscription
+                raise ValueError(f"Token {token} belongs to {subscribed!r}, not {topic!r}")
+            router.remove(token)
+            break
+
+        # --- Leave the broker subscription while other consumers remain ---
+        if any(topic in router for router in self._routers):
+            return
 
-    def unsubscribe_from_topic(self, topic):
-        # --- Unsubscribe from topic and remove its handler ---
+        if topic in self._topics_to_subscribe:
+            self._topics_to_subscribe.remove(topic)
         if self.client:
             self.client.unsubscribe(topic)
-            print(f"Unsubscribed from topic: {topic}")
-
-        if topic in self._topic_handlers:
-            del self._topic_handlers[topic]
+            log.info("Unsubscribed from topic: %s", topic)
 
     # ========================
     #     Connection Control
@@ -109,15 +309,77 @@ class MqttClient(QObject):
             return self._connection_result
             
         except Exception as e:
-            print(f"Failed to connect to MQTT broker: {e}")
+            log.error("Failed to connect to MQTT broker: %s", e)
             return -1  # General connection error
 
+    def connect_to_broker_async(self, broker, port, username, password, timeout=10):
+        # --- Start connecting and return at once; outcome is reported by signal ---
+        self._abort_pending_connect()
+        self._connection_result = None
+
+        # Set username and password if provided
+        if username and password:
+            self.client.username_pw_set(username, password)
+
+        try:
+            # DNS lookup and TCP connect happen on the network thread
+            self.client.connect_async(broker, port, 60)
+            self.client.loop_start()
+        except Exception as e:
+            log.error("Failed to connect to MQTT broker: %s", e)
+            self.connection_refused.emit(-1)     # General connection error
+            return
+
+        self._connect_pending = True
+        self._connect_timer.start(int(timeout * 1000))
+
+    @pyqtSlot(int)
+    def _on_connect_finished(self, rc):
+        # --- CONNACK received (GUI thread) ---
+        if not self._connect_pending:
+            return                               # Reconnect after an earlier success
+        self._connect_pending = False
+        self._connect_timer.stop()
+
+        if rc == 0:
+            self.connected.emit()
+        else:
+            # paho would keep retrying a refused connection; give up instead
+            self._abandon_client()
+            self.connection_refused.emit(rc)
+
+    @pyqtSlot()
+    def _on_connect_timeout(self):
+        # --- No CONNACK within the timeout ---
+        if not self._connect_pending:
+            return
+        self._connect_pending = False
+        self._abandon_client()
+        self.connection_timeout.emit()
+
+    def _abort_pending_connect(self):
+        if self._connect_pending:
+            self._connect_pending = False
+            self._connect_timer.stop()
+            self._abandon_client()
+
+    def _abandon_client(self):
+        # --- Replace the client without blocking on its network thread ---
+        # The network thread may still sit in a socket connect to an
+        # unreachable host; joining it here would freeze the GUI.
+        old_client = self.client
+        old_client.on_connect = None
+        old_client.on_message = None
+        threading.Thread(target=old_client.loop_stop, daemon=True).start()
+        self.client = self._create_client()
+
     def disconnect_from_broker(self):
         # --- Gracefully disconnect and stop network loop ---
+        self._abort_pending_connect()
         if self.client:
             self.client.loop_stop()
             self.client.disconnect()
-            print("Disconnected from MQTT broker.")
+            log.info("Disconnected from MQTT broker.")
 
     # ========================
     #      Message Sending
@@ -126,4 +388,74 @@ class MqttClient(QObject):
         # --- Publish message to specified topic ---
         if self.client:
             self.client.publish(topic, message)
-            print(f"Published '{message}' to '{topic}'")
+            log.debug("Published '%s' to '%s'", message, topic)
+
+
+# ========================
+#        Self Check
+# ========================
+def _self_check(timeout=10, frame_budget_ms=3 * 1000 / 30):
+    # --- An unanswered connect must not stall the event loop until the timeout fires ---
+    # The budget is three frames of the RenderScheduler at 30 fps (100 ms),
+    # the longest pause a user still takes as instant. An idle event loop on
+    # a loaded single-core machine already shows gaps of up to ~50 ms, so one
+    # frame cannot be told apart from scheduling noise there. A blocking
+    # connect stalls for the whole timeout, 100 times over budget.
+    import os
+    import socket
+    import sys
+    import time
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QCoreApplication, QEventLoop, Qt
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    # Stand-in broker: accepts the TCP connection, then never sends a CONNACK
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    held = []
+    threading.Thread(target=lambda: held.append(listener.accept()), daemon=True).start()
+
+    mqtt_client = MqttClient()
+    outcome = []
+    loop = QEventLoop()
+    for signal, name in ((mqtt_client.connected, "connected"), (mqtt_client.connection_timeout, "timeout")):
+        signal.connect(lambda name=name: (outcome.append(name), loop.quit()))
+    mqtt_client.connection_refused.connect(lambda rc: (outcome.append(f"refused {rc}"), loop.quit()))
+
+    # A 1 ms tick stands in for the render timer; its gaps show any blocking
+    gaps = []
+    last = [time.perf_counter()]
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+    ticker = QTimer()
+    ticker.setTimerType(Qt.PreciseTimer)
+    ticker.timeout.connect(tick)
+
+    start = time.perf_counter()
+    ticker.start(1)
+    mqtt_client.connect_to_broker_async("127.0.0.1", listener.getsockname()[1], "", "", timeout=timeout)
+    returned = (time.perf_counter() - start) * 1000
+    last[0] = time.perf_counter()
+    loop.exec_()
+    elapsed = time.perf_counter() - start
+    ticker.stop()
+    listener.close()
+    worst = max(gaps) * 1000
+
+    assert held, "the client never reached the stand-in broker"
+    assert outcome == ["timeout"], f"expected a timeout, got {outcome}"
+    # The connect timer is a coarse timer: Qt keeps it within 5% of its
+    # interval and the glib dispatcher rounds it further (9.5 s of 10 s seen),
+    # so allow 10%
+    assert elapsed >= timeout * 0.9, f"timed out after {elapsed:.1f} s instead of {timeout} s"
+    assert returned < frame_budget_ms, f"connect_to_broker_async took {returned:.1f} ms"
+    assert worst < frame_budget_ms, f"event loop stalled for {worst:.1f} ms (budget {frame_budget_ms:.1f} ms)"
+    print(f"OK: timeout after {elapsed:.2f} s, call returned in {returned:.2f} ms, "
+          f"largest event-loop gap {worst:.2f} ms over {len(gaps)} ticks (budget {frame_budget_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    _self_check()
@@ -0,0 +1,161 @@
+# ========================
+#         Imports
+# ========================
+import logging
+import sys
+from collections import deque
+
+
+# ========================
+#     Logger Hierarchy
+# ========================
+# Every subsystem logs to "iot.<subsystem>" ("iot.mqtt", "iot.gas", ...),
+# so levels can be set per subsystem. Pass values as arguments instead of
+# formatting them into the message: with the level disabled the call
+# returns before anything is converted to a string.
+ROOT_LOGGER = "iot"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def set_level(subsystem, level):
+    # --- Level name ("DEBUG") or number, for one subsystem or the root ("") ---
+    logger = get_logger(subsystem) if subsystem else logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(logging.getLevelName(level) if isinstance(level, str) else level)
+
+
+class Lazy:
+    """Defers an expensive log argument until the message is formatted."""
+
+    __slots__ = ("_func",)
+
+    def __init__(self, func):
+        self._func = func
+
+    def __str__(self):
+        return str(self._func())
+
+    def __repr__(self):
+        return repr(self._func())
+
+
+# ========================
+#   Ring Buffer Handler
+# ========================
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records in memory, unformatted.
+
+    Records are only formatted when something reads them, so a busy
+    subsystem costs one deque append per record. Listeners are called with
+    each new record on the thread that logged it.
+    """
+
+    def __init__(self, capacity=5000, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+        self._listeners = []
+
+    def emit(self, record):
+        self.records.append(record)
+        for listener in self._listeners:
+            listener(record)
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def snapshot(self, min_level=logging.NOTSET, subsystem=None):
+        # --- Records at or above min_level, optionally of one subsystem ---
+        name = None if subsystem is None else f"{ROOT_LOGGER}.{subsystem}"
+        return [
+            record for record in list(self.records)
+            if record.levelno >= min_level and (name is None or record.name == name)
+        ]
+
+
+_ring_handler = None
+
+
+def configure_logging(levels=None, capacity=5000, console_level=logging.INFO):
+    """Attach the ring buffer and console sinks and apply per-subsystem levels.
+
+    Returns the RingBufferHandler. Calling it again replaces the sinks.
+    """
+    global _ring_handler
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.INFO)
+    root.propagate = False
+
+    _ring_handler = RingBufferHandler(capacity)
+    root.addHandler(_ring_handler)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter(LOG_FORMAT, "%H:%M:%S"))
+    root.addHandler(console)
+
+    for subsystem, level in (levels or {}).items():
+        set_level(subsystem, level)
+    return _ring_handler
+
+
+def ring_handler():
+    return _ring_handler
+
+
+# ========================
+#        Self Check
+# ========================
+def _self_check(calls=1_000_000):
+    # --- A disabled level must not format anything, and must be cheap ---
+    import time
+
+    class Probe:
+        formatted = 0
+
+        def __str__(self):
+            Probe.formatted += 1
+            return "probe"
+
+        __repr__ = __str__
+
+        def __format__(self, spec):
+            Probe.formatted += 1
+            return "probe"
+
+    log = get_logger("selfcheck")
+    root = logging.getLogger(ROOT_LOGGER)
+    saved = root.handlers[:], root.level
+    ring = configure_logging(console_level=logging.CRITICAL + 1)
+    set_level("selfcheck", logging.INFO)
+    probe = Probe()
+
+    log.debug("value %s %r", probe, probe)
+    log.debug("value %s", Lazy(lambda: probe))
+    assert Probe.formatted == 0, "disabled debug call formatted its arguments"
+
+    # Enabled records reach the ring buffer still unformatted
+    log.info("value %s", probe)
+    assert Probe.formatted == 0 and len(ring.records) == 1, "ring buffer formatted a record"
+    assert ring.records[0].getMessage() == "value probe"
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        log.debug("value %s", probe)
+    elapsed = (time.perf_counter() - start) / calls * 1e9
+    assert Probe.formatted == 1
+
+    root.handlers[:], root.level = saved
+    print(f"OK: disabled debug call costs {elapsed:.0f} ns and formats nothing")
+
+
+if __name__ == "__main__":
+    _self_check()
@@ -0,0 +1,283 @@
+# ========================
+#         Imports
+# ========================
+import time
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from data import MQTT_TOPIC_PRESENCE, PRESENCE_STALE_AFTER, PRESENCE_BOARD_NAME
+from app_log import get_logger
+
+log = get_logger("mqtt")
+
+ONLINE = "online"
+OFFLINE = "offline"
+STALE = "stale"                                  # Online, but the heartbeat stopped
+UNKNOWN = "unknown"                              # Never heard of
+
+# Board status text and color of each presence state on the project pages
+PRESENCE_DISPLAY = {
+    ONLINE: ("Connected", "green"),
+    OFFLINE: ("Disconnected", "red"),
+    STALE: ("No heartbeat", "red"),
+}
+
+
+# ========================
+#   Board Presence Class
+# ========================
+class BoardPresence(QObject):
+    """Live table of which boards are online, without sending any request.
+
+    Every board keeps a retained "online" on boards/<board>/status: it
+    publishes it when it connects and again as a heartbeat, and registers
+    "offline" as its Last Will, which the broker publishes (retained) when
+    the board drops off. Subscribing therefore hands over the state of
+    every board at once, and each change arrives as it happens. A board
+    that stops its heartbeat without a Last Will, as after a half-open
+    connection, turns stale after stale_after seconds.
+
+    board_changed(board, status) is emitted on the GUI thread when a
+    board's status changes; heartbeats only refresh last_seen().
+    """
+
+    board_changed = pyqtSignal(str, str)         # Board, status
+    _message_received = pyqtSignal(str, bytes)   # Topic, payload
+
+    def __init__(self, mqtt_client, stale_after=PRESENCE_STALE_AFTER, clock=time.monotonic):
+        super().__init__()
+        self.mqtt_client = mqtt_client
+        self.stale_after = stale_after
+        self._clock = clock
+        self._status = {}                        # Board -> status
+        self._last_seen = {}                     # Board -> clock time of its last message
+        self._heartbeats = OrderedDict()         # Online boards -> last heartbeat, oldest first
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._expire)
+        self._message_received.connect(self._on_message)
+
+        # Raw bytes from any thread; the signal moves them to the GUI thread
+        self._token = mqtt_client.subscribe_to_topic(
+            MQTT_TOPIC_PRESENCE, lambda topic, payload: self._message_received.emit(topic, payload), raw=True)
+
+    def status(self, board):
+        return self._status.get(board, UNKNOWN)
+
+    def last_seen(self, board):
+        # --- Clock time of the board's last presence message, None if never seen ---
+        # A retained message counts as seen when it is received.
+        return self._last_seen.get(board)
+
+    def boards(self):
+        return dict(self._status)
+
+    def close(self):
+        self._timer.stop()
+        self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_PRESENCE, self._token)
+
+    # ========================
+    #    Presence Messages
+    # ========================
+    @pyqtSlot(str, bytes)
+    def _on_message(self, topic, payload):
+        levels = topic.split("/")
+        if len(levels) != 3:
+            return
+        board = levels[1]
+        status = payload.decode(errors="replace").strip().lower()
+
+        # --- Empty payload: the retained message was cleared, forget the board ---
+        if not status:
+            self._heartbeats.pop(board, None)
+            self._last_seen.pop(board, None)
+            if self._status.pop(board, None) is not None:
+                self.board_changed.emit(board, UNKNOWN)
+            return
+        if status not in (ONLINE, OFFLINE):
+            log.warning("Unexpected presence of %s: %r", board, status)
+            return
+
+        now = self._clock()
+        self._last_seen[board] = now
+        if status == ONLINE:
+            self._heartbeats[board] = now
+            self._heartbeats.move_to_end(board)
+            if not self._timer.isActive():
+                self._arm()
+        else:
+            self._heartbeats.pop(board, None)
+        self._set(board, status)
+
+    def _set(self, board, status):
+        if self._status.get(board) != status:
+            self._status[board] = status
+            log.debug("Board %s is %s", board, status)
+            self.board_changed.emit(board, status)
+
+    # ========================
+    #      Stale Boards
+    # ========================
+    def _arm(self):
+        # --- Run _expire when the least recently seen online board goes stale ---
+        if self._heartbeats:
+            oldest = next(iter(self._heartbeats.values()))
+            self._timer.start(max(0, int((oldest + self.stale_after - self._clock()) * 1000) + 1))
+        else:
+            self._timer.stop()
+
+    @pyqtSlot()
+    def _expire(self):
+        deadline = self._clock() - self.stale_after
+        heartbeats = self._heartbeats
+        while heartbeats:
+            board, seen = next(iter(heartbeats.items()))
+            if seen > deadline:
+                break
+            del heartbeats[board]
+            self._set(board, STALE)
+        self._arm()
+
+
+def presence_display(status):
+    # --- (board name, status text, color) for a project page, None to leave it as is ---
+    display = PRESENCE_DISPLAY.get(status)
+    return None if display is None else (PRESENCE_BOARD_NAME,) + display
+
+
+# ========================
+#        Self Check
+# ========================
+def _self_check(boards=1000, events=20_000):
+    # --- A stand-in broker with retained messages and Last Wills, and boards connecting and dropping ---
+    import os
+    import random
+    import sys
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QCoreApplication
+    from topic_router import TopicRouter
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    class StandInBroker:
+        # MQTT 3.1.1 semantics BoardPresence depends on, behind the MqttClient interface
+        def __init__(self):
+            self.router = TopicRouter()
+            self.retained = {}                   # Topic -> payload
+            self.wills = {}                      # Connected board -> (topic, payload)
+            self.requests = 0                    # Messages published by the application
+
+        def subscribe_to_topic(self, topic, handler=None, **options):
+            token = self.router.add(topic, handler)
+            matching = TopicRouter()
+            matching.add(topic, handler)
+            for retained_topic, payload in list(self.retained.items()):
+                for match in matching.match(retained_topic):
+                    match(retained_topic, payload)
+            return token
+
+        def unsubscribe_from_topic(self, topic, token=None):
+            self.router.remove(token)
+
+        def publish(self, topic, payload, retain=False):
+            self.requests += 1
+            self._route(topic, payload, retain)
+
+        def _route(self, topic, payload, retain):
+            if retain:
+                if payload:
+                    self.retained[topic] = payload
+                else:
+                    self.retained.pop(topic, None)
+            for handler in self.router.match(topic):
+                handler(topic, payload)
+
+        # --- Boards, as the firmware behaves ---
+        def connect(self, board):
+            topic = f"boards/{board}/status"
+            self.wills[board] = (topic, b"offline")
+            self._route(topic, b"online", True)  # Birth message
+
+        def heartbeat(self, board):
+            self._route(f"boards/{board}/status", b"online", True)
+
+        def drop(self, board):
+            # Connection lost: the broker publishes the Last Will
+            topic, payload = self.wills.pop(board)
+            self._route(topic, payload, True)
+
+        def vanish(self, board):
+            # Half-open connection: no Last Will, no more heartbeats
+            del self.wills[board]
+
+    now = [0.0]
+    broker = StandInBroker()
+    names = [f"board{i:04d}" for i in range(boards)]
+    rng = random.Random(0)
+
+    # --- Boards already up, some already gone, before the application starts ---
+    for board in names:
+        broker.connect(board)
+    for board in names[::2]:
+        broker.drop(board)
+    start = time.perf_counter()
+    presence = BoardPresence(broker, stale_after=90, clock=lambda: now[0])
+    app.processEvents()
+    retained_time = time.perf_counter() - start
+    table = presence.boards()
+    assert len(table) == boards, f"{len(table)} of {boards} boards from retained messages"
+    assert all(table[board] == (OFFLINE if i % 2 == 0 else ONLINE) for i, board in enumerate(names))
+
+    # --- Boards connecting, dropping and sending heartbeats ---
+    changes = []
+    presence.board_changed.connect(lambda board, status: changes.append((board, status)))
+    expected = 0
+    start = time.perf_counter()
+    for _ in range(events):
+        board = rng.choice(names)
+        now[0] += 0.001
+        if board in broker.wills:
+            if rng.random() < 0.5:
+                broker.heartbeat(board)
+            else:
+                broker.drop(board)
+                expected += 1
+        else:
+            broker.connect(board)
+            expected += 1
+    app.processEvents()
+    churn_time = time.perf_counter() - start
+    assert len(changes) == expected, f"{len(changes)} change notifications for {expected} changes"
+    for board in names:
+        assert presence.status(board) == (ONLINE if board in broker.wills else OFFLINE), board
+
+    # --- A tenth of the online boards go silent without a Last Will ---
+    online = [board for board in names if board in broker.wills]
+    silent = set(online[::10])
+    for board in silent:
+        broker.vanish(board)
+    for step in range(1, 4):
+        now[0] += 45
+        for board in online:
+            if board not in silent:
+                broker.heartbeat(board)
+        presence._expire()                       # What the timer runs at the deadline
+    stale = {board for board, status in presence.boards().items() if status == STALE}
+    assert stale == silent, f"{len(stale)} stale boards, expected {len(silent)}"
+
+    # --- A late subscriber sees the same table from the retained messages ---
+    late = BoardPresence(broker, stale_after=90, clock=lambda: now[0])
+    retained = late.boards()
+    assert all(retained[board] == (ONLINE if status == STALE else status)
+               for board, status in presence.boards().items())
+    assert broker.requests == 0, "presence must not send requests"
+    late.close()
+    presence.close()
+    assert len(broker.router) == 0
+
+    print(f"OK: {boards} boards, {events} connect/drop/heartbeat events, {len(silent)} went stale, no requests")
+    print(f"  retained table {retained_time * 1000:.1f} ms, {churn_time / events * 1e6:.1f} us per presence message")
+
+
+if __name__ == "__main__":
+    _self_check()
@@ -0,0 +1,162 @@
+# ========================
+#         Imports
+# ========================
+import importlib
+from app_log import get_logger
+
+log = get_logger("app")
+
+
+def deferred(module_name, attribute):
+    """Stand-in for module_name.attribute that imports the module on first call.
+
+    Lets the application name every project controller at start-up while
+    only importing the modules (and pyqtgraph behind them) for the screens
+    that are actually opened.
+    """
+    def create(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attribute)(*args, **kwargs)
+    create.__name__ = create.__qualname__ = attribute
+    return create
+
+
+# ========================
+#  Controller Registry
+# ========================
+class ControllerRegistry:
+    """Creates page controllers on first use and keeps them for reuse.
+
+    A controller is built by its factory the first time its page is opened.
+    Leaving the page calls suspend() on it and opening it again calls
+    activate() on the same instance, so signal connections, timers and plot
+    items are set up once per session instead of once per visit.
+    """
+
+    def __init__(self):
+        self._factories = {}                     # Page -> factory
+        self._controllers = {}                   # Page -> created controller
+        self.active = None
+        self.active_page = None
+
+    def register(self, page, factory):
+        self._factories[page] = factory
+
+    def created(self, page):
+        return page in self._controllers
+
+    def get(self, page):
+        # --- The page's controller, created on first use ---
+        controller = self._controllers.get(page)
+        if controller is None:
+            controller = self._factories[page]()
+            self._controllers[page] = controller
+            log.debug("Created controller for page %s", page)
+        return controller
+
+    def activate(self, page):
+        # --- Suspend the current controller and resume the page's one ---
+        if page == self.active_page:
+            return self.active
+        self.suspend()
+        controller = self.get(page)
+        controller.activate()
+        self.active, self.active_page = controller, page
+        return controller
+
+    def suspend(self):
+        if self.active is not None:
+            self.active.suspend()
+        self.active = self.active_page = None
+
+
+# ========================
+#        Self Check
+# ========================
+def _self_check(switches=1000):
+    # --- Switching pages must not grow memory, subscriptions or connections ---
+    import gc
+    import os
+    import sys
+    import tracemalloc
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QMainWindow, QAbstractButton, QCheckBox
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    from data import screen_button, screen_wather, screen_sensor, screen_load_cell, screen_accelo, screen_gas_sensor
+    from mainwindow import Ui_MainWindow
+    from render_scheduler import RenderScheduler
+    from mqtt_rpc import RpcClient
+    from board_presence import BoardPresence
+    from project1 import LED_and_Button
+    from project2 import Tem_hum_Sensor
+    from project3 import WaterLevelControllerWindow
+    from project4 import LOADCELL
+    from project5 import AccelerometerGyroscopeController
+    from project6 import GasSensorController
+
+    class OfflineMqtt:
+        def __init__(self):
+            self.handlers = {}
+            self.rpc = RpcClient(self)
+            self.presence = BoardPresence(self)
+
+        def subscribe_to_topic(self, topic, handler=None, **options):
+            token = object()
+            self.handlers[token] = topic
+            return token
+
+        def unsubscribe_from_topic(self, topic, token=None):
+            self.handlers.pop(token, None)
+
+        def publish(self, topic, payload):
+            pass
+
+    window = QMainWindow()
+    ui = Ui_MainWindow()
+    ui.setupUi(window)
+    mqtt_client = OfflineMqtt()
+    services = len(mqtt_client.handlers)        # The presence subscription stays for the session
+    scheduler = RenderScheduler(ui.stackedWidget)
+    registry = ControllerRegistry()
+    registry.register(screen_button, lambda: LED_and_Button(mqtt_client, ui))
+    registry.register(screen_wather, lambda: Tem_hum_Sensor(mqtt_client, ui))
+    registry.register(screen_sensor, lambda: WaterLevelControllerWindow(mqtt_client, ui, scheduler))
+    registry.register(screen_load_cell, lambda: LOADCELL(mqtt_client, ui, scheduler))
+    registry.register(screen_accelo, lambda: AccelerometerGyroscopeController(mqtt_client, ui, scheduler))
+    registry.register(screen_gas_sensor, lambda: GasSensorController(mqtt_client, ui, scheduler))
+    pages = [screen_button, screen_wather, screen_sensor, screen_load_cell, screen_accelo, screen_gas_sensor]
+
+    def visit(count):
+        for i in range(count):
+            page = pages[i % len(pages)]
+            ui.stackedWidget.setCurrentIndex(page)
+            registry.activate(page).request_board_status()  # Left unanswered, cancelled by suspend()
+            app.processEvents()
+        registry.suspend()
+        app.processEvents()
+        gc.collect()
+
+    def measure():
+        buttons = [widget for widget in vars(ui).values() if isinstance(widget, QAbstractButton)]
+        connections = sum(button.receivers(button.clicked) for button in buttons)
+        connections += sum(button.receivers(button.stateChanged) for button in buttons if isinstance(button, QCheckBox))
+        connections += mqtt_client.presence.receivers(mqtt_client.presence.board_changed)
+        return len(mqtt_client.handlers) - services, connections, tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.start()
+    visit(len(pages))                            # Create every controller once
+    subscriptions, connections, memory = measure()
+    visit(switches)
+    after = measure()
+    tracemalloc.stop()
+
+    growth = after[2] - memory
+    assert subscriptions == 0 and after[0] == 0, "suspended controllers left subscriptions behind"
+    assert after[1] == connections, f"button connections grew from {connections} to {after[1]}"
+    assert growth < 16 * 1024, f"memory grew by {growth / 1024:.0f} KiB over {switches} switches"
+    print(f"OK: {switches} page switches, {connections} button connections, "
+          f"memory growth {growth / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    _self_check()
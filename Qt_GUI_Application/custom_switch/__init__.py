@@ -1,2 +1,3 @@
 from .switch import CustomSwitch
-__all__ = ['CustomSwitch']
\ No newline at end of file
+from .led_indicator import LedIndicator
+__all__ = ['CustomSwitch', 'LedIndicator']
@@ -0,0 +1,98 @@
+from PyQt5.QtCore import Qt, QPointF, QRectF, QSize, pyqtProperty
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtGui import QPainter, QColor, QPixmap, QRadialGradient, QPen
+
+# Color name -> (gradient center, gradient edge, border); None draws nothing
+LED_COLORS = {
+    "red": ("#FF0000", "#8B0000", "#800000"),
+    "green": ("#00FF00", "#008800", "#006600"),
+    "yellow": ("#FFFF00", "#CCCC00", "#808000"),
+    "white": ("#FFFFFF", "#E0E0E0", "#C0C0C0"),
+    "gray": ("#A0A0A0", "#606060", "#404040"),
+    "dark_red": ("#330000", "#330000", "gray"),
+    "dark_yellow": ("#333300", "#333300", "gray"),
+    "dark_green": ("#003300", "#003300", "gray"),
+    "off": None,
+}
+
+class LedIndicator(QLabel):
+    # (color, diameter, border width, device pixel ratio) -> QPixmap, shared by all LEDs
+    _pixmaps = {}
+
+    def __init__(self, parent=None, color="off", border_width=2):
+        super().__init__(parent)
+        self._color = color
+        self._border_width = border_width
+        self._pixmap = None
+
+    def sizeHint(self):
+        return QSize(24, 24)
+
+    def minimumSizeHint(self):
+        return QSize(8, 8)
+
+    def paintEvent(self, event):
+        if self._pixmap is None:
+            self._pixmap = self._render()
+        if self._pixmap is not None:
+            size = self._pixmap.size() / self._pixmap.devicePixelRatio()
+            painter = QPainter(self)
+            painter.drawPixmap((self.width() - size.width()) // 2, (self.height() - size.height()) // 2, self._pixmap)
+
+    def resizeEvent(self, event):
+        self._pixmap = None
+        super().resizeEvent(event)
+
+    def _render(self):
+        colors = LED_COLORS[self._color]
+        diameter = min(self.width(), self.height())
+        if colors is None or diameter <= 0:
+            return None
+        ratio = self.devicePixelRatioF()
+        key = (self._color, diameter, self._border_width, ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(int(diameter * ratio), int(diameter * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            center, edge, border = colors
+            gradient = QRadialGradient(QPointF(diameter / 2, diameter / 2), diameter * 0.6)
+            gradient.setColorAt(0, QColor(center))
+            gradient.setColorAt(1, QColor(edge))
+
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(gradient)
+            if self._border_width:
+                painter.setPen(QPen(QColor(border), self._border_width))
+            else:
+                painter.setPen(Qt.NoPen)
+            inset = self._border_width / 2
+            painter.drawEllipse(QRectF(inset, inset, diameter - 2 * inset, diameter - 2 * inset))
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def get_color(self):
+        return self._color
+
+    def set_color(self, color):
+        if color == self._color:
+            return
+        if color not in LED_COLORS:
+            raise ValueError(f"Unknown LED color: {color!r}")
+        self._color = color
+        self._pixmap = None
+        self.update()
+
+    def get_border_width(self):
+        return self._border_width
+
+    def set_border_width(self, width):
+        self._border_width = width
+        self._pixmap = None
+        self.update()
+
+    # Settable from Designer / pyuic as dynamic properties of a promoted QLabel
+    color = pyqtProperty(str, get_color, set_color)
+    borderWidth = pyqtProperty(int, get_border_width, set_border_width)
@@ -1,78 +1,203 @@
-from PyQt5.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, pyqtProperty
+from PyQt5.QtCore import Qt, QPoint, QRect, QPropertyAnimation, QEasingCurve, pyqtProperty
 from PyQt5.QtWidgets import QCheckBox
-from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtGui import QPainter, QColor, QPixmap
 
 class CustomSwitch(QCheckBox):
-    def __init__(self, parent=None, 
-                 width=65, 
+    # Pre-rendered tracks and knobs shared by all switches. The key holds
+    # everything the image depends on (size, color, device pixel ratio), so
+    # changing a color or the radius picks or renders another pixmap.
+    _pixmaps = {}
+
+    def __init__(self, parent=None,
+                 width=65,
                  height=30,
-                 bg_color="#777777", 
-                 circle_color="#DDD", 
+                 bg_color="#777777",
+                 circle_color="#DDD",
                  active_color="#aa00ff",
                  animation_curve=QEasingCurve.OutQuad,
                  animation_duration=300):
         super().__init__(parent)
-        
+
         self.setFixedSize(width, height)
         self.setCursor(Qt.PointingHandCursor)
-        
+
         # Colors
         self._bg_color = bg_color
         self._circle_color = circle_color
         self._active_color = active_color
-        
+
         # Animation
         self._animation_curve = animation_curve
         self._animation_duration = animation_duration
-        
+
         # Circle properties
         self._circle_radius = height - 1
         self._circle_x = 2
         self._circle_y = 2
         self._circle_end_pos = width - self._circle_radius - 1
-        
+
         # Initialize animation
         self._animation = QPropertyAnimation(self, b"circle_position")
         self._animation.setEasingCurve(self._animation_curve)
         self._animation.setDuration(self._animation_duration)
-        
+
         # Connect signal
         self.toggled.connect(self._animate_circle)
-    
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw background
-        bg_rect = self.rect()
-        bg_color = QColor(self._active_color if self.isChecked() else self._bg_color)
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(bg_color)
-        painter.drawRoundedRect(bg_rect, bg_rect.height()/2, bg_rect.height()/2)
-        
-        # Draw circle
-        painter.setBrush(QColor(self._circle_color))
-        painter.drawEllipse(QPoint(int(self._circle_x + self._circle_radius/2), 
-                                 int(self._circle_y + self._circle_radius/2)), 
-                          int(self._circle_radius/2), int(self._circle_radius/2))
-    
+        painter.drawPixmap(0, 0, self._track_pixmap())
+        knob = self._knob_rect()
+        painter.drawPixmap(knob.topLeft(), self._knob_pixmap(knob.width()))
+
+    def _track_pixmap(self):
+        # --- Rounded background in the off or on color ---
+        color = self._active_color if self.isChecked() else self._bg_color
+        ratio = self.devicePixelRatioF()
+        key = ("track", self.width(), self.height(), color, ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._new_pixmap(self.width(), self.height(), ratio)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(QRect(0, 0, self.width(), self.height()), self.height()/2, self.height()/2)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def _knob_pixmap(self, size):
+        radius = int(self._circle_radius/2)
+        ratio = self.devicePixelRatioF()
+        key = ("knob", size, radius, self._circle_color, ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._new_pixmap(size, size, ratio)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(self._circle_color))
+            painter.drawEllipse(QPoint(size // 2, size // 2), radius, radius)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def _new_pixmap(width, height, ratio):
+        pixmap = QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        return pixmap
+
+    def _knob_rect(self):
+        # --- Square around the knob, with a pixel of antialiasing margin ---
+        radius = int(self._circle_radius/2)
+        center = QPoint(int(self._circle_x + self._circle_radius/2), int(self._circle_y + self._circle_radius/2))
+        return QRect(center.x() - radius - 1, center.y() - radius - 1, 2 * radius + 3, 2 * radius + 3)
+
     def _animate_circle(self, checked):
         self._animation.stop()
         self._animation.setStartValue(self._circle_x)
         target_x = self._circle_end_pos if checked else 3
         self._animation.setEndValue(target_x)
         self._animation.start()
-    
+        self.update()                            # Track color changes at once
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.setChecked(not self.isChecked())
         super().mousePressEvent(event)
-    
+
     def get_circle_position(self):
         return self._circle_x
-    
+
     def set_circle_position(self, pos):
+        # Only the area the knob leaves and the area it moves into need repainting
+        old = self._knob_rect()
         self._circle_x = pos
-        self.update()
-        
-    circle_position = pyqtProperty(int, get_circle_position, set_circle_position)
\ No newline at end of file
+        self.update(old.united(self._knob_rect()))
+
+    circle_position = pyqtProperty(int, get_circle_position, set_circle_position)
+
+
+def _benchmark(switches=10, frames=300):
+    # --- Animation frames of ten switches: painting every frame vs. cached pixmaps and partial repaints ---
+    import os
+    import sys
+    import time
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QGridLayout, QWidget
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    class LegacySwitch(CustomSwitch):
+        # The paintEvent and full-widget update used before the pixmap cache
+        def paintEvent(self, event):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+            bg_rect = self.rect()
+            bg_color = QColor(self._active_color if self.isChecked() else self._bg_color)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(bg_color)
+            painter.drawRoundedRect(bg_rect, bg_rect.height()/2, bg_rect.height()/2)
+            painter.setBrush(QColor(self._circle_color))
+            painter.drawEllipse(QPoint(int(self._circle_x + self._circle_radius/2),
+                                       int(self._circle_y + self._circle_radius/2)),
+                                int(self._circle_radius/2), int(self._circle_radius/2))
+
+        def set_circle_position(self, pos):
+            self._circle_x = pos
+            self.update()
+
+    def run(base):
+        paint_time = [0.0]
+
+        class switch_class(base):
+            def paintEvent(self, event):
+                start = time.perf_counter()
+                super().paintEvent(event)
+                paint_time[0] += time.perf_counter() - start
+
+        host = QWidget()
+        layout = QGridLayout(host)
+        items = []
+        for i in range(switches):
+            switch = switch_class(host)
+            # Configured like project1._configure_switch
+            switch._circle_radius = 26
+            switch._bg_color = "#cccccc"
+            switch._circle_color = "#FFFFFF"
+            switch._active_color = "#03A9F4"
+            switch.setFixedSize(65, 30)
+            layout.addWidget(switch, i // 5, i % 5)
+            items.append(switch)
+        host.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            # One animation frame per sweep position, knob going back and forth
+            step = frame % 60
+            position = 3 + (step if step < 30 else 60 - step)
+            for switch in items:
+                switch.set_circle_position(position)
+            app.processEvents()
+        elapsed = time.perf_counter() - start
+        images = [switch.grab().toImage() for switch in items[:1]]
+        host.close()
+        host.deleteLater()
+        app.processEvents()
+        return elapsed, paint_time[0], images[0]
+
+    print(f"{switches} switches, {frames} animation frames (offscreen)")
+    results = {}
+    for label, switch_class in (("QPainter every frame", LegacySwitch), ("cached pixmaps", CustomSwitch)):
+        elapsed, painting, image = run(switch_class)
+        results[label] = image
+        print(f"  {label:<22} {elapsed / frames * 1000:6.3f} ms/frame, {painting / frames * 1000:6.3f} ms/frame in paintEvent")
+    print("  same pixels:", results["QPainter every frame"] == results["cached pixmaps"])
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -28,6 +28,40 @@ MQTT_TOPIC_MPU6050  = "arduino/MPU6050"
 
 MQTT_TOPIC_GAS      = "arduino/gas"
 
+# Board presence (see board_presence.py): each board keeps a retained
+# "online" on boards/<board>/status, refreshed by a 30 s heartbeat, with
+# "offline" as its Last Will
+MQTT_TOPIC_PRESENCE   = "boards/+/status"
+PRESENCE_STALE_AFTER  = 90    # Seconds without a heartbeat before a board counts as stale
+PRESENCE_BOARD_NAME   = "ESP32"
+
+BOARD_LED_BUTTON      = "led_button"
+BOARD_WEATHER         = "weather"
+BOARD_WATER_LEVEL     = "water_level"
+BOARD_LOAD_CELL       = "load_cell"
+BOARD_ACCELEROMETER   = "accelerometer"
+BOARD_GAS_SENSOR      = "gas_sensor"
+
+# Sensor payload format requested from the boards: "text" or "binary"
+# (see wire_format.py). Both are always accepted.
+MQTT_WIRE_FORMAT    = "text"
+
+# Status requests are addressed to one board and carry a " #<id>" token:
+# "status_request <board> #<id>". Only that board answers, naming itself
+# and echoing the token, so every reply resolves the request it answers
+# (see mqtt_rpc.py). False is the fallback for boards with older firmware
+# that only answer a bare "status_request": every board answers it, and
+# replies go to the oldest waiting request.
+MQTT_STATUS_TOKENS  = True
+
+# Log levels per subsystem (see app_log.py); "" is the default for all of
+# them. Set a subsystem to "DEBUG" to trace its messages.
+LOG_LEVELS = {
+    "":         "INFO",
+    "mqtt":     "INFO",
+    "recorder": "INFO",
+}
+
 # Keyboard Configuration
 Password_BTN_PasswordAccueiltext = ""
 Password_BTN_PasswordAtext = ("A", "a", "1")
@@ -0,0 +1,155 @@
+# ========================
+#         Imports
+# ========================
+import numpy as np
+
+
+# ========================
+#    Growable Columns
+# ========================
+class _Columns:
+    """Append-only float columns backed by arrays that double when full."""
+
+    def __init__(self, count, capacity=1024):
+        self._data = np.empty((count, capacity))
+        self.size = 0
+
+    def append(self, *values):
+        if self.size == self._data.shape[1]:
+            grown = np.empty((self._data.shape[0], 2 * self.size))
+            grown[:, :self.size] = self._data
+            self._data = grown
+        self._data[:, self.size] = values
+        self.size += 1
+
+    def column(self, index, start=0, stop=None):
+        stop = self.size if stop is None else min(stop, self.size)
+        return self._data[index, start:stop]
+
+    def clear(self):
+        self.size = 0
+
+
+# ========================
+#   Min/Max Pyramid Class
+# ========================
+class MinMaxPyramid:
+    """Multi-resolution min/max summary of a time series.
+
+    Level 0 holds the raw samples; every level above it stores, for each
+    bucket of FACTOR entries of the level below, the bucket start time and
+    its minimum and maximum. A query picks the coarsest level that still
+    gives at least one bucket per output pixel, so the number of points
+    returned is bounded by the pixel width whatever the history length.
+    Timestamps must be appended in increasing order.
+    """
+
+    FACTOR = 4
+
+    def __init__(self):
+        self._raw = _Columns(2)                  # x, y
+        self._levels = []                        # Per level: x, min, max
+
+    def __len__(self):
+        return self._raw.size
+
+    def append(self, x, y):
+        # --- Add a raw sample and fold completed buckets upwards ---
+        self._raw.append(x, y)
+        size = self._raw.size
+        level = 0
+        while size % self.FACTOR == 0:
+            if level == 0:
+                xs = self._raw.column(0, size - self.FACTOR, size)
+                ymin = ymax = self._raw.column(1, size - self.FACTOR, size)
+            else:
+                below = self._levels[level - 1]
+                xs = below.column(0, size - self.FACTOR, size)
+                ymin = below.column(1, size - self.FACTOR, size)
+                ymax = below.column(2, size - self.FACTOR, size)
+
+            if level == len(self._levels):
+                self._levels.append(_Columns(3))
+            summary = self._levels[level]
+            summary.append(xs[0], ymin.min(), ymax.max())
+            size = summary.size
+            level += 1
+
+    def clear(self):
+        self._raw.clear()
+        self._levels = []
+
+    # ========================
+    #         Queries
+    # ========================
+    def query(self, x0=None, x1=None, max_points=1000):
+        # --- Return (x, y) covering [x0, x1] in a small multiple of max_points points ---
+        xs = self._raw.column(0)
+        start = 0 if x0 is None else max(int(np.searchsorted(xs, x0, side="left")) - 1, 0)
+        stop = len(xs) if x1 is None else min(int(np.searchsorted(xs, x1, side="right")) + 1, len(xs))
+        if stop - start <= 2 * max_points:
+            return xs[start:stop], self._raw.column(1, start, stop)
+
+        # --- Coarsest level with at least max_points buckets in the range ---
+        level = 0
+        bucket = 1
+        while level < len(self._levels) and (stop - start) // (bucket * self.FACTOR) >= max_points:
+            bucket *= self.FACTOR
+            level += 1
+        if level == 0:
+            return xs[start:stop], self._raw.column(1, start, stop)
+
+        summary = self._levels[level - 1]
+        first, last = start // bucket, stop // bucket
+        bx = summary.column(0, first, last)
+        bmin = summary.column(1, first, last)
+        bmax = summary.column(2, first, last)
+
+        # --- Raw samples after the last complete bucket form one extra bucket ---
+        tail_start = max(last * bucket, start)
+        if tail_start < stop:
+            tail = self._raw.column(1, tail_start, stop)
+            bx = np.append(bx, xs[tail_start])
+            bmin = np.append(bmin, tail.min())
+            bmax = np.append(bmax, tail.max())
+
+        # Each bucket is drawn as a vertical min -> max stroke
+        x = np.repeat(bx, 2)
+        y = np.empty(len(x))
+        y[0::2] = bmin
+        y[1::2] = bmax
+        return x, y
+
+
+# ========================
+#   Decimated Curve Class
+# ========================
+class DecimatedCurve:
+    """Feeds a PlotDataItem from a MinMaxPyramid at the widget's pixel width.
+
+    on_view_changed is called when the visible x range or the widget size
+    changes, so the owner can schedule a refresh().
+    """
+
+    def __init__(self, plot_widget, curve, pyramid, on_view_changed=None):
+        self._view_box = plot_widget.getViewBox()
+        self.curve = curve
+        self.pyramid = pyramid
+        if on_view_changed is not None:
+            self._view_box.sigXRangeChanged.connect(lambda *args: on_view_changed())
+            self._view_box.sigResized.connect(lambda *args: on_view_changed())
+
+    def refresh(self):
+        # --- Hand pyqtgraph only as many points as there are pixels ---
+        if not len(self.pyramid):
+            self.curve.setData([], [])
+            return
+
+        max_points = max(int(self._view_box.width()), 100)
+        if self._view_box.autoRangeEnabled()[0]:
+            # Auto-range follows the data, so the whole history is in view
+            x, y = self.pyramid.query(max_points=max_points)
+        else:
+            x0, x1 = self._view_box.viewRange()[0]
+            x, y = self.pyramid.query(x0, x1, max_points)
+        self.curve.setData(x, y)
@@ -0,0 +1,157 @@
+# ========================
+#         Imports
+# ========================
+import time
+
+
+# ========================
+#   Indicator Style Class
+# ========================
+class IndicatorStyle:
+    """Visual states of one kind of indicator, each compiled to a style sheet once.
+
+    set_state() records the state in the widget's "indicator" dynamic
+    property and does nothing when the widget is already in that state, so
+    a repeated status costs one property read instead of a style sheet
+    parse and re-polish. A real change applies the state's precompiled
+    sheet: with Qt 5.15 that is faster than one sheet holding every state
+    behind [indicator="..."] selectors, whose re-polish re-matches all the
+    rules (see _benchmark).
+    """
+
+    PROPERTY = "indicator"
+
+    def __init__(self, states, selector="*"):
+        self.states = states
+        self._sheets = {name: f"{selector} {{{css}}}" for name, css in states.items()}
+
+    def set_state(self, widget, state):
+        # --- Returns True when the widget actually changed ---
+        if widget.property(self.PROPERTY) == state:
+            return False
+        try:
+            widget.setStyleSheet(self._sheets[state])
+        except KeyError:
+            raise ValueError(f"Unknown indicator state: {state!r}") from None
+        widget.setProperty(self.PROPERTY, state)
+        return True
+
+
+# ========================
+#     Shared Indicators
+# ========================
+# Board status text next to the "Board" name on every project page
+BOARD_STATUS = IndicatorStyle({
+    "green": """
+        color: rgb(0, 255, 0);
+        font: bold 15px;
+        background-color: transparent;
+        border-radius: 10px;
+    """,
+    "red": """
+        color: rgb(255, 0, 0);
+        font: bold 15px;
+        background-color: transparent;
+        border-radius: 10px;
+    """,
+    "off": "",
+})
+
+def board_status_state(color):
+    # --- Colors other than green/red clear the style, as before; also a LedIndicator color ---
+    return color if color in ("green", "red") else "off"
+
+
+# ========================
+#        Benchmark
+# ========================
+def _benchmark(changes=10_000):
+    # --- Gas LEDs: full style sheet per sample vs. cached style states vs. painted LEDs ---
+    import os
+    import random
+    import sys
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QHBoxLayout, QLabel, QWidget
+    from custom_switch import LedIndicator
+    from project6 import GAS_STATUS_LEDS, gas_status
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    shape = "border: 2px solid gray; border-radius: 25px; min-width: 50px; min-height: 50px;"
+    gas_styles = {
+        color: IndicatorStyle({
+            "active": f"background-color: qradialgradient(cx:0.5, cy:0.5, radius: 0.6, fx:0.5, fy:0.5,"
+                      f" stop:0 {center}, stop:1 {edge}); {shape}",
+            "inactive": f"background-color: {dark}; {shape}",
+        })
+        for color, center, edge, dark in (("red", "#FF0000", "#8B0000", "#330000"),
+                                          ("yellow", "#FFFF00", "#CCCC00", "#333300"),
+                                          ("green", "#00FF00", "#008800", "#003300"))
+    }
+
+    def legacy_apply(leds, status):
+        # The old apply_gas_led_styles: rebuild the dict, restyle all three LEDs
+        led_styles = {f"{kind}_{color}": gas_styles[color].states[kind] for color in leds
+                      for kind in ("active", "inactive")}
+        lit = GAS_STATUS_LEDS[status]
+        for color, led in leds.items():
+            led.setStyleSheet(f"QLabel {{{led_styles[('active_' if color == lit else 'inactive_') + color]}}}")
+
+    def selector_apply(leds, status):
+        # One sheet with every state behind a property selector, re-polished on change
+        lit = GAS_STATUS_LEDS[status]
+        for color, led in leds.items():
+            state = "active" if color == lit else "inactive"
+            if led.property("indicator") != state:
+                if not led.styleSheet():
+                    led.setStyleSheet("\n".join(f'*[indicator="{name}"] {{{css}}}'
+                                                for name, css in gas_styles[color].states.items()))
+                led.setProperty("indicator", state)
+                led.style().unpolish(led)
+                led.style().polish(led)
+
+    def cached_apply(leds, status):
+        lit = GAS_STATUS_LEDS[status]
+        for color, led in leds.items():
+            gas_styles[color].set_state(led, "active" if color == lit else "inactive")
+
+    def painted_apply(leds, status):
+        lit = GAS_STATUS_LEDS[status]
+        for color, led in leds.items():
+            led.set_color(color if color == lit else f"dark_{color}")
+
+    rng = random.Random(0)
+    level, walk = 450.0, []                      # Random walk across both thresholds
+    for _ in range(changes):
+        level = min(1200.0, max(0.0, level + rng.gauss(0, 40)))
+        walk.append(gas_status(level, 900, 500))
+    alternating = [("safe", "warning", "danger")[i % 3] for i in range(changes)]
+
+    print(f"{changes} gas samples, 3 LEDs, repainted every 100 samples")
+    approaches = (("setStyleSheet", QLabel, legacy_apply), ("property selector", QLabel, selector_apply),
+                  ("IndicatorStyle", QLabel, cached_apply), ("LedIndicator", LedIndicator, painted_apply))
+    for name, statuses in (("sensor random walk", walk), ("state change every sample", alternating)):
+        for label, widget_class, apply in approaches:
+            host = QWidget()
+            layout = QHBoxLayout(host)
+            leds = {color: widget_class() for color in ("red", "yellow", "green")}
+            for led in leds.values():
+                led.setFixedSize(54, 54)
+                layout.addWidget(led)
+            host.show()
+            app.processEvents()
+            start = time.perf_counter()
+            for i, status in enumerate(statuses):
+                apply(leds, status)
+                if i % 100 == 99:
+                    host.repaint()
+            app.processEvents()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<26} {label:<17} {elapsed * 1000:8.1f} ms  {elapsed / changes * 1e6:6.1f} us/sample")
+            host.close()
+            host.deleteLater()
+            app.processEvents()
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,241 @@
+# ========================
+#         Imports
+# ========================
+import logging
+import time
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, pyqtSlot
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QComboBox, QFrame, QHBoxLayout, QLineEdit, QListView, QVBoxLayout, QAbstractItemView
+
+
+LevelRole = Qt.UserRole                          # logging level of the entry
+MessageRole = Qt.UserRole + 1                    # Message without the timestamp
+
+# Entries below WARNING keep the text color of the widget's style sheet
+LEVEL_COLORS = {
+    logging.WARNING: QBrush(QColor(255, 160, 0)),
+    logging.ERROR: QBrush(QColor(255, 60, 60)),
+    logging.CRITICAL: QBrush(QColor(255, 60, 60)),
+}
+
+SEVERITY_FILTERS = (
+    ("All levels", logging.NOTSET),
+    ("Warnings", logging.WARNING),
+    ("Errors", logging.ERROR),
+)
+
+
+# ========================
+#     Log Model Class
+# ========================
+class LogModel(QAbstractListModel):
+    """Fixed-capacity list of (timestamp, level, message) log entries.
+
+    Entries live in a preallocated ring, so an append costs the same however
+    long the session has run: once full, the oldest row is removed as the
+    new one is inserted. Timestamps are only formatted for the rows a view
+    actually paints.
+    """
+
+    def __init__(self, capacity=1000, parent=None):
+        super().__init__(parent)
+        if capacity < 1:
+            raise ValueError("Log capacity must be at least 1")
+        self._capacity = capacity
+        self._entries = [None] * capacity
+        self._start = 0                          # Slot of the oldest entry
+        self._count = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def entry(self, row):
+        return self._entries[(self._start + row) % self._capacity]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        timestamp, level, message = self.entry(index.row())
+        if role == Qt.DisplayRole:
+            return f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}"
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(level)
+        if role == LevelRole:
+            return level
+        if role == MessageRole:
+            return message
+        return None
+
+    # ========================
+    #        Writing
+    # ========================
+    def append(self, message, level=logging.INFO, timestamp=None):
+        entry = (time.time() if timestamp is None else timestamp, level, message)
+        capacity = self._capacity
+
+        # --- Drop the oldest row when full ---
+        if self._count == capacity:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self._start = (self._start + 1) % capacity
+            self._count -= 1
+            self.endRemoveRows()
+
+        row = self._count
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._entries[(self._start + row) % capacity] = entry
+        self._count += 1
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries = [None] * self._capacity
+        self._start = 0
+        self._count = 0
+        self.endResetModel()
+
+
+# ========================
+#    Log Filter Class
+# ========================
+class LogFilterProxy(QSortFilterProxyModel):
+    """Shows the entries at or above a severity that contain a text."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._min_level = logging.NOTSET
+        self._text = ""
+
+    def set_min_level(self, level):
+        self._min_level = level
+        self.invalidateFilter()
+
+    def set_text(self, text):
+        self._text = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._min_level == logging.NOTSET and not self._text:
+            return True
+        _, level, message = self.sourceModel().entry(source_row)
+        return level >= self._min_level and self._text in message.lower()
+
+
+# ========================
+#     Log View Class
+# ========================
+class LogView(QFrame):
+    """Bounded log pane with severity and text filters.
+
+    Drop-in for the read-only QTextEdit log panes: append() and clear()
+    keep their meaning, but only the last `capacity` entries are kept and
+    the list view only lays out the rows on screen. The view follows new
+    entries while it is scrolled to the bottom.
+    """
+
+    def __init__(self, parent=None, capacity=1000):
+        super().__init__(parent)
+        self.model = LogModel(capacity, self)
+        self.proxy = LogFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self._follow = True
+
+        # --- Filter Bar ---
+        self.level_filter = QComboBox(self)
+        for label, level in SEVERITY_FILTERS:
+            self.level_filter.addItem(label, level)
+        self.text_filter = QLineEdit(self)
+        self.text_filter.setPlaceholderText("Filter")
+        self.text_filter.setClearButtonEnabled(True)
+        filter_style = ("background-color: transparent; border: 1px solid rgba(255, 255, 255, 0.3);"
+                        " border-radius: 4px; padding: 0 4px;")
+        self.level_filter.setStyleSheet(filter_style)
+        self.text_filter.setStyleSheet(filter_style)
+
+        # --- List ---
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.proxy)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setWordWrap(False)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setStyleSheet("background-color: transparent; border: none;")
+
+        filter_bar = QHBoxLayout()
+        filter_bar.addWidget(self.level_filter)
+        filter_bar.addWidget(self.text_filter, 1)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.addLayout(filter_bar)
+        layout.addWidget(self.list_view)
+
+        self.level_filter.currentIndexChanged.connect(self._level_changed)
+        self.text_filter.textChanged.connect(self.proxy.set_text)
+        scroll_bar = self.list_view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._scrolled)
+        scroll_bar.rangeChanged.connect(self._range_changed)
+
+    def append(self, message, level=logging.INFO):
+        self.model.append(message, level)
+
+    def clear(self):
+        self.model.clear()
+
+    @pyqtSlot(int)
+    def _level_changed(self, index):
+        self.proxy.set_min_level(self.level_filter.itemData(index))
+
+    @pyqtSlot(int)
+    def _scrolled(self, value):
+        self._follow = value >= self.list_view.verticalScrollBar().maximum()
+
+    @pyqtSlot(int, int)
+    def _range_changed(self, minimum, maximum):
+        if self._follow:
+            self.list_view.verticalScrollBar().setValue(maximum)
+
+
+# ========================
+#        Benchmark
+# ========================
+def _benchmark(count=100_000, capacity=1000):
+    # --- Append cost early in a session vs. after many more entries than fit ---
+    import sys
+    from PyQt5.QtWidgets import QApplication, QTextEdit
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    log_view = LogView(capacity=capacity)
+    log_view.resize(600, 400)
+    log_view.show()
+    text_edit = QTextEdit()
+    text_edit.setReadOnly(True)
+    text_edit.resize(600, 400)
+    text_edit.show()
+
+    def appends(widget, n, offset):
+        start = time.perf_counter()
+        for i in range(n):
+            widget.append(f"Target 50.0% > Level {i + offset}% - FILLING")
+        app.processEvents()
+        return (time.perf_counter() - start) / n * 1e6
+
+    window = 2000
+    first = appends(log_view, window, 0)
+    appends(log_view, count - 2 * window, window)
+    last = appends(log_view, window, count - window)
+    print(f"LogView   ({capacity} rows): first {window} appends {first:6.1f} us, "
+          f"last {window} of {count} {last:6.1f} us, {log_view.model.rowCount()} rows kept")
+
+    count = count // 5                           # QTextEdit slows down as it grows
+    first = appends(text_edit, window, 0)
+    appends(text_edit, count - 2 * window, window)
+    last = appends(text_edit, window, count - window)
+    print(f"QTextEdit (unbounded): first {window} appends {first:6.1f} us, "
+          f"last {window} of {count} {last:6.1f} us, {text_edit.document().blockCount()} blocks kept")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -2,7 +2,7 @@
 #         Imports
 # ========================
 import ctypes
-
+import os
 import sys
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtCore import *
@@ -11,17 +11,22 @@ from PyQt5.QtGui import *
 
 from mainwindow import Ui_MainWindow
 from data import *
-import paho.mqtt.client as mqtt
 from Mqtt import MqttClient
+from render_scheduler import RenderScheduler
+from timeseries_store import TimeSeriesStore, TimeSeriesRecorder
+from sensor_recorder import SensorRecorder
+from controller_registry import ControllerRegistry, deferred
+from app_log import get_logger, configure_logging
+
+# Project-specific modules, imported when their screen is first opened
+LED_and_Button = deferred("project1", "LED_and_Button")
+Tem_hum_Sensor = deferred("project2", "Tem_hum_Sensor")
+WaterLevelControllerWindow = deferred("project3", "WaterLevelControllerWindow")
+LOADCELL = deferred("project4", "LOADCELL")
+AccelerometerGyroscopeController = deferred("project5", "AccelerometerGyroscopeController")
+GasSensorController = deferred("project6", "GasSensorController")
 
-# Project-specific modules
-from custom_switch import CustomSwitch
-from project1 import LED_and_Button
-from project2 import Tem_hum_Sensor
-from project3 import WaterLevelControllerWindow
-from project4 import LOADCELL
-from project5 import AccelerometerGyroscopeController
-from project6 import GasSensorController
+log = get_logger("app")
 
 
 # ========================
@@ -43,8 +48,13 @@ class MainWindow(QMainWindow):
 
         # --- State Variables ---
         self.active_line_edit = None
-        self.mqtt_client = MqttClient()
-        self.current_project = None
+        configure_logging(LOG_LEVELS)
+        self.mqtt_client = MqttClient(batch_interval_ms=16, preferred_wire_format=MQTT_WIRE_FORMAT)
+        self.render_scheduler = RenderScheduler(self.ui.stackedWidget, max_fps=30)
+        self.store = TimeSeriesStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings"))
+        self.sensor_recorder = SensorRecorder(self.mqtt_client, TimeSeriesRecorder(self.store))
+        self.projects = ControllerRegistry()
+        self.register_projects()
         self.drag_pos = QtCore.QPoint()
 
         # --- Layout Settings ---
@@ -69,6 +79,19 @@ class MainWindow(QMainWindow):
     #     UI Initialization
     # ========================
     
+    def register_projects(self):
+        # --- Project controllers are created on first visit and reused after ---
+        self.projects.register(screen_button, lambda: LED_and_Button(self.mqtt_client, self.ui))
+        self.projects.register(screen_wather, lambda: Tem_hum_Sensor(self.mqtt_client, self.ui))
+        self.projects.register(screen_sensor, lambda: WaterLevelControllerWindow(
+            self.mqtt_client, self.ui, self.render_scheduler, self.store))
+        self.projects.register(screen_load_cell, lambda: LOADCELL(
+            self.mqtt_client, self.ui, self.render_scheduler, self.store))
+        self.projects.register(screen_accelo, lambda: AccelerometerGyroscopeController(
+            self.mqtt_client, self.ui, self.render_scheduler))
+        self.projects.register(screen_gas_sensor, lambda: GasSensorController(
+            self.mqtt_client, self.ui, self.render_scheduler))
+
     def initUI(self):
         # Set default screen
         self.ui.stackedWidget.setCurrentIndex(screen_home)
@@ -80,6 +103,11 @@ class MainWindow(QMainWindow):
         self.ui.Connect_Button.clicked.connect(self.Connect)
         self.ui.Disconnect_Button.clicked.connect(self.Disconnect)
 
+        # --- MQTT Connection Outcome ---
+        self.mqtt_client.connected.connect(self.on_broker_connected)
+        self.mqtt_client.connection_refused.connect(self.on_broker_refused)
+        self.mqtt_client.connection_timeout.connect(self.on_broker_timeout)
+
         # --- Keyboard Buttons ---
         for btn in [
             self.ui.Btn_A, self.ui.Btn_Z, self.ui.Btn_E, self.ui.Btn_R,
@@ -106,21 +134,27 @@ class MainWindow(QMainWindow):
         for field in [self.ui.host_lineEdit, self.ui.user_lineEdit, self.ui.password_lineEdit]:
             field.installEventFilter(self)
 
-        # --- Navigation Buttons ---
-        self.ui.btn_accueil.clicked.connect(self.goToHome)
-        self.ui.btn_retour_buttonPr.clicked.connect(self.goToScreenProject)
-        self.ui.btn_retour_watherPr.clicked.connect(self.goToScreenProject)
-        self.ui.btn_retour_SensorPr.clicked.connect(self.goToScreenProject)
-        self.ui.btn_retour_LoadCell_Pr.clicked.connect(self.goToScreenProject)
-        self.ui.btn_retour_Accelo_Pr.clicked.connect(self.goToScreenProject)
-        self.ui.btn_retour_MQ2.clicked.connect(self.goToScreenProject)
-
-        self.ui.btn_Project_1.clicked.connect(self.goToScreenButton)
-        self.ui.btn_Project_2.clicked.connect(self.goToScreenWather)
-        self.ui.btn_Project_3.clicked.connect(self.goToScreenSensor)
-        self.ui.btn_Project_4.clicked.connect(self.goToScreenLoadCell)
-        self.ui.btn_Project_5.clicked.connect(self.goToScreenAccelo)
-        self.ui.btn_Project_6.clicked.connect(self.goToScreenGasSensor)
+    def connect_page_buttons(self, index):
+        # --- Navigation buttons, connected once their page has been built ---
+        if index == screen_project:
+            self.ui.btn_accueil.clicked.connect(self.goToHome)
+            self.ui.btn_Project_1.clicked.connect(self.goToScreenButton)
+            self.ui.btn_Project_2.clicked.connect(self.goToScreenWather)
+            self.ui.btn_Project_3.clicked.connect(self.goToScreenSensor)
+            self.ui.btn_Project_4.clicked.connect(self.goToScreenLoadCell)
+            self.ui.btn_Project_5.clicked.connect(self.goToScreenAccelo)
+            self.ui.btn_Project_6.clicked.connect(self.goToScreenGasSensor)
+
+        back_button = {
+            screen_button: "btn_retour_buttonPr",
+            screen_wather: "btn_retour_watherPr",
+            screen_sensor: "btn_retour_SensorPr",
+            screen_load_cell: "btn_retour_LoadCell_Pr",
+            screen_accelo: "btn_retour_Accelo_Pr",
+            screen_gas_sensor: "btn_retour_MQ2",
+        }.get(index)
+        if back_button:
+            getattr(self.ui, back_button).clicked.connect(self.goToScreenProject)
 
     # ========================
     #   Title Bar Handling
@@ -253,6 +287,13 @@ class MainWindow(QMainWindow):
     def mouseReleaseEvent(self, QMouseEvent):
         pass  # Placeholder for future logic
 
+    def closeEvent(self, event):
+        # --- Flush recorded samples before the window goes away ---
+        self.deactivate_current_project()
+        self.sensor_recorder.close()
+        self.mqtt_client.disconnect_from_broker()
+        super().closeEvent(event)
+
     # ========================
     #       MQTT Actions
     # ========================
@@ -269,45 +310,50 @@ class MainWindow(QMainWindow):
             self.ui.Authentification_label.show()
             return
         
-        # Attempt connection
-        try:
-            rc = self.mqtt_client.connect_to_broker(mqtt_broker, mqtt_port, mqtt_username, mqtt_password)
-            
-            # Handle connection result
-            if rc == 0:
-                print("Connection successful")
-                self.ui.Authentification_label.hide()
-                self.goToScreenProject()
-            elif rc == 1:
-                self.ui.Authentification_label.setText("Connection refused - incorrect protocol version.")
-                self.ui.Authentification_label.show()
-            elif rc == 5:
-                self.ui.Authentification_label.setText("Connection refused - bad username or password.")
-                self.ui.Authentification_label.show()
-            elif rc == -1:
-                self.ui.Authentification_label.setText("Connection error: could not reach host.")
-                self.ui.Authentification_label.show()
-            else:
-                self.ui.Authentification_label.setText(f"Connection failed with code {rc}")
-                self.ui.Authentification_label.show()
-                
-        except Exception as e:
-            print(f"Connection error: {e}")
-            self.ui.Authentification_label.setText(f"Connection error: {str(e)}")
-            self.ui.Authentification_label.show()
-
+        # Start connection; the outcome arrives through the MQTT client signals
+        self.ui.Connect_Button.setEnabled(False)
+        self.show_connection_message("Connecting...")
+        self.mqtt_client.connect_to_broker_async(mqtt_broker, mqtt_port, mqtt_username, mqtt_password)
+
+    def show_connection_message(self, text):
+        self.ui.Authentification_label.setText(text)
+        self.ui.Authentification_label.show()
+
+    def on_broker_connected(self):
+        log.info("Connection successful")
+        self.ui.Connect_Button.setEnabled(True)
+        self.ui.Authentification_label.hide()
+        self.goToScreenProject()
+
+    def on_broker_refused(self, rc):
+        self.ui.Connect_Button.setEnabled(True)
+        if rc == 1:
+            self.show_connection_message("Connection refused - incorrect protocol version.")
+        elif rc == 5:
+            self.show_connection_message("Connection refused - bad username or password.")
+        elif rc == -1:
+            self.show_connection_message("Connection error: could not reach host.")
+        else:
+            self.show_connection_message(f"Connection failed with code {rc}")
 
+    def on_broker_timeout(self):
+        self.ui.Connect_Button.setEnabled(True)
+        self.show_connection_message("Connection error: could not reach host.")
 
     def Disconnect(self):
         """Handle MQTT disconnection"""
-        print("Disconnect")
+        log.info("Disconnect")
         self.mqtt_client.disconnect_from_broker()
+        self.ui.Connect_Button.setEnabled(True)
 
     # ========================
     #     Navigation Logic
     # ========================
 
     def GotoScreen(self, index):
+        # Pages are built on first visit, before they are shown
+        if self.ui.ensurePage(index):
+            self.connect_page_buttons(index)
         self.ui.stackedWidget.setCurrentIndex(index)
 
     def goToHome(self):
@@ -318,33 +364,29 @@ class MainWindow(QMainWindow):
         self.GotoScreen(screen_project)
 
     def deactivate_current_project(self):
-        if self.current_project and hasattr(self.current_project, "deactivate"):
-            self.current_project.deactivate()
-        self.current_project = None
+        self.projects.suspend()
+
+    def show_project(self, screen):
+        self.GotoScreen(screen)
+        self.projects.activate(screen)
 
     def goToScreenButton(self):
-        self.GotoScreen(screen_button)
-        self.current_project = LED_and_Button(self.mqtt_client, self.ui)
+        self.show_project(screen_button)
 
     def goToScreenWather(self):
-        self.GotoScreen(screen_wather)
-        self.current_project = Tem_hum_Sensor(self.mqtt_client, self.ui)
+        self.show_project(screen_wather)
 
     def goToScreenSensor(self):
-        self.GotoScreen(screen_sensor)
-        self.current_project = WaterLevelControllerWindow(self.mqtt_client, self.ui)
+        self.show_project(screen_sensor)
 
     def goToScreenLoadCell(self):
-        self.GotoScreen(screen_load_cell)
-        self.current_project = LOADCELL(self.mqtt_client, self.ui)
+        self.show_project(screen_load_cell)
 
     def goToScreenAccelo(self):
-        self.GotoScreen(screen_accelo)
-        self.current_project = AccelerometerGyroscopeController(self.mqtt_client, self.ui)
+        self.show_project(screen_accelo)
 
     def goToScreenGasSensor(self):
-        self.GotoScreen(screen_gas_sensor)
-        self.current_project = GasSensorController(self.mqtt_client, self.ui)
+        self.show_project(screen_gas_sensor)
 
 
 # ========================
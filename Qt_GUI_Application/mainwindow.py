@@ -12,6 +12,10 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 
 
 class Ui_MainWindow(object):
+    # The pages of the stacked widget are built the first time they are shown
+    # (see ensurePage), not in setupUi. pyuic5 generates one eager setupUi, so
+    # after regenerating from mainwindow.ui the page bodies have to be moved
+    # back into their setupPage_/retranslatePage_ methods.
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         MainWindow.resize(930, 641)
@@ -146,6 +150,119 @@ class Ui_MainWindow(object):
 "    background-repeat: no-repeat;\n"
 "}")
         self.screen_home.setObjectName("screen_home")
+        self.stackedWidget.addWidget(self.screen_home)
+        self.screen_project = QtWidgets.QWidget()
+        self.screen_project.setStyleSheet("QWidget#screen_project {\n"
+"    border-image:url(:/pic/logo/backgroundProject1.jpg) 0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}")
+        self.screen_project.setObjectName("screen_project")
+        self.stackedWidget.addWidget(self.screen_project)
+        self.screen_button = QtWidgets.QWidget()
+        self.screen_button.setStyleSheet("QWidget#screen_button {\n"
+"    border-image:url(:/pic/logo/background_ledButton.jpg) 0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}")
+        self.screen_button.setObjectName("screen_button")
+        self.stackedWidget.addWidget(self.screen_button)
+        self.screen_wather = QtWidgets.QWidget()
+        self.screen_wather.setStyleSheet("QWidget#screen_wather {\n"
+"    border-image:url(:/pic/logo/background1.jpg)  0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}\n"
+"")
+        self.screen_wather.setObjectName("screen_wather")
+        self.stackedWidget.addWidget(self.screen_wather)
+        self.screen_water = QtWidgets.QWidget()
+        self.screen_water.setStyleSheet("QWidget#screen_water {\n"
+"    border-image:url(:/pic/logo/Backgroun-waterTank.png)  0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}\n"
+"")
+        self.screen_water.setObjectName("screen_water")
+        self.stackedWidget.addWidget(self.screen_water)
+        self.screen_load_cell = QtWidgets.QWidget()
+        self.screen_load_cell.setStyleSheet("QWidget#screen_load_cell {\n"
+"    border-image:url(:/pic/logo/backgroundLoad Cell.jpg) 0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}\n"
+"")
+        self.screen_load_cell.setObjectName("screen_load_cell")
+        self.stackedWidget.addWidget(self.screen_load_cell)
+        self.screen_accelo = QtWidgets.QWidget()
+        self.screen_accelo.setStyleSheet("QWidget#screen_accelo {\n"
+"    border-image:url(:/pic/logo/background-acc.jpg) 0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}\n"
+"")
+        self.screen_accelo.setObjectName("screen_accelo")
+        self.stackedWidget.addWidget(self.screen_accelo)
+        self.screen_gas_sensor = QtWidgets.QWidget()
+        self.screen_gas_sensor.setStyleSheet("QWidget#screen_gas_sensor {\n"
+"    border-image:url(:/pic/logo/background_MQ2.jpg) 0 0 0 0 stretch stretch;\n"
+"    background-position: center;\n"
+"    background-repeat: no-repeat;\n"
+"}\n"
+"")
+        self.screen_gas_sensor.setObjectName("screen_gas_sensor")
+        self.stackedWidget.addWidget(self.screen_gas_sensor)
+        self.page = QtWidgets.QWidget()
+        self.page.setStyleSheet("background-color : rgb(87, 247, 255);")
+        self.page.setObjectName("page")
+        self.stackedWidget.addWidget(self.page)
+        self._page_builders = [
+            (self.setupPage_screen_home, self.retranslatePage_screen_home),
+            (self.setupPage_screen_project, self.retranslatePage_screen_project),
+            (self.setupPage_screen_button, self.retranslatePage_screen_button),
+            (self.setupPage_screen_wather, self.retranslatePage_screen_wather),
+            (self.setupPage_screen_water, self.retranslatePage_screen_water),
+            (self.setupPage_screen_load_cell, self.retranslatePage_screen_load_cell),
+            (self.setupPage_screen_accelo, self.retranslatePage_screen_accelo),
+            (self.setupPage_screen_gas_sensor, self.retranslatePage_screen_gas_sensor),
+            (self.setupPage_page, self.retranslatePage_page),
+        ]
+        self._built_pages = set()
+        self.stackedWidget.currentChanged.connect(self.ensurePage)
+        self.verticalLayout_13.addWidget(self.stackedWidget)
+        self.verticalLayout_12.addWidget(self.content_bar)
+        self.verticalLayout_2.addWidget(self.drop_shadow_frame)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        self.ensurePage(0)
+        self.stackedWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def ensurePage(self, index):
+        """Build the stacked widget page at index if it is not built yet.
+
+        Returns True when the page was built by this call.
+        """
+        if index in self._built_pages or not 0 <= index < len(self._page_builders):
+            return False
+        self._built_pages.add(index)
+        setupPage, retranslatePage = self._page_builders[index]
+        setupPage()
+        retranslatePage()
+        page = self.stackedWidget.widget(index)
+        if page.isVisible():
+            # Children added to a visible parent outside a layout stay hidden
+            for child in page.findChildren(QtWidgets.QWidget, options=QtCore.Qt.FindDirectChildrenOnly):
+                if not child.testAttribute(QtCore.Qt.WA_WState_ExplicitShowHide):
+                    child.show()
+        return True
+
+    def ensureAllPages(self):
+        for index in range(len(self._page_builders)):
+            self.ensurePage(index)
+
+    def setupPage_screen_home(self):
         self.verticalLayout_14 = QtWidgets.QVBoxLayout(self.screen_home)
         self.verticalLayout_14.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_14.setSpacing(0)
@@ -2885,14 +3002,8 @@ class Ui_MainWindow(object):
         self.frame_keyboard.raise_()
         self.frame_connect.raise_()
         self.Authentification_label.raise_()
-        self.stackedWidget.addWidget(self.screen_home)
-        self.screen_project = QtWidgets.QWidget()
-        self.screen_project.setStyleSheet("QWidget#screen_project {\n"
-"    border-image:url(:/pic/logo/backgroundProject1.jpg) 0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}")
-        self.screen_project.setObjectName("screen_project")
+
+    def setupPage_screen_project(self):
         self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.screen_project)
         self.verticalLayout_3.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_3.setSpacing(0)
@@ -3099,14 +3210,8 @@ class Ui_MainWindow(object):
         self.btn_Project_6.setObjectName("btn_Project_6")
         self.gridLayout.addWidget(self.btn_Project_6, 2, 1, 1, 1)
         self.verticalLayout_3.addWidget(self.frame_6)
-        self.stackedWidget.addWidget(self.screen_project)
-        self.screen_button = QtWidgets.QWidget()
-        self.screen_button.setStyleSheet("QWidget#screen_button {\n"
-"    border-image:url(:/pic/logo/background_ledButton.jpg) 0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}")
-        self.screen_button.setObjectName("screen_button")
+
+    def setupPage_screen_button(self):
         self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.screen_button)
         self.verticalLayout_4.setContentsMargins(10, 10, 10, 10)
         self.verticalLayout_4.setSpacing(10)
@@ -3269,19 +3374,10 @@ class Ui_MainWindow(object):
 "")
         self.lab_board_status1.setObjectName("lab_board_status1")
         self.gridLayout_3.addWidget(self.lab_board_status1, 1, 2, 1, 1)
-        self.led_boardST = QtWidgets.QWidget(self.MQTT_Status)
-        self.led_boardST.setStyleSheet("QWidget#led_boardST  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-"    min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST = LedIndicator(self.MQTT_Status)
+        self.led_boardST.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST.setProperty("color", "red")
         self.led_boardST.setObjectName("led_boardST")
         self.gridLayout_3.addWidget(self.led_boardST, 1, 1, 1, 1)
         self.lab_board = QtWidgets.QLabel(self.MQTT_Status)
@@ -3647,63 +3743,43 @@ class Ui_MainWindow(object):
         self.label_btn_11.setAlignment(QtCore.Qt.AlignCenter)
         self.label_btn_11.setObjectName("label_btn_11")
         self.gridLayout_14.addWidget(self.label_btn_11, 0, 4, 1, 1)
-        self.label_red_led = QtWidgets.QLabel(self.frame_RedLED)
+        self.label_red_led = LedIndicator(self.frame_RedLED)
         self.label_red_led.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_red_led.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_red_led.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_red_led.setProperty("color", "white")
+        self.label_red_led.setProperty("borderWidth", 0)
         self.label_red_led.setText("")
         self.label_red_led.setObjectName("label_red_led")
         self.gridLayout_14.addWidget(self.label_red_led, 1, 0, 1, 1)
-        self.label_red_led_2 = QtWidgets.QLabel(self.frame_RedLED)
+        self.label_red_led_2 = LedIndicator(self.frame_RedLED)
         self.label_red_led_2.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_red_led_2.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_red_led_2.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_red_led_2.setProperty("color", "white")
+        self.label_red_led_2.setProperty("borderWidth", 0)
         self.label_red_led_2.setText("")
         self.label_red_led_2.setObjectName("label_red_led_2")
         self.gridLayout_14.addWidget(self.label_red_led_2, 1, 1, 1, 1)
-        self.label_red_led_3 = QtWidgets.QLabel(self.frame_RedLED)
+        self.label_red_led_3 = LedIndicator(self.frame_RedLED)
         self.label_red_led_3.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_red_led_3.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_red_led_3.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_red_led_3.setProperty("color", "white")
+        self.label_red_led_3.setProperty("borderWidth", 0)
         self.label_red_led_3.setText("")
         self.label_red_led_3.setObjectName("label_red_led_3")
         self.gridLayout_14.addWidget(self.label_red_led_3, 1, 2, 1, 1)
-        self.label_red_led_4 = QtWidgets.QLabel(self.frame_RedLED)
+        self.label_red_led_4 = LedIndicator(self.frame_RedLED)
         self.label_red_led_4.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_red_led_4.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_red_led_4.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_red_led_4.setProperty("color", "white")
+        self.label_red_led_4.setProperty("borderWidth", 0)
         self.label_red_led_4.setText("")
         self.label_red_led_4.setObjectName("label_red_led_4")
         self.gridLayout_14.addWidget(self.label_red_led_4, 1, 3, 1, 1)
-        self.label_red_led_5 = QtWidgets.QLabel(self.frame_RedLED)
+        self.label_red_led_5 = LedIndicator(self.frame_RedLED)
         self.label_red_led_5.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_red_led_5.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_red_led_5.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_red_led_5.setProperty("color", "white")
+        self.label_red_led_5.setProperty("borderWidth", 0)
         self.label_red_led_5.setText("")
         self.label_red_led_5.setObjectName("label_red_led_5")
         self.gridLayout_14.addWidget(self.label_red_led_5, 1, 4, 1, 1)
@@ -3771,77 +3847,50 @@ class Ui_MainWindow(object):
         self.label_btn_17.setAlignment(QtCore.Qt.AlignCenter)
         self.label_btn_17.setObjectName("label_btn_17")
         self.gridLayout_15.addWidget(self.label_btn_17, 0, 4, 1, 1)
-        self.label_green_led = QtWidgets.QLabel(self.frame_GreenLED)
+        self.label_green_led = LedIndicator(self.frame_GreenLED)
         self.label_green_led.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_green_led.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_green_led.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_green_led.setProperty("color", "white")
+        self.label_green_led.setProperty("borderWidth", 0)
         self.label_green_led.setText("")
         self.label_green_led.setObjectName("label_green_led")
         self.gridLayout_15.addWidget(self.label_green_led, 1, 0, 1, 1)
-        self.label_green_led_2 = QtWidgets.QLabel(self.frame_GreenLED)
+        self.label_green_led_2 = LedIndicator(self.frame_GreenLED)
         self.label_green_led_2.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_green_led_2.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_green_led_2.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_green_led_2.setProperty("color", "white")
+        self.label_green_led_2.setProperty("borderWidth", 0)
         self.label_green_led_2.setText("")
         self.label_green_led_2.setObjectName("label_green_led_2")
         self.gridLayout_15.addWidget(self.label_green_led_2, 1, 1, 1, 1)
-        self.label_green_led_3 = QtWidgets.QLabel(self.frame_GreenLED)
+        self.label_green_led_3 = LedIndicator(self.frame_GreenLED)
         self.label_green_led_3.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_green_led_3.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_green_led_3.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_green_led_3.setProperty("color", "white")
+        self.label_green_led_3.setProperty("borderWidth", 0)
         self.label_green_led_3.setText("")
         self.label_green_led_3.setObjectName("label_green_led_3")
         self.gridLayout_15.addWidget(self.label_green_led_3, 1, 2, 1, 1)
-        self.label_green_led_4 = QtWidgets.QLabel(self.frame_GreenLED)
+        self.label_green_led_4 = LedIndicator(self.frame_GreenLED)
         self.label_green_led_4.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_green_led_4.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_green_led_4.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_green_led_4.setProperty("color", "white")
+        self.label_green_led_4.setProperty("borderWidth", 0)
         self.label_green_led_4.setText("")
         self.label_green_led_4.setObjectName("label_green_led_4")
         self.gridLayout_15.addWidget(self.label_green_led_4, 1, 3, 1, 1)
-        self.label_green_led_5 = QtWidgets.QLabel(self.frame_GreenLED)
+        self.label_green_led_5 = LedIndicator(self.frame_GreenLED)
         self.label_green_led_5.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.label_green_led_5.setStyleSheet("QLabel {\n"
-"    background-color: rgb(255, 255, 255); /* Green color */\n"
-"    border-radius: 25px;       /* Makes the label circular */\n"
-"    min-width: 50px;          /* Minimum width */\n"
-"    min-height: 50px;         /* Minimum height */\n"
-"}\n"
-"")
+        self.label_green_led_5.setMinimumSize(QtCore.QSize(50, 50))
+        self.label_green_led_5.setProperty("color", "white")
+        self.label_green_led_5.setProperty("borderWidth", 0)
         self.label_green_led_5.setText("")
         self.label_green_led_5.setObjectName("label_green_led_5")
         self.gridLayout_15.addWidget(self.label_green_led_5, 1, 4, 1, 1)
         self.gridLayout_17.addWidget(self.frame_GreenLED, 1, 1, 1, 1)
         self.verticalLayout_4.addWidget(self.frame_23)
-        self.stackedWidget.addWidget(self.screen_button)
-        self.screen_wather = QtWidgets.QWidget()
-        self.screen_wather.setStyleSheet("QWidget#screen_wather {\n"
-"    border-image:url(:/pic/logo/background1.jpg)  0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}\n"
-"")
-        self.screen_wather.setObjectName("screen_wather")
+
+    def setupPage_screen_wather(self):
         self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.screen_wather)
         self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_5.setSpacing(0)
@@ -3879,6 +3928,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.btn_retour_watherPr.setText("")
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/pic/logo/retour.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.btn_retour_watherPr.setIcon(icon4)
         self.btn_retour_watherPr.setIconSize(QtCore.QSize(50, 50))
         self.btn_retour_watherPr.setObjectName("btn_retour_watherPr")
@@ -3999,6 +4050,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.refrech_btn_SW.setText("")
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/pic/logo/refresh.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.refrech_btn_SW.setIcon(icon5)
         self.refrech_btn_SW.setIconSize(QtCore.QSize(35, 35))
         self.refrech_btn_SW.setObjectName("refrech_btn_SW")
@@ -4036,19 +4089,10 @@ class Ui_MainWindow(object):
         self.lab_board_status_3.setAlignment(QtCore.Qt.AlignCenter)
         self.lab_board_status_3.setObjectName("lab_board_status_3")
         self.gridLayout_8.addWidget(self.lab_board_status_3, 1, 0, 1, 1)
-        self.led_boardST_2 = QtWidgets.QWidget(self.MQTT_Status_2)
-        self.led_boardST_2.setStyleSheet("QWidget#led_boardST_2  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-" min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST_2 = LedIndicator(self.MQTT_Status_2)
+        self.led_boardST_2.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST_2.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST_2.setProperty("color", "red")
         self.led_boardST_2.setObjectName("led_boardST_2")
         self.gridLayout_8.addWidget(self.led_boardST_2, 1, 1, 1, 1)
         self.verticalLayout_5.addWidget(self.MQTT_Status_2)
@@ -4256,7 +4300,7 @@ class Ui_MainWindow(object):
         self.lab_Action.setAlignment(QtCore.Qt.AlignCenter)
         self.lab_Action.setObjectName("lab_Action")
         self.verticalLayout_8.addWidget(self.lab_Action)
-        self.action_log = QtWidgets.QTextEdit(self.frame_55)
+        self.action_log = LogView(self.frame_55)
         font = QtGui.QFont()
         font.setFamily("Courier")
         font.setPointSize(15)
@@ -4265,8 +4309,6 @@ class Ui_MainWindow(object):
 "background-color: rgba(0, 0, 0, 0.3);/* Gray with some transparency */\n"
 "border-radius: 20px;  /* Rounded corners */\n"
 "")
-        self.action_log.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
-        self.action_log.setReadOnly(True)
         self.action_log.setObjectName("action_log")
         self.verticalLayout_8.addWidget(self.action_log)
         self.lab_Alert = QtWidgets.QLabel(self.frame_55)
@@ -4281,7 +4323,7 @@ class Ui_MainWindow(object):
         self.lab_Alert.setAlignment(QtCore.Qt.AlignCenter)
         self.lab_Alert.setObjectName("lab_Alert")
         self.verticalLayout_8.addWidget(self.lab_Alert)
-        self.alert_log = QtWidgets.QTextEdit(self.frame_55)
+        self.alert_log = LogView(self.frame_55)
         font = QtGui.QFont()
         font.setFamily("Courier")
         font.setPointSize(12)
@@ -4290,21 +4332,12 @@ class Ui_MainWindow(object):
 "background-color: rgba(0, 0, 0, 0.3);/* Gray with some transparency */\n"
 "border-radius: 20px;  /* Rounded corners */\n"
 "")
-        self.alert_log.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
-        self.alert_log.setReadOnly(True)
         self.alert_log.setObjectName("alert_log")
         self.verticalLayout_8.addWidget(self.alert_log)
         self.horizontalLayout_59.addWidget(self.frame_55)
         self.verticalLayout_5.addWidget(self.frame_33)
-        self.stackedWidget.addWidget(self.screen_wather)
-        self.screen_water = QtWidgets.QWidget()
-        self.screen_water.setStyleSheet("QWidget#screen_water {\n"
-"    border-image:url(:/pic/logo/Backgroun-waterTank.png)  0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}\n"
-"")
-        self.screen_water.setObjectName("screen_water")
+
+    def setupPage_screen_water(self):
         self.verticalLayout_11 = QtWidgets.QVBoxLayout(self.screen_water)
         self.verticalLayout_11.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_11.setSpacing(0)
@@ -4342,6 +4375,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.btn_retour_SensorPr.setText("")
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/pic/logo/retour.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.btn_retour_SensorPr.setIcon(icon4)
         self.btn_retour_SensorPr.setIconSize(QtCore.QSize(50, 50))
         self.btn_retour_SensorPr.setObjectName("btn_retour_SensorPr")
@@ -4389,19 +4424,10 @@ class Ui_MainWindow(object):
 "")
         self.lab_board_status_SS.setObjectName("lab_board_status_SS")
         self.gridLayout_9.addWidget(self.lab_board_status_SS, 1, 2, 1, 1)
-        self.led_boardST_3 = QtWidgets.QWidget(self.MQTT_Status_3)
-        self.led_boardST_3.setStyleSheet("QWidget#led_boardST_3  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-" min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST_3 = LedIndicator(self.MQTT_Status_3)
+        self.led_boardST_3.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST_3.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST_3.setProperty("color", "red")
         self.led_boardST_3.setObjectName("led_boardST_3")
         self.gridLayout_9.addWidget(self.led_boardST_3, 1, 1, 1, 1)
         self.refrech_btn_SS = QtWidgets.QPushButton(self.MQTT_Status_3)
@@ -4418,6 +4444,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.refrech_btn_SS.setText("")
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/pic/logo/refresh.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.refrech_btn_SS.setIcon(icon5)
         self.refrech_btn_SS.setIconSize(QtCore.QSize(35, 35))
         self.refrech_btn_SS.setObjectName("refrech_btn_SS")
@@ -4743,10 +4771,9 @@ class Ui_MainWindow(object):
         self.logBox.setObjectName("logBox")
         self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.logBox)
         self.verticalLayout_9.setObjectName("verticalLayout_9")
-        self.logText = QtWidgets.QTextEdit(self.logBox)
+        self.logText = LogView(self.logBox)
         self.logText.setStyleSheet("background-color: transparent;\n"
 " padding-top: 10px;")
-        self.logText.setReadOnly(True)
         self.logText.setObjectName("logText")
         self.verticalLayout_9.addWidget(self.logText)
         self.gridLayout_4.addWidget(self.logBox, 0, 2, 1, 1)
@@ -4770,15 +4797,8 @@ class Ui_MainWindow(object):
         self.verticalLayout_10.addWidget(self.Wate_Level_History_Plot)
         self.gridLayout_4.addWidget(self.frame_25, 1, 1, 1, 2)
         self.verticalLayout_11.addWidget(self.frame_39)
-        self.stackedWidget.addWidget(self.screen_water)
-        self.screen_load_cell = QtWidgets.QWidget()
-        self.screen_load_cell.setStyleSheet("QWidget#screen_load_cell {\n"
-"    border-image:url(:/pic/logo/backgroundLoad Cell.jpg) 0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}\n"
-"")
-        self.screen_load_cell.setObjectName("screen_load_cell")
+
+    def setupPage_screen_load_cell(self):
         self.verticalLayout_19 = QtWidgets.QVBoxLayout(self.screen_load_cell)
         self.verticalLayout_19.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_19.setSpacing(0)
@@ -4816,6 +4836,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.btn_retour_LoadCell_Pr.setText("")
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/pic/logo/retour.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.btn_retour_LoadCell_Pr.setIcon(icon4)
         self.btn_retour_LoadCell_Pr.setIconSize(QtCore.QSize(50, 50))
         self.btn_retour_LoadCell_Pr.setObjectName("btn_retour_LoadCell_Pr")
@@ -4867,6 +4889,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.refrech_btn_LC.setText("")
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/pic/logo/refresh.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.refrech_btn_LC.setIcon(icon5)
         self.refrech_btn_LC.setIconSize(QtCore.QSize(35, 35))
         self.refrech_btn_LC.setObjectName("refrech_btn_LC")
@@ -4880,19 +4904,10 @@ class Ui_MainWindow(object):
 "border-radius: 10px;  /* Rounded corners */")
         self.lab_board_status1_9.setObjectName("lab_board_status1_9")
         self.gridLayout_10.addWidget(self.lab_board_status1_9, 1, 6, 1, 1)
-        self.led_boardST_4 = QtWidgets.QWidget(self.MQTT_Status_4)
-        self.led_boardST_4.setStyleSheet("QWidget#led_boardST_4  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-" min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST_4 = LedIndicator(self.MQTT_Status_4)
+        self.led_boardST_4.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST_4.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST_4.setProperty("color", "red")
         self.led_boardST_4.setObjectName("led_boardST_4")
         self.gridLayout_10.addWidget(self.led_boardST_4, 1, 1, 1, 1)
         self.lab_mqtt_broker_LC = QtWidgets.QLabel(self.MQTT_Status_4)
@@ -5206,15 +5221,8 @@ class Ui_MainWindow(object):
         self.gridLayout_5.addWidget(self.Weight_History_Plot, 1, 0, 1, 3)
         self.verticalLayout_38.addWidget(self.frame_59)
         self.verticalLayout_19.addWidget(self.frame_43)
-        self.stackedWidget.addWidget(self.screen_load_cell)
-        self.screen_accelo = QtWidgets.QWidget()
-        self.screen_accelo.setStyleSheet("QWidget#screen_accelo {\n"
-"    border-image:url(:/pic/logo/background-acc.jpg) 0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}\n"
-"")
-        self.screen_accelo.setObjectName("screen_accelo")
+
+    def setupPage_screen_accelo(self):
         self.verticalLayout_20 = QtWidgets.QVBoxLayout(self.screen_accelo)
         self.verticalLayout_20.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_20.setSpacing(0)
@@ -5252,6 +5260,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.btn_retour_Accelo_Pr.setText("")
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/pic/logo/retour.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.btn_retour_Accelo_Pr.setIcon(icon4)
         self.btn_retour_Accelo_Pr.setIconSize(QtCore.QSize(50, 50))
         self.btn_retour_Accelo_Pr.setObjectName("btn_retour_Accelo_Pr")
@@ -5349,6 +5359,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.refrech_btn_MS.setText("")
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/pic/logo/refresh.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.refrech_btn_MS.setIcon(icon5)
         self.refrech_btn_MS.setIconSize(QtCore.QSize(35, 35))
         self.refrech_btn_MS.setObjectName("refrech_btn_MS")
@@ -5372,19 +5384,10 @@ class Ui_MainWindow(object):
 "")
         self.lab_board_status_MS.setObjectName("lab_board_status_MS")
         self.gridLayout_11.addWidget(self.lab_board_status_MS, 1, 2, 1, 1)
-        self.led_boardST_5 = QtWidgets.QWidget(self.MQTT_Status_5)
-        self.led_boardST_5.setStyleSheet("QWidget#led_boardST_5  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-" min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST_5 = LedIndicator(self.MQTT_Status_5)
+        self.led_boardST_5.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST_5.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST_5.setProperty("color", "red")
         self.led_boardST_5.setObjectName("led_boardST_5")
         self.gridLayout_11.addWidget(self.led_boardST_5, 1, 1, 1, 1)
         self.lab_mqtt_broker_MS = QtWidgets.QLabel(self.MQTT_Status_5)
@@ -5769,15 +5772,8 @@ class Ui_MainWindow(object):
         self.gyro_plot_widget.setObjectName("gyro_plot_widget")
         self.gridLayout_6.addWidget(self.gyro_plot_widget, 2, 1, 1, 1)
         self.verticalLayout_20.addWidget(self.frame_47)
-        self.stackedWidget.addWidget(self.screen_accelo)
-        self.screen_gas_sensor = QtWidgets.QWidget()
-        self.screen_gas_sensor.setStyleSheet("QWidget#screen_gas_sensor {\n"
-"    border-image:url(:/pic/logo/background_MQ2.jpg) 0 0 0 0 stretch stretch;\n"
-"    background-position: center;\n"
-"    background-repeat: no-repeat;\n"
-"}\n"
-"")
-        self.screen_gas_sensor.setObjectName("screen_gas_sensor")
+
+    def setupPage_screen_gas_sensor(self):
         self.verticalLayout_21 = QtWidgets.QVBoxLayout(self.screen_gas_sensor)
         self.verticalLayout_21.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_21.setSpacing(0)
@@ -5815,6 +5811,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.btn_retour_MQ2.setText("")
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/pic/logo/retour.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.btn_retour_MQ2.setIcon(icon4)
         self.btn_retour_MQ2.setIconSize(QtCore.QSize(50, 50))
         self.btn_retour_MQ2.setObjectName("btn_retour_MQ2")
@@ -5852,19 +5850,10 @@ class Ui_MainWindow(object):
         self.MQTT_Status_6.setObjectName("MQTT_Status_6")
         self.gridLayout_12 = QtWidgets.QGridLayout(self.MQTT_Status_6)
         self.gridLayout_12.setObjectName("gridLayout_12")
-        self.led_boardST_6 = QtWidgets.QWidget(self.MQTT_Status_6)
-        self.led_boardST_6.setStyleSheet("QWidget#led_boardST_6  {\n"
-"    /* Base Style */\n"
-"    background-color: rgb(255, 0, 0);\n"
-"    border-radius: 10px;\n"
-" min-width: 20px;\n"
-"    max-width: 20px;\n"
-"    min-height: 20px;\n"
-"    max-height: 20px;\n"
-"    border: 2px solid rgb(128, 0, 0);\n"
-"    \n"
-"    \n"
-"}")
+        self.led_boardST_6 = LedIndicator(self.MQTT_Status_6)
+        self.led_boardST_6.setMinimumSize(QtCore.QSize(24, 24))
+        self.led_boardST_6.setMaximumSize(QtCore.QSize(24, 24))
+        self.led_boardST_6.setProperty("color", "red")
         self.led_boardST_6.setObjectName("led_boardST_6")
         self.gridLayout_12.addWidget(self.led_boardST_6, 1, 1, 1, 1)
         self.lab_mqtt_broker_6 = QtWidgets.QLabel(self.MQTT_Status_6)
@@ -5947,6 +5936,8 @@ class Ui_MainWindow(object):
 "border-color:transparent;\n"
 "border-width: 5px;}")
         self.refrech_btn_GS.setText("")
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/pic/logo/refresh.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
         self.refrech_btn_GS.setIcon(icon5)
         self.refrech_btn_GS.setIconSize(QtCore.QSize(35, 35))
         self.refrech_btn_GS.setObjectName("refrech_btn_GS")
@@ -6066,45 +6057,24 @@ class Ui_MainWindow(object):
         self.horizontalLayout_18.setContentsMargins(5, 5, 5, 0)
         self.horizontalLayout_18.setSpacing(30)
         self.horizontalLayout_18.setObjectName("horizontalLayout_18")
-        self.led_green = QtWidgets.QLabel(self.frame_35)
+        self.led_green = LedIndicator(self.frame_35)
         self.led_green.setMinimumSize(QtCore.QSize(54, 54))
         self.led_green.setMaximumSize(QtCore.QSize(54, 54))
-        self.led_green.setStyleSheet("QLabel {\n"
-"    background-color: #003300;\n"
-"    border: 2px solid gray;\n"
-"    border-radius: 25px;\n"
-"    min-width: 50px;\n"
-"    min-height: 50px;\n"
-"}\n"
-"")
+        self.led_green.setProperty("color", "dark_green")
         self.led_green.setText("")
         self.led_green.setObjectName("led_green")
         self.horizontalLayout_18.addWidget(self.led_green)
-        self.led_yellow = QtWidgets.QLabel(self.frame_35)
+        self.led_yellow = LedIndicator(self.frame_35)
         self.led_yellow.setMinimumSize(QtCore.QSize(54, 54))
         self.led_yellow.setMaximumSize(QtCore.QSize(54, 54))
-        self.led_yellow.setStyleSheet("QLabel {\n"
-"    background-color: #333300;\n"
-"    border: 2px solid gray;\n"
-"    border-radius: 25px;\n"
-"    min-width: 50px;\n"
-"    min-height: 50px;\n"
-"}\n"
-"")
+        self.led_yellow.setProperty("color", "dark_yellow")
         self.led_yellow.setText("")
         self.led_yellow.setObjectName("led_yellow")
         self.horizontalLayout_18.addWidget(self.led_yellow)
-        self.led_red = QtWidgets.QLabel(self.frame_35)
+        self.led_red = LedIndicator(self.frame_35)
         self.led_red.setMinimumSize(QtCore.QSize(54, 54))
         self.led_red.setMaximumSize(QtCore.QSize(54, 54))
-        self.led_red.setStyleSheet("QLabel {\n"
-"    background-color: #330000;\n"
-"    border: 2px solid gray;\n"
-"    border-radius: 25px;\n"
-"    min-width: 50px;\n"
-"    min-height: 50px;\n"
-"}\n"
-"")
+        self.led_red.setProperty("color", "dark_red")
         self.led_red.setText("")
         self.led_red.setObjectName("led_red")
         self.horizontalLayout_18.addWidget(self.led_red)
@@ -6225,10 +6195,8 @@ class Ui_MainWindow(object):
         self.verticalLayout_22.addWidget(self.volt_plot_widget)
         self.horizontalLayout_9.addWidget(self.frame_19)
         self.verticalLayout_21.addWidget(self.frame_17)
-        self.stackedWidget.addWidget(self.screen_gas_sensor)
-        self.page = QtWidgets.QWidget()
-        self.page.setStyleSheet("background-color : rgb(87, 247, 255);")
-        self.page.setObjectName("page")
+
+    def setupPage_page(self):
         self.electric_frame = QtWidgets.QFrame(self.page)
         self.electric_frame.setGeometry(QtCore.QRect(480, 90, 400, 370))
         self.electric_frame.setMinimumSize(QtCore.QSize(400, 370))
@@ -6374,15 +6342,6 @@ class Ui_MainWindow(object):
         self.verticalLayout_26.addWidget(self.power_val_label)
         self.horizontalLayout_46.addWidget(self.power_sub_frame)
         self.verticalLayout_23.addWidget(self.power_frame)
-        self.stackedWidget.addWidget(self.page)
-        self.verticalLayout_13.addWidget(self.stackedWidget)
-        self.verticalLayout_12.addWidget(self.content_bar)
-        self.verticalLayout_2.addWidget(self.drop_shadow_frame)
-        MainWindow.setCentralWidget(self.centralwidget)
-
-        self.retranslateUi(MainWindow)
-        self.stackedWidget.setCurrentIndex(0)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
@@ -6391,6 +6350,11 @@ class Ui_MainWindow(object):
         self.btn_maximize.setToolTip(_translate("MainWindow", "Maximize"))
         self.btn_close.setToolTip(_translate("MainWindow", "Close"))
         self.label.setText(_translate("MainWindow", "Designed by Marwen Maghrebi . Contact us at marwen.maghrebi@gmail.com."))
+        for index in sorted(self._built_pages):
+            self._page_builders[index][1]()
+
+    def retranslatePage_screen_home(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_Authentification.setText(_translate("MainWindow", "Authentification"))
         self.lab_Host.setText(_translate("MainWindow", "Host"))
         self.lab_User.setText(_translate("MainWindow", "Username"))
@@ -6426,6 +6390,9 @@ class Ui_MainWindow(object):
         self.Btn_Dot.setText(_translate("MainWindow", "."))
         self.Btn_Sl.setText(_translate("MainWindow", "/"))
         self.Btn_Us.setText(_translate("MainWindow", "_"))
+
+    def retranslatePage_screen_project(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_Projects.setText(_translate("MainWindow", "Projects"))
         self.btn_Project_1.setText(_translate("MainWindow", "project 1"))
         self.btn_Project_4.setText(_translate("MainWindow", "project 4"))
@@ -6433,6 +6400,9 @@ class Ui_MainWindow(object):
         self.btn_Project_5.setText(_translate("MainWindow", "project 5"))
         self.btn_Project_3.setText(_translate("MainWindow", "project 3"))
         self.btn_Project_6.setText(_translate("MainWindow", "project 6"))
+
+    def retranslatePage_screen_button(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_Button_LED.setText(_translate("MainWindow", "Smart LED Control System"))
         self.MQTT_Status.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_mqttbroker_status.setText(_translate("MainWindow", "Status   "))
@@ -6466,6 +6436,9 @@ class Ui_MainWindow(object):
         self.label_btn_14.setText(_translate("MainWindow", "LED_G3"))
         self.label_btn_15.setText(_translate("MainWindow", "LED_G4"))
         self.label_btn_17.setText(_translate("MainWindow", "LED_G5"))
+
+    def retranslatePage_screen_wather(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_Wather_Station.setText(_translate("MainWindow", "Smart Climate Monitoring System"))
         self.MQTT_Status_2.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_mqtt_broker_2.setText(_translate("MainWindow", "Mqtt Broker"))
@@ -6485,6 +6458,9 @@ class Ui_MainWindow(object):
         self.lab_humThreshol.setText(_translate("MainWindow", "Humidity"))
         self.lab_Action.setText(_translate("MainWindow", "Action"))
         self.lab_Alert.setText(_translate("MainWindow", "Alert "))
+
+    def retranslatePage_screen_water(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_WaterLevel.setText(_translate("MainWindow", "Water Level Controller"))
         self.MQTT_Status_3.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_board_status_SS.setText(_translate("MainWindow", "Disconnected"))
@@ -6507,6 +6483,9 @@ class Ui_MainWindow(object):
         self.statusLabel.setText(_translate("MainWindow", "Status: Idle"))
         self.pushButton.setText(_translate("MainWindow", "Emergency Stop"))
         self.logBox.setTitle(_translate("MainWindow", "System Log"))
+
+    def retranslatePage_screen_load_cell(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_sensor_2.setText(_translate("MainWindow", "Load Cell Monitoring System"))
         self.MQTT_Status_4.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_board_status1_9.setText(_translate("MainWindow", "Connected"))
@@ -6530,6 +6509,9 @@ class Ui_MainWindow(object):
         self.Weight_History_label.setText(_translate("MainWindow", "Weight History"))
         self.clear_history_btn_LC.setText(_translate("MainWindow", "Reset"))
         self.export_data_btn_LC.setText(_translate("MainWindow", "Export"))
+
+    def retranslatePage_screen_accelo(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_MotionSensing.setText(_translate("MainWindow", "Motion Sensing and Data Analysis"))
         self.MQTT_Status_5.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_mqtt_broker_5.setText(_translate("MainWindow", "Mqtt Broker"))
@@ -6545,6 +6527,9 @@ class Ui_MainWindow(object):
         self.lab_Gyrox.setText(_translate("MainWindow", "GyroX"))
         self.lab_Gyroy.setText(_translate("MainWindow", "GyroY"))
         self.lab_Gyroz.setText(_translate("MainWindow", "GyroZ"))
+
+    def retranslatePage_screen_gas_sensor(self):
+        _translate = QtCore.QCoreApplication.translate
         self.lab_titel_MotionSensing_2.setText(_translate("MainWindow", "MQ-2 Gas Sensor Monitor"))
         self.MQTT_Status_6.setTitle(_translate("MainWindow", "MQTT Status"))
         self.lab_mqtt_broker_6.setText(_translate("MainWindow", "Mqtt Broker"))
@@ -6560,9 +6545,23 @@ class Ui_MainWindow(object):
         self.label_5.setText(_translate("MainWindow", "PPM"))
         self.lab_volt.setText(_translate("MainWindow", "Voltage Value"))
         self.label_6.setText(_translate("MainWindow", "V"))
+
+    def retranslatePage_page(self):
+        _translate = QtCore.QCoreApplication.translate
         self.volt_label.setText(_translate("MainWindow", "Voltage (V)"))
         self.current_label.setText(_translate("MainWindow", "Current (I)"))
         self.power_label.setText(_translate("MainWindow", "Power (P)"))
-from custom_switch import CustomSwitch
-from pyqtgraph import PlotWidget
-import image_rc
+from custom_switch import CustomSwitch, LedIndicator
+from log_view import LogView
+try:
+    import image_rc                              # Icons compiled with: pyrcc5 image.qrc -o image_rc.py
+except ImportError:
+    # Not built on this machine (headless checks, CI): the window works without its icons
+    from app_log import get_logger
+    get_logger("app").warning("image_rc not found, icons are not shown")
+
+
+def PlotWidget(parent=None):
+    # pyqtgraph is imported by the first page with a plot, not at startup
+    from pyqtgraph import PlotWidget
+    return PlotWidget(parent)
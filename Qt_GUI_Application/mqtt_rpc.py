@@ -0,0 +1,257 @@
+# ========================
+#         Imports
+# ========================
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from app_log import get_logger
+
+log = get_logger("mqtt")
+
+
+# ========================
+#      RPC Client Class
+# ========================
+class RpcClient(QObject):
+    """Request/response on top of MqttClient, with per-request timeouts.
+
+    request() publishes a request and returns a concurrent.futures.Future
+    that resolves with the (parsed) reply, fails with TimeoutError, or can
+    be cancelled by the caller. Each reply resolves exactly one request, so
+    a reply meant for one page is never also taken by another.
+
+    The request carries a " #<id>" token that the responder echoes at the
+    end of its reply, and the reply is matched by id; untagged replies
+    never resolve a tagged request. A request addressed to a board is sent
+    as "<payload> <board> #<id>": only that board answers, naming itself
+    as "<reply> @<board> #<id>", and the reply must match both the board
+    and the id. correlate=False is the fallback for responders that cannot
+    echo the token, like boards with firmware older than the token: the
+    request is sent bare and untagged replies resolve the oldest such
+    request waiting on that response topic, whichever board sent them.
+    Pending requests live in dicts, so matching and cancelling are O(1)
+    however many are outstanding; all timeouts share one timer armed for
+    the earliest deadline.
+
+    Futures resolve, and run their done callbacks, on the GUI thread.
+    """
+
+    _reply_received = pyqtSignal(str, str, bytes)    # response topic filter, topic, payload
+
+    def __init__(self, mqtt_client, clock=time.monotonic):
+        super().__init__()
+        self.mqtt_client = mqtt_client
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._pending = {}                       # Id -> (future, response topic, parse, description, board)
+        self._uncorrelated = {}                  # Response topic -> OrderedDict of ids, oldest first
+        self._waiting = {}                       # Response topic -> [pending count, subscription token]
+        self._deadlines = []                     # Heap of (deadline, id); finished ids are skipped, then compacted
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._expire)
+        self._reply_received.connect(self._on_reply)
+
+    def pending(self):
+        return len(self._pending)
+
+    # ========================
+    #        Requests
+    # ========================
+    def request(self, topic, payload, response_topic, timeout=1.0, parse=None, correlate=True, board=None):
+        # --- Publish payload to topic and return the Future of its reply on response_topic ---
+        # parse(text) turns the reply into the result; replies it returns
+        # None for are left for other requests. board addresses a
+        # correlated request to one responder.
+        request_id = next(self._ids)
+        future = Future()
+        if not correlate:
+            board = None
+        elif board is not None:
+            payload = f"{payload} {board}"
+        self._pending[request_id] = (future, response_topic, parse, f"{payload!r} on {topic}", board)
+        if not correlate:
+            self._uncorrelated.setdefault(response_topic, OrderedDict())[request_id] = None
+        self._subscribe(response_topic)
+        future.add_done_callback(lambda _: self._forget(request_id))
+
+        heapq.heappush(self._deadlines, (self._clock() + timeout, request_id))
+        if self._deadlines[0][1] == request_id:
+            self._arm()
+
+        self.mqtt_client.publish(topic, f"{payload} #{request_id}" if correlate else payload)
+        log.debug("Request %d: %r on %s", request_id, payload, topic)
+        return future
+
+    def _subscribe(self, response_topic):
+        waiting = self._waiting.get(response_topic)
+        if waiting is None:
+            # Raw bytes from any thread; the signal moves them to the GUI thread
+            token = self.mqtt_client.subscribe_to_topic(
+                response_topic, lambda topic, payload: self._reply_received.emit(response_topic, topic, payload),
+                raw=True)
+            waiting = self._waiting[response_topic] = [0, token]
+        waiting[0] += 1
+
+    def _forget(self, request_id):
+        # --- Done callback of every request: drop it from the tables ---
+        entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        response_topic = entry[1]
+        uncorrelated = self._uncorrelated.get(response_topic)
+        if uncorrelated is not None:
+            uncorrelated.pop(request_id, None)
+            if not uncorrelated:
+                del self._uncorrelated[response_topic]
+
+        # Every pending request has one deadline; drop the finished ones once
+        # they outnumber it, in place as _expire may be iterating the heap
+        deadlines = self._deadlines
+        if len(deadlines) > 2 * len(self._pending) + 8:
+            deadlines[:] = [entry for entry in deadlines if entry[1] in self._pending]
+            heapq.heapify(deadlines)
+
+        # Leave the response topic once nothing waits on it
+        waiting = self._waiting[response_topic]
+        waiting[0] -= 1
+        if not waiting[0]:
+            del self._waiting[response_topic]
+            self.mqtt_client.unsubscribe_from_topic(response_topic, waiting[1])
+
+    # ========================
+    #         Replies
+    # ========================
+    @pyqtSlot(str, str, bytes)
+    def _on_reply(self, response_topic, topic, payload):
+        text = payload.decode(errors="replace")
+
+        # --- Tagged reply: exactly one candidate, from the board it was sent to ---
+        head, tagged, tail = text.rpartition(" #")
+        if tagged and tail.isdigit():
+            entry = self._pending.get(int(tail))
+            if entry is None or entry[1] != response_topic:
+                return
+            reply, addressed, board = head.rpartition(" @")
+            if not addressed:
+                reply, board = head, None
+            if board == entry[4]:
+                self._resolve(entry, reply)
+            else:
+                log.debug("Reply %r is not from board %s", text, entry[4])
+            return
+
+        # --- Untagged reply: the oldest request that accepts it ---
+        for request_id in self._uncorrelated.get(response_topic, ()):
+            if self._resolve(self._pending[request_id], text):
+                return                           # Resolving changed the table; stop iterating
+
+    @staticmethod
+    def _resolve(entry, text):
+        future, _, parse, _, _ = entry
+        try:
+            result = parse(text) if parse else text
+        except Exception as e:
+            log.error("Could not parse reply %r: %s", text, e)
+            return False
+        if result is None:
+            return False
+        future.set_result(result)
+        return True
+
+    # ========================
+    #        Timeouts
+    # ========================
+    def _arm(self):
+        # --- Run _expire at the earliest deadline of a pending request ---
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][1] not in self._pending:
+            heapq.heappop(deadlines)
+        if deadlines:
+            self._timer.start(max(0, int((deadlines[0][0] - self._clock()) * 1000) + 1))
+        else:
+            self._timer.stop()
+
+    @pyqtSlot()
+    def _expire(self):
+        now = self._clock()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, request_id = heapq.heappop(deadlines)
+            entry = self._pending.get(request_id)
+            if entry is not None:
+                log.debug("Request %d timed out", request_id)
+                entry[0].set_exception(TimeoutError(f"No reply to {entry[3]}"))
+        self._arm()
+
+
+# ========================
+#        Benchmark
+# ========================
+def _benchmark(outstanding=10_000, boards=("led_button", "weather", "water_level")):
+    # --- Cost per request and per reply with many requests outstanding ---
+    import os
+    import sys
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QCoreApplication
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    class LoopbackMqtt:
+        # Answers every request at once, as the firmware does: the addressed
+        # board names itself and echoes the token, and every board answers a
+        # bare request. A board with the previous firmware also echoes the
+        # token of every tagged request, ahead of the addressed board.
+        def __init__(self):
+            self.handlers = {}
+            self.replies = []
+
+        def subscribe_to_topic(self, topic, handler=None, **options):
+            token = object()
+            self.handlers[token] = handler
+            return token
+
+        def unsubscribe_from_topic(self, topic, token=None):
+            self.handlers.pop(token, None)
+
+        def publish(self, topic, payload):
+            request, _, tag = payload.partition(" #")
+            if not tag:
+                self.replies.extend(f"Board : {board} Status : Connected" for board in boards)
+                return
+            board = request.partition(" ")[2]
+            self.replies.append(f"Board : ESP32 Status : Connected #{tag}")
+            self.replies.append(f"Board : {board} Status : Connected @{board} #{tag}")
+
+        def deliver(self):
+            for reply in self.replies:
+                for handler in list(self.handlers.values()):
+                    handler("mqtt/response", reply.encode())
+            self.replies.clear()
+
+    for correlate in (True, False):
+        mqtt = LoopbackMqtt()
+        rpc = RpcClient(mqtt)
+        start = time.perf_counter()
+        addressed = [boards[i % len(boards)] for i in range(outstanding)]
+        futures = [rpc.request("mqtt/request", "status_request", "mqtt/response", timeout=60,
+                               correlate=correlate, board=board) for board in addressed]
+        sent = time.perf_counter()
+        mqtt.deliver()
+        app.processEvents()
+        done = time.perf_counter()
+        assert all(future.done() for future in futures) and rpc.pending() == 0 and not mqtt.handlers
+        if correlate:
+            assert all(future.result() == f"Board : {board} Status : Connected"
+                       for future, board in zip(futures, addressed)), "a reply resolved another board's request"
+        label = "tagged replies" if correlate else "untagged (FIFO)"
+        print(f"{label:<16} {outstanding} outstanding: request {(sent - start) / outstanding * 1e6:5.1f} us, "
+              f"reply {(done - sent) / outstanding * 1e6:5.1f} us")
+
+
+if __name__ == "__main__":
+    _benchmark()
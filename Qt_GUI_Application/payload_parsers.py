@@ -0,0 +1,302 @@
+# ========================
+#         Imports
+# ========================
+import json
+import re
+from operator import itemgetter
+from typing import NamedTuple
+
+# --- Optional fast JSON libraries; the standard library is the fallback ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# ========================
+#      Parsed Payloads
+# ========================
+class LedEvent(NamedTuple):
+    led: int                                     # 1..5
+    on: bool
+
+
+class WeatherReading(NamedTuple):
+    temp_c: float
+    temp_f: float
+    humidity: float
+
+
+class WaterLevelReading(NamedTuple):
+    level: float                                 # Percent
+
+
+class LoadReading(NamedTuple):
+    weight: float
+    unit: str
+
+
+class BoardStatus(NamedTuple):
+    board: str
+    status: str                                  # Lower case, e.g. "connected"
+    connected: bool
+
+
+# Field names are the JSON keys sent by the firmware
+class MpuReading(NamedTuple):
+    accelX: float
+    accelY: float
+    accelZ: float
+    gyroX: float
+    gyroY: float
+    gyroZ: float
+    temp: float
+
+
+class GasReading(NamedTuple):
+    gas_ppm: float
+    voltage: float
+
+
+# ========================
+#         Parsers
+# ========================
+# Every parser makes a single pass over the payload: fixed labels are
+# compared as literal prefixes, and only the weather format, which has
+# three fields, goes through one precompiled pattern. Numbers are checked
+# by float() itself. A payload in any other format gives None.
+_tuple = tuple.__new__                           # Builds a NamedTuple without the keyword wrapper
+
+_WEATHER = re.compile(r"Temperature: ?([^°]+)°C, ?Temperature: ?([^°]+)°F, ?Humidity: ?([^%]+)%?")
+
+
+def parse_led_event(payload):
+    # "leds3 ON" -> LedEvent(3, True)
+    name, _, state = payload.strip().partition(" ")
+    if name[:4] != "leds" or state not in ("ON", "OFF") or not name[4:].isdigit():
+        return None
+    return _tuple(LedEvent, (int(name[4:]), state == "ON"))
+
+
+def parse_weather(payload):
+    # "Temperature: 23.5°C, Temperature: 74.3°F, Humidity: 40.0%"
+    m = _WEATHER.fullmatch(payload.strip())
+    if m is None:
+        return None
+    temp_c, temp_f, humidity = m.groups()
+    try:
+        return _tuple(WeatherReading, (float(temp_c), float(temp_f), float(humidity)))
+    except ValueError:
+        return None
+
+
+def parse_water_level(payload):
+    # "Water Level: 42" -> WaterLevelReading(42.0)
+    if payload[:12] != "Water Level:":
+        return None
+    try:
+        return _tuple(WaterLevelReading, (float(payload[12:].rstrip().rstrip("%")),))
+    except ValueError:
+        return None
+
+
+def parse_load(payload):
+    # "Load: 12.34 kg" -> LoadReading(12.34, "kg")
+    label, _, rest = payload.strip().partition(": ")
+    if label != "Load":
+        return None
+    value, _, unit = rest.partition(" ")
+    try:
+        return _tuple(LoadReading, (float(value), unit.strip().lower() or "kg"))
+    except ValueError:
+        return None
+
+
+def parse_board_status(payload):
+    # "Board : ESP32 Status : Connected" -> BoardStatus("ESP32", "connected", True)
+    board, found, status = payload.partition("Status :")
+    if not found or not board.startswith("Board :"):
+        return None
+    status = status.strip().lower()
+    return _tuple(BoardStatus, (board[7:].strip(), status, status == "connected"))
+
+
+# ========================
+#      JSON Payloads
+# ========================
+def _json_loads(payload):
+    # json.loads detects the encoding of bytes itself, which costs more than decoding
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode()
+    return json.loads(payload)
+
+
+def available_json_backends():
+    # --- Fastest first ---
+    backends = []
+    if orjson is not None:
+        backends.append("orjson")
+    if msgspec is not None:
+        backends.append("msgspec")
+    return backends + ["pattern", "json"]
+
+
+class JsonSchemaDecoder:
+    """Decodes a flat JSON object of numeric fields into a NamedTuple.
+
+    Payloads can be passed as the raw MQTT bytes. The backend defaults to
+    the fastest one installed. The "pattern" backend matches the firmware's
+    field order with one compiled pattern and only falls back to the json
+    module for payloads written differently. Calling the decoder returns
+    None when a field is missing or not a number.
+    """
+
+    def __init__(self, reading_type, backend=None):
+        self.reading_type = reading_type
+        self.backend = backend or available_json_backends()[0]
+        fields = reading_type._fields
+        self._fields = itemgetter(*fields)
+
+        if self.backend == "orjson":
+            self._loads = orjson.loads
+            self.decode = self._decode_mapping
+        elif self.backend == "msgspec":
+            struct = msgspec.defstruct(reading_type.__name__, [(field, float) for field in fields])
+            self._decoder = msgspec.json.Decoder(struct)
+            self.decode = self._decode_msgspec
+        elif self.backend == "pattern":
+            self._loads = _json_loads
+            self._pattern = re.compile(
+                rb"\{\s*" + rb",\s*".join(b'"' + field.encode() + rb'"\s*:([^,}]*)' for field in fields) + rb"\}")
+            self.decode = self._decode_pattern
+        elif self.backend == "json":
+            self._loads = _json_loads
+            self.decode = self._decode_mapping
+        else:
+            raise ValueError(f"Unknown JSON backend '{self.backend}'")
+
+    def __call__(self, payload):
+        return self.decode(payload)
+
+    def _decode_mapping(self, payload):
+        try:
+            values = self._fields(self._loads(payload))
+            return _tuple(self.reading_type, map(float, values))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _decode_msgspec(self, payload):
+        try:
+            return _tuple(self.reading_type, msgspec.structs.astuple(self._decoder.decode(payload)))
+        except msgspec.MsgspecError:
+            return None
+
+    def _decode_pattern(self, payload):
+        if isinstance(payload, str):
+            payload = payload.encode()
+        m = self._pattern.fullmatch(payload.strip())
+        if m is None:
+            return self._decode_mapping(payload)
+        try:
+            return _tuple(self.reading_type, map(float, m.groups()))
+        except ValueError:
+            return None
+
+
+decode_mpu6050 = JsonSchemaDecoder(MpuReading)
+decode_gas = JsonSchemaDecoder(GasReading)
+
+
+# ========================
+#        Benchmark
+# ========================
+# The legacy functions repeat what the project handlers did before. They
+# return bare floats and tuples; the parsers build a NamedTuple, which
+# costs about 0.25 us on its own and is most of the time of the water
+# level and board status parsers.
+def _legacy_weather(payload):
+    if not ("Temperature:" in payload and "Humidity:" in payload):
+        return None
+    tempC = payload.split("Temperature: ")[1].split(",")[0].replace("°C", "").strip()
+    tempF = payload.split("Temperature: ")[2].split(",")[0].replace("°F", "").strip()
+    hum = payload.split("Humidity: ")[1].replace("%", "").strip()
+    return float(tempC), float(tempF), float(hum)
+
+
+def _legacy_water_level(payload):
+    if not payload.startswith("Water Level:"):
+        return None
+    return float(payload.split(':')[1].strip().split('%')[0].strip())
+
+
+def _legacy_load(payload):
+    payload_str = str(payload).strip()
+    if ": " not in payload_str:
+        return None
+    _, value_with_unit = payload_str.split(": ", 1)
+    return float(re.findall(r'(\d+\.?\d*)\s*(?:kg|g|lbs?)?', value_with_unit.lower())[0])
+
+
+def _legacy_json(payload):
+    sensor_data = json.loads(payload.decode())
+    return sensor_data.get("accelX", 0), sensor_data.get("accelY", 0), sensor_data.get("accelZ", 0), \
+        sensor_data.get("gyroX", 0), sensor_data.get("gyroY", 0), sensor_data.get("gyroZ", 0), sensor_data.get("temp", "--")
+
+
+def _legacy_board_status(payload):
+    if not ("Board :" in payload and "Status :" in payload):
+        return None
+    board_part, status_part = payload.split("Status :")
+    status = status_part.strip().lower()
+    return board_part.replace("Board :", "").strip(), status, status == "connected"
+
+
+def _benchmark(count=1_000_000):
+    # --- Compare against the split/findall code the projects used before ---
+    import random
+    import time
+
+    rng = random.Random(0)
+    cases = [
+        ("weather", parse_weather, _legacy_weather, [
+            f"Temperature: {t:.1f}°C, Temperature: {t * 9 / 5 + 32:.1f}°F, Humidity: {rng.uniform(0, 100):.1f}%"
+            for t in (rng.uniform(-40, 80) for _ in range(count))]),
+        ("water level", parse_water_level, _legacy_water_level, [
+            f"Water Level: {rng.randint(0, 100)}" for _ in range(count)]),
+        ("load", parse_load, _legacy_load, [
+            f"Load: {rng.uniform(0, 50):.2f} kg" for _ in range(count)]),
+        ("board status", parse_board_status, _legacy_board_status, [
+            "Board : ESP32 Status : Connected"] * count),
+    ]
+
+    for name, parser, legacy, payloads in cases:
+        timings = []
+        for func in (legacy, parser):
+            start = time.perf_counter()
+            for payload in payloads:
+                func(payload)
+            timings.append((time.perf_counter() - start) / count * 1e9)
+        print(f"{name:>12}: legacy {timings[0]:6.0f} ns, compiled {timings[1]:6.0f} ns "
+              f"({timings[0] / timings[1]:.2f}x)")
+
+    # --- MPU6050 JSON from raw bytes, per available backend ---
+    payloads = [
+        ('{"accelX":%.2f,"accelY":%.2f,"accelZ":%.2f,"gyroX":%.2f,"gyroY":%.2f,"gyroZ":%.2f,"temp":%.1f}'
+         % tuple(rng.uniform(-10, 40) for _ in range(7))).encode()
+        for _ in range(count)]
+    decoders = [("legacy", _legacy_json)]
+    decoders += [(backend, JsonSchemaDecoder(MpuReading, backend)) for backend in available_json_backends()]
+    for name, decode in decoders:
+        start = time.perf_counter()
+        for payload in payloads:
+            decode(payload)
+        print(f"{'mpu6050':>12}: {name:<8} {(time.perf_counter() - start) / count * 1e9:6.0f} ns")
+
+
+if __name__ == "__main__":
+    _benchmark()
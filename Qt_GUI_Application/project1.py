@@ -1,8 +1,15 @@
 # ========================
 #         Imports
 # ========================
-from data import MQTT_TOPIC_LED, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs
-from PyQt5.QtCore import QTimer, QObject, pyqtSignal, pyqtSlot
+from data import MQTT_TOPIC_LED, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, BOARD_LED_BUTTON, MQTT_STATUS_TOKENS
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_LED
+from indicator_style import BOARD_STATUS, board_status_state
+from board_presence import presence_display
+from app_log import get_logger
+
+log = get_logger("led")
 
 
 class LED_and_Button(QObject):
@@ -21,23 +28,22 @@ class LED_and_Button(QObject):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
-        self.status_received = False
+        self._status_request = None  # Pending status_request reply (Future)
         self.switches = {}  # Dictionary to store all switch references
         
-        # Initialize all components
-        self._setup_mqtt()
+        # One-time setup; subscriptions are made by activate()
         self._connect_signals()
         self._init_ui_components()
         self._setup_button_mappings()
         self._setup_switch_mappings()
         self._init_buttons()
         self._init_switches()
-        self._init_status_display()
 
     def _setup_mqtt(self):
         """Initialize MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_LED, self.handle_led_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_message)
+        self._subscriptions = [
+            (MQTT_TOPIC_LED, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_LED, self.handle_led_message, schema=SCHEMA_LED)),
+        ]
 
     def _connect_signals(self):
         """Connect internal signals to slots"""
@@ -94,7 +100,7 @@ class LED_and_Button(QObject):
                 switch = getattr(self.ui, name)
                 self._configure_switch(switch, name)
             else:
-                print(f"Warning: {name} not found as direct attribute in UI!")
+                log.warning("%s not found as direct attribute in UI!", name)
 
     def _init_status_display(self):
         """Initialize board status display"""
@@ -150,11 +156,11 @@ class LED_and_Button(QObject):
             lambda state, n=name: self.handle_switch_state(state, n))
         
         switch.update()
-        print(f"Initialized {name} successfully")
+        log.debug("Initialized %s successfully", name)
 
     def handle_switch_state(self, state, switch_name):
         """Handle switch state changes - controls green LEDs"""
-        print(f"{switch_name} changed to {'ON' if state else 'OFF'}")
+        log.debug("%s changed to %s", switch_name, 'ON' if state else 'OFF')
         
         led_id = self.switch_to_green_led.get(switch_name)
         if led_id:
@@ -190,155 +196,108 @@ class LED_and_Button(QObject):
     # ============================================================================
     def reset_label_color(self, label):
         """Reset to original white color"""
-        label.setStyleSheet("""
-            QLabel {
-                background-color: rgb(255, 255, 255);
-                border-radius: 25px;
-                min-width: 50px;
-                min-height: 50px;
-            }
-        """)
+        label.set_color("white")
 
     def _set_red_color(self, label):
         """Change only the background color to red"""
-        label.setStyleSheet("""
-            QLabel {
-                background-color: rgb(255, 0, 0);
-                border-radius: 25px;
-                min-width: 50px;
-                min-height: 50px;
-            }
-        """)
+        label.set_color("red")
 
     def _set_green_color(self, label):
         """Change only the background color to green"""
-        label.setStyleSheet("""
-            QLabel {
-                background-color: rgb(0, 255, 0);
-                border-radius: 25px;
-                min-width: 50px;
-                min-height: 50px;
-            }
-        """)
+        label.set_color("green")
 
     def _apply_board_status_style(self, color):
         """Apply styling to board status display"""
-        style = ""
-        if color == "green":
-            style = """
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        elif color == "red":
-            style = """
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        self.ui.lab_board_status1.setStyleSheet(style)
+        BOARD_STATUS.set_state(self.ui.lab_board_status1, board_status_state(color))
 
     def _apply_led_style(self, led, color):
         """Apply styling to LED indicator"""
-        style = ""
-        if color == "green":
-            style = """
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """
-        elif color == "red":
-            style = """
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """
-        led.setStyleSheet(style)
+        led.set_color(board_status_state(color))
 
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_led_message(self, topic, payload):
-        """Handle incoming LED control messages for combined red/green labels"""
-        print(f"[LED MESSAGE] Received payload: '{payload}'")
+    def handle_led_message(self, topic, event):
+        """Handle incoming LED events (text "leds3 ON" or binary) for combined red/green labels"""
+        log.debug("Received event: %s", event)
 
         try:
-            if payload.startswith("leds"):
-                parts = payload.split()
-                if len(parts) == 2:
-                    led_id, state = parts
-                    led_num = led_id.replace("leds", "")  # Extract the number
-                    
-                    red_label_name = f"label_red_led_{led_num}" if led_num != "1" else "label_red_led"
-                    green_label_name = f"label_green_led_{led_num}" if led_num != "1" else "label_green_led"
-                    
-                    if state == "ON":
-                        self.update_label_color.emit(red_label_name, "red")
-                        self.update_label_color.emit(green_label_name, "green")
-                    elif state == "OFF":
-                        self.update_label_color.emit(red_label_name, "reset")
-                        self.update_label_color.emit(green_label_name, "reset")
-        except Exception as e:
-            print(f"[ERROR] Processing LED message: {e}")
-
-    def handle_status_message(self, topic, payload):
-        """Process board status messages from response topic"""
-        try:           
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip().lower()
+            if event is not None:
+                led_num = event.led
+                red_label_name = f"label_red_led_{led_num}" if led_num != 1 else "label_red_led"
+                green_label_name = f"label_green_led_{led_num}" if led_num != 1 else "label_green_led"
                 
-                if status == "connected":
-                    self.update_board_status.emit(board_name, "Connected", "green")
-                    self.update_led_status.emit("led_boardST", "green")
-                    self.status_received = True
+                if event.on:
+                    self.update_label_color.emit(red_label_name, "red")
+                    self.update_label_color.emit(green_label_name, "green")
                 else:
-                    self.update_board_status.emit(board_name, status, "red")
-                    self.update_led_status.emit("led_boardST", "red")
-                    
+                    self.update_label_color.emit(red_label_name, "reset")
+                    self.update_label_color.emit(green_label_name, "reset")
         except Exception as e:
-            print(f"Error processing status message: {e}")
+            log.error("Error processing LED message: %s", e)
 
     # ============================================================================
     # BOARD STATUS MANAGEMENT
     # ============================================================================
     def request_board_status(self):
-        """Send status request to request topic with timeout fallback"""
-        self.status_received = False
-        self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-        print(f"[STATUS] Sent status request to {MQTT_TOPIC_MQTT_Rq}")
-        
-        QTimer.singleShot(1000, self.check_status_response)
-
-    def check_status_response(self):
-        """Check if we received a valid response"""
-        if not self.status_received:
-            print("[STATUS] No response received within timeout period")
+        """Send a status request; its reply or timeout updates the display"""
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self._status_request = self.mqtt_client.rpc.request(
+            MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=1.0, parse=parse_board_status,
+            correlate=MQTT_STATUS_TOKENS, board=BOARD_LED_BUTTON)
+        self._status_request.add_done_callback(self.handle_status_reply)
+        log.debug("Sent status request to %s", MQTT_TOPIC_MQTT_Rq)
+
+    def handle_status_reply(self, request):
+        """Show the board status from the reply, or disconnected after a timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
+            log.warning("No response received within timeout period")
             self.update_board_status.emit("Unknown", "Disconnected", "red")
             self.update_led_status.emit("led_boardST", "red")
+            return
+        status = request.result()
+        if status.connected:
+            self.update_board_status.emit(status.board, "Connected", "green")
+            self.update_led_status.emit("led_boardST", "green")
+        else:
+            self.update_board_status.emit(status.board, status.status, "red")
+            self.update_led_status.emit("led_boardST", "red")
+
+    def handle_presence(self, board, status):
+        """Show the board's presence as it changes, without a status request"""
+        if board != BOARD_LED_BUTTON:
+            return
+        display = presence_display(status)
+        if display is not None:
+            board_name, text, color = display
+            self.update_board_status.emit(board_name, text, color)
+            self.update_led_status.emit("led_boardST", color)
 
     # ============================================================================
-    # CLEANUP
+    # LIFECYCLE
     # ============================================================================
-    def deactivate(self):
-        """Clean up before exiting or switching projects."""
-        print("deactivate P1")
+    def activate(self):
+        """Subscribe and reset the page each time it is shown"""
+        log.info("activate P1")
+        self._setup_mqtt()
+        self._init_status_display()
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_LED_BUTTON, self.mqtt_client.presence.status(BOARD_LED_BUTTON))
+
+    def suspend(self):
+        """Unsubscribe and reset the page when leaving it; the instance is reused."""
+        log.info("suspend P1")
         self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "TurnOFF")
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
         # Unsubscribe from MQTT topics
-        self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_LED)
-        self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
+        for topic, token in self._subscriptions:
+            self.mqtt_client.unsubscribe_from_topic(topic, token)
         # Reset button texts and labels
         for btn, _, label in self.button_map:
             btn.setText("OFF")
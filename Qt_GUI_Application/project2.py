@@ -1,10 +1,17 @@
 # ========================
 #         Imports
 # ========================
-from data import MQTT_TOPIC_WATHER,MQTT_TOPIC_WATHER_THRESHOLD , MQTT_TOPIC_WATHER_ALERTS, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs
-from PyQt5.QtCore import QTimer, QObject, pyqtSignal, pyqtSlot
-from datetime import datetime
+from data import MQTT_TOPIC_WATHER,MQTT_TOPIC_WATHER_THRESHOLD , MQTT_TOPIC_WATHER_ALERTS, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, BOARD_WEATHER, MQTT_STATUS_TOKENS
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 import json
+import logging
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_WEATHER
+from indicator_style import BOARD_STATUS, board_status_state
+from board_presence import presence_display
+from app_log import get_logger
+
+log = get_logger("weather")
 
 
 class Tem_hum_Sensor(QObject):
@@ -19,7 +26,6 @@ class Tem_hum_Sensor(QObject):
     log_action = pyqtSignal(str)
     log_alert = pyqtSignal(str)
     update_threshold_values = pyqtSignal(float, float)  # temp, hum
-    status_message = pyqtSignal(str)                   # Separate signal for status messages
 
     # ============================================================================
     # INITIALIZATION METHODS
@@ -28,13 +34,10 @@ class Tem_hum_Sensor(QObject):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
-        self.status_received = False
+        self._status_request = None  # Pending status_request reply (Future)
         
-        # Initialize all components
+        # One-time setup; subscriptions are made by activate()
         self._connect_signals()
-        self._setup_mqtt()
-        self._init_sensor_display()
-        self._init_status_display()
         self._init_thresholds()
         self._setup_ui_connections()
 
@@ -48,13 +51,13 @@ class Tem_hum_Sensor(QObject):
         self.log_action.connect(self._log_action)
         self.log_alert.connect(self._log_alert)
         self.update_threshold_values.connect(self._update_threshold_values)
-        self.status_message.connect(self._status_message)
 
     def _setup_mqtt(self):
         """Initialize MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_message2)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_WATHER, self.handle_weather_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_WATHER_ALERTS, self.handle_alert_message)
+        self._subscriptions = [
+            (MQTT_TOPIC_WATHER, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_WATHER, self.handle_weather_message, schema=SCHEMA_WEATHER)),
+            (MQTT_TOPIC_WATHER_ALERTS, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_WATHER_ALERTS, self.handle_alert_message)),
+        ]
 
     def _init_sensor_display(self):
         """Initialize sensor display with default values"""
@@ -110,20 +113,13 @@ class Tem_hum_Sensor(QObject):
     @pyqtSlot(str)
     def _log_action(self, message):
         """Thread-safe action logging"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.ui.action_log.append(f"[{timestamp}] {message}")
+        self.ui.action_log.append(message)
 
     @pyqtSlot(str)
     def _log_alert(self, message):
         """Thread-safe alert logging"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.ui.alert_log.append(f'<span style="color:white;">[{timestamp}] {message}</span>')
+        self.ui.alert_log.append(message, logging.WARNING)
     
-    @pyqtSlot(str)
-    def _status_message(self, message):
-        """Separate handler for status messages (not logged to action log)"""
-        print(message)
-
     @pyqtSlot(float, float)
     def _update_threshold_values(self, temp, hum):
         """Thread-safe threshold value update"""
@@ -135,102 +131,31 @@ class Tem_hum_Sensor(QObject):
     # ============================================================================
     def _apply_board_status_style(self, color):
         """Apply styling to board status display"""
-        style = ""
-        if color == "green":
-            style = """
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        elif color == "red":
-            style = """
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        self.ui.lab_board_status_SW.setStyleSheet(style)
+        BOARD_STATUS.set_state(self.ui.lab_board_status_SW, board_status_state(color))
 
     def _apply_led_style(self, color):
         """Apply styling to LED indicator"""
-        style = ""
-        if color == "green":
-            style = """
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """
-        elif color == "red":
-            style = """
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """
-        self.ui.led_boardST_2.setStyleSheet(style)
+        self.ui.led_boardST_2.set_color(board_status_state(color))
 
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_weather_message(self, topic, payload):
-        """Handle incoming weather sensor data"""
-        self.status_message.emit(f"[WEATHER] Received data - Topic: {topic}, Payload: {payload}")
+    def handle_weather_message(self, topic, reading):
+        """Handle incoming weather sensor readings"""
+        log.debug("Received data - Topic: %s, Reading: %s", topic, reading)
 
         if topic == MQTT_TOPIC_WATHER:
             try:
-                if "Temperature:" in payload and "Humidity:" in payload:
-                    # Extract Celsius temperature
-                    tempC_part = payload.split("Temperature: ")[1].split(",")[0]
-                    tempC = tempC_part.replace("°C", "").strip()
-                    self.update_tempC.emit(tempC)
-
-                    # Extract Fahrenheit temperature
-                    tempF_part = payload.split("Temperature: ")[2].split(",")[0]
-                    tempF = tempF_part.replace("°F", "").strip()
-                    self.update_tempF.emit(tempF)
-
-                    # Extract humidity
-                    hum_part = payload.split("Humidity: ")[1].replace("%", "").strip()
-                    self.update_hum.emit(hum_part)
+                if reading is not None:
+                    self.update_tempC.emit(f"{reading.temp_c:.1f}")
+                    self.update_tempF.emit(f"{reading.temp_f:.1f}")
+                    self.update_hum.emit(f"{reading.humidity:.1f}")
                 else:
-                    self.status_message.emit("[WEATHER] Invalid payload format - missing Temperature or Humidity")
+                    log.warning("Invalid payload format")
             except Exception as e:
-                self.status_message.emit(f"[WEATHER] Error processing message: {e}")
+                log.error("Error processing message: %s", e)
         else:
-            self.status_message.emit(f"[WEATHER] Unexpected topic: {topic} (expected: {MQTT_TOPIC_WATHER})")
-
-    def handle_status_message2(self, topic, payload):
-        """Process board status messages from response topic"""
-        try:
-            self.status_message.emit(f"[STATUS] Received message on {topic}: {payload}")
-            
-            if payload.strip() == "status_request":
-                self.status_message.emit("[STATUS] Ignoring our own status_request message")
-                return
-                
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip().lower()
-                
-                if status == "connected":
-                    self.update_board_status.emit(board_name, "Connected", "green")
-                    self.update_led_status.emit("green")
-                    self.status_received = True
-                else:
-                    self.update_board_status.emit(board_name, status.capitalize(), "red")
-                    self.update_led_status.emit("red")
-                    
-        except Exception as e:
-            self.status_message.emit(f"[STATUS] Error processing message: {e}")
+            log.warning("Unexpected topic: %s (expected: %s)", topic, MQTT_TOPIC_WATHER)
 
     def handle_alert_message(self, topic, payload):
         """Handle alert messages"""
@@ -240,19 +165,41 @@ class Tem_hum_Sensor(QObject):
     # BOARD STATUS MANAGEMENT
     # ============================================================================
     def request_board_status(self):
-        """Send status request to request topic with timeout fallback"""
-        self.status_received = False
-        self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-        self.status_message.emit(f"[STATUS] Sent status request to {MQTT_TOPIC_MQTT_Rq}")
-        
-        QTimer.singleShot(2000, self.check_status_response)
-
-    def check_status_response(self):
-        """Check if we received a valid response"""
-        if not self.status_received:
-            self.status_message.emit("[STATUS] No response received within timeout period")
+        """Send a status request; its reply or timeout updates the display"""
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self._status_request = self.mqtt_client.rpc.request(
+            MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=2.0, parse=parse_board_status,
+            correlate=MQTT_STATUS_TOKENS, board=BOARD_WEATHER)
+        self._status_request.add_done_callback(self.handle_status_reply)
+        log.debug("Sent status request to %s", MQTT_TOPIC_MQTT_Rq)
+
+    def handle_status_reply(self, request):
+        """Show the board status from the reply, or disconnected after a timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
+            log.warning("No response received within timeout period")
             self.update_board_status.emit("Unknown", "Disconnected", "red")
             self.update_led_status.emit("red")
+            return
+        status = request.result()
+        if status.connected:
+            self.update_board_status.emit(status.board, "Connected", "green")
+            self.update_led_status.emit("green")
+        else:
+            self.update_board_status.emit(status.board, status.status.capitalize(), "red")
+            self.update_led_status.emit("red")
+
+    def handle_presence(self, board, status):
+        """Show the board's presence as it changes, without a status request"""
+        if board != BOARD_WEATHER:
+            return
+        display = presence_display(status)
+        if display is not None:
+            board_name, text, color = display
+            self.update_board_status.emit(board_name, text, color)
+            self.update_led_status.emit(color)
 
     # ============================================================================
     # THRESHOLD MANAGEMENT
@@ -274,22 +221,29 @@ class Tem_hum_Sensor(QObject):
         self.mqtt_client.publish(MQTT_TOPIC_WATHER_THRESHOLD, payload)
     
     # ============================================================================
-    # CLEANUP
+    # LIFECYCLE
     # ============================================================================
-    def deactivate(self):
-        """Cleanly deactivate the sensor project and unsubscribe from MQTT topics."""
-        print("deactivate P2")
+    def activate(self):
+        """Subscribe and reset the page each time it is shown"""
+        log.info("activate P2")
+        self._setup_mqtt()
+        self._init_sensor_display()
+        self._init_status_display()
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_WEATHER, self.mqtt_client.presence.status(BOARD_WEATHER))
+
+    def suspend(self):
+        """Unsubscribe and reset the page when leaving it; the instance is reused."""
+        log.info("suspend P2")
         self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "TurnOFF")
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
         try:
             # Unsubscribe from all relevant MQTT topics
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_WATHER)
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_WATHER_ALERTS)
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
-
-            # Optional: disconnect UI button signals if needed
-            self.ui.refrech_btn_SW.clicked.disconnect()
-            self.ui.apply_btn.clicked.disconnect()
+            for topic, token in self._subscriptions:
+                self.mqtt_client.unsubscribe_from_topic(topic, token)
 
             # Clear logs
             self.ui.action_log.clear()
@@ -302,8 +256,8 @@ class Tem_hum_Sensor(QObject):
             self.update_board_status.emit("Unknown", "Disconnected", "red")
             self.update_led_status.emit("red")
 
-            print("[SENSOR] Project deactivated successfully.")
+            log.info("Project suspended.")
 
         except Exception as e:
-            print(f"[SENSOR] Error during deactivation: {e}")
+            log.error("Error during suspend: %s", e)
 
@@ -1,12 +1,21 @@
 # ========================
 #         Imports
 # ========================
-from datetime import datetime
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtWidgets import QComboBox, QDoubleSpinBox, QFrame, QHBoxLayout, QLabel
 import pyqtgraph as pg
-from collections import deque
 import time
-from data import MQTT_TOPIC_SENSOR, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, MQTT_TOPIC_CONTROL
+from ring_buffer import RingBuffer
+from timeseries_store import RecordedCurve
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_WATER_LEVEL
+from water_control import ControlEngine, BangBangLaw, CONTROL_LAWS, STATE_NAMES, IDLE
+from data import MQTT_TOPIC_SENSOR, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, MQTT_TOPIC_CONTROL, BOARD_WATER_LEVEL, PRESENCE_BOARD_NAME, MQTT_STATUS_TOKENS
+from indicator_style import BOARD_STATUS
+from board_presence import ONLINE, UNKNOWN
+from app_log import get_logger
+
+log = get_logger("water_level")
 
 
 class WaterLevelControllerWindow(QObject):
@@ -24,10 +33,12 @@ class WaterLevelControllerWindow(QObject):
     # ============================================================================
     # INITIALIZATION
     # ============================================================================
-    def __init__(self, mqtt_client, ui):
+    def __init__(self, mqtt_client, ui, render_scheduler, store=None):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
+        self.render_scheduler = render_scheduler
+        self.store = store
         
         # Control variables
         self._water_level = 0.0
@@ -36,22 +47,24 @@ class WaterLevelControllerWindow(QObject):
         self._draining = False
         self._auto_mode = True
         self._board_connected = False
-        self.status_received = False
         self.hysteresis = 2.0
+        # One instance per law, so tuned parameters survive switching back
+        self._laws = {name: law() for name, law in CONTROL_LAWS.items()}
+        self._laws[BangBangLaw.name] = BangBangLaw(self.hysteresis)
+        self.control = ControlEngine(self._laws[BangBangLaw.name], keepalive_interval=5.0)
         
-        # flag to control when status messages should be processed
-        self._waiting_for_status = False
+        # Pending status_request reply (Future); None when not waiting
+        self._status_request = None
 
         # History tracking
         self.max_history_points = 100
-        self.history_timestamps = deque(maxlen=self.max_history_points)
-        self.history_levels = deque(maxlen=self.max_history_points)
+        self.history = RingBuffer(self.max_history_points, channels=1)  # level
         self.start_time = time.time()
+        self._follow_latest = True               # Cleared while the user scrolls back
         
-        # Setup
+        # One-time setup; subscriptions and timers are started by activate()
         self.connect_signals()
         self.init_ui()
-        self.setup_mqtt()
         self.setup_timers()
         
     # ============================================================================
@@ -61,7 +74,7 @@ class WaterLevelControllerWindow(QObject):
         """Connect all signals to their slots"""
         self.water_level_changed.connect(self.update_water_level_ui)
         self.status_update.connect(self.update_status_ui)
-        self.update_plot_signal.connect(self.update_history_plot)
+        self.update_plot_signal.connect(self.schedule_plot_update)
         self.board_connected_signal.connect(self.update_connection_state)
         self.clear_history_signal.connect(self.clear_history_data)
         self.log_message_signal.connect(self.append_log_message)
@@ -103,6 +116,8 @@ class WaterLevelControllerWindow(QObject):
         self.ui.targetLevelSlider.setValue(int(self._target_level))
         self.ui.targetLevelDisplay.setText(f"{self._target_level:.1f}%")
         
+        self.setup_control_law_panel()
+
         # Status display
         self.ui.statusLabel.setText("Status: Automatic")
         self.ui.statusLabel.setStyleSheet("font-weight: bold; background-color:transparent; color: #2196F3;")
@@ -123,25 +138,74 @@ class WaterLevelControllerWindow(QObject):
             
             target_pen = pg.mkPen(color='#FF5722', width=2, style=pg.QtCore.Qt.DashLine)
             self.target_line = plot.plot(pen=target_pen, name='Target Level')
+
+            # Older samples are read back from the recorded history on demand
+            recorded_pen = pg.mkPen(color='#90A4AE', width=1)
+            self.recorded_curve = RecordedCurve(
+                plot, plot.plot(pen=recorded_pen, name='Recorded'), self.store, "water_level", "level")
+            plot.getViewBox().sigRangeChangedManually.connect(self.history_view_moved)
             
             plot.addLegend()
 
+    def setup_control_law_panel(self):
+        """Control law selector with one spin box per law parameter"""
+        if not hasattr(self.ui, 'gridLayout_21'):
+            return
+        panel = QFrame(self.ui.frame_27)
+        panel.setStyleSheet("background-color: transparent; color: white;")
+        layout = QHBoxLayout(panel)
+        layout.setContentsMargins(9, 0, 9, 0)
+        layout.setSpacing(6)
+
+        layout.addWidget(QLabel("Control law", panel))
+        self.law_combo = QComboBox(panel)
+        self.law_combo.addItems(list(self._laws))
+        self.law_combo.setCurrentText(self.control.law.name)
+        layout.addWidget(self.law_combo)
+        self.law_params_layout = QHBoxLayout()
+        layout.addLayout(self.law_params_layout)
+        layout.addStretch(1)
+        self.ui.gridLayout_21.addWidget(panel, 5, 0, 1, 2)
+
+        self.law_combo.currentTextChanged.connect(self.control_law_changed)
+        self.build_law_params()
+
+    def build_law_params(self):
+        """Rebuild the parameter spin boxes for the active law"""
+        while self.law_params_layout.count():
+            widget = self.law_params_layout.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+
+        law = self.control.law
+        for attribute, label, minimum, maximum, step in law.PARAMS:
+            self.law_params_layout.addWidget(QLabel(label))
+            spin_box = QDoubleSpinBox()
+            spin_box.setRange(minimum, maximum)
+            spin_box.setSingleStep(step)
+            spin_box.setDecimals(3 if step < 0.01 else 2)
+            spin_box.setValue(getattr(law, attribute))
+            spin_box.valueChanged.connect(lambda value, attribute=attribute: setattr(law, attribute, value))
+            self.law_params_layout.addWidget(spin_box)
+
+    def control_law_changed(self, name):
+        """Swap the control law at runtime"""
+        self.control.set_law(self._laws[name])
+        self.build_law_params()
+        self.log_message(f"Control law: {name}")
+        self.run_control()
+
     def setup_mqtt(self):
         """Setup MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_SENSOR, self.handle_sensor_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_message3)
+        self._subscriptions = [
+            (MQTT_TOPIC_SENSOR, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_SENSOR, self.handle_sensor_message, schema=SCHEMA_WATER_LEVEL)),
+        ]
 
     def setup_timers(self):
-        """Initialize control and plot timers"""
+        """Initialize the keep-alive timer (control runs on each sample, plots on the render scheduler)"""
         self.control_timer = QTimer(self)
-        self.control_timer.timeout.connect(self.update_control_simple)
-        
-        self.plot_timer = QTimer(self)
-        self.plot_timer.timeout.connect(lambda: self.update_plot_signal.emit())
-        
-        if self._auto_mode:
-            self.control_timer.start(500)
-        self.plot_timer.start(1000)
+        self.control_timer.setInterval(1000)
+        self.control_timer.timeout.connect(self.control_keepalive)
 
     # ============================================================================
     # UI UPDATE METHODS
@@ -159,26 +223,43 @@ class WaterLevelControllerWindow(QObject):
         """Update status label"""
         if hasattr(self.ui, 'statusLabel'):
             self.ui.statusLabel.setText(text)
-            self.ui.statusLabel.setStyleSheet(style)
+            if self.ui.statusLabel.styleSheet() != style:     # Restyling re-polishes the label
+                self.ui.statusLabel.setStyleSheet(style)
    
     @pyqtSlot()
+    def schedule_plot_update(self):
+        """Mark the history plot dirty for the next rendered frame"""
+        self.render_scheduler.mark_dirty(self.update_history_plot)
+
     def update_history_plot(self):
         """Update the history plot"""
         if not hasattr(self, 'history_curve'):
             return
             
-        if len(self.history_timestamps) > 0:
-            self.history_curve.setData(list(self.history_timestamps), list(self.history_levels))
+        if len(self.history) > 0:
+            timestamps = self.history.timestamps()
+            self.history_curve.setData(timestamps, self.history.channel(0))
             
-            if len(self.history_timestamps) >= 2:
+            if len(timestamps) >= 2:
+                # Timestamps are appended in order: first is oldest, last is latest
                 self.target_line.setData(
-                    [min(self.history_timestamps), max(self.history_timestamps)],
+                    [timestamps[0], timestamps[-1]],
                     [self._target_level, self._target_level]
                 )
-            
-            if len(self.history_timestamps) > 1:
-                latest = max(self.history_timestamps)
-                self.ui.Wate_Level_History_Plot.setXRange(max(0, latest - 60), latest + 5)
+                latest = timestamps[-1]
+                if self._follow_latest:
+                    self.ui.Wate_Level_History_Plot.setXRange(max(0, latest - 60), latest + 5)
+
+        # Anything left of the in-memory history comes from the recording
+        live_start = self.history.timestamps()[0] if len(self.history) else None
+        self.recorded_curve.refresh(self.start_time, live_start)
+
+    def history_view_moved(self, *args):
+        """Stop following the latest sample while the user pans or zooms back"""
+        latest = self.history.last()
+        x1 = self.ui.Wate_Level_History_Plot.getViewBox().viewRange()[0][1]
+        self._follow_latest = latest is None or x1 >= latest
+        self.schedule_plot_update()
     
     @pyqtSlot(bool)
     def update_connection_state(self, connected):
@@ -197,48 +278,23 @@ class WaterLevelControllerWindow(QObject):
         """Update UI for connected state"""
         if hasattr(self.ui, 'lab_board_status_SS'):
             self.ui.lab_board_status_SS.setText("Connected")
-            self.ui.lab_board_status_SS.setStyleSheet("""
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """)
+            BOARD_STATUS.set_state(self.ui.lab_board_status_SS, "green")
         if hasattr(self.ui, 'led_boardST_3'):
-            self.ui.led_boardST_3.setStyleSheet("""
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """)
+            self.ui.led_boardST_3.set_color("green")
                 
     def set_disconnected_ui(self):
         """Update UI for disconnected state"""
         if hasattr(self.ui, 'lab_board_status_SS'):
             self.ui.lab_board_status_SS.setText("Disconnected")
-            self.ui.lab_board_status_SS.setStyleSheet("""
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """)
+            BOARD_STATUS.set_state(self.ui.lab_board_status_SS, "red")
         if hasattr(self.ui, 'led_boardST_3'):
-            self.ui.led_boardST_3.setStyleSheet("""
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """)
+            self.ui.led_boardST_3.set_color("red")
        
     def enable_all_controls(self):
         """Enable all controls"""
         if self._auto_mode and not self.control_timer.isActive():
-            self.control_timer.start(500)
+            self.control.reset()
+            self.control_timer.start()
         self.ui.targetLevelSlider.setEnabled(True)
         self.ui.fillButton.setEnabled(not self._auto_mode)
         self.ui.drainButton.setEnabled(not self._auto_mode)
@@ -264,7 +320,8 @@ class WaterLevelControllerWindow(QObject):
         
         if self._auto_mode:
             if not self.control_timer.isActive():
-                self.control_timer.start(500)
+                self.control.reset()
+                self.control_timer.start()
             self.ui.fillButton.setEnabled(False)
             self.ui.drainButton.setEnabled(False)
             self.status_update.emit("Status: Automatic", "font-weight: bold; background-color:transparent; color: #2196F3;")
@@ -273,6 +330,7 @@ class WaterLevelControllerWindow(QObject):
             if self._filling or self._draining:
                 self.stop_fill()
                 self.stop_drain()
+            self.run_control()
         else:
             if self.control_timer.isActive():
                 self.control_timer.stop()
@@ -281,23 +339,31 @@ class WaterLevelControllerWindow(QObject):
             self.status_update.emit("Status: Manual", "font-weight: bold; background-color:transparent; color: #FFA000;")
             self.log_message("Switched to Manual mode")
 
-    def update_control_simple(self):
-        """Automatic control logic"""
+    def run_control(self):
+        """Automatic control, run on every sample and target change"""
         if not self._board_connected or not self._auto_mode:
             return
-            
+
         current = self._water_level
         target = self._target_level
+        previous = self.control.state
+        command = self.control.update(current, target)
+        if command is None:
+            return
 
-        if target > current:
-            self.log_message(f"Target {target:.1f}% > Level {current:.1f}% – FILLING")
-            self.mqtt_client.publish(MQTT_TOPIC_CONTROL, "FILL_ON DRAIN_OFF")
-        elif target < current:
-            self.log_message(f"Target {target:.1f}% < Level {current:.1f}% – DRAINING")
-            self.mqtt_client.publish(MQTT_TOPIC_CONTROL, "FILL_OFF DRAIN_ON")
-        else:
-            self.log_message(f"Target {target:.1f}% = Level {current:.1f}% – IDLE")
-            self.mqtt_client.publish(MQTT_TOPIC_CONTROL, "FILL_DRAIN_OFF")
+        # Only state transitions reach the log; keep-alive resends do not
+        if command != previous:
+            self.log_message(f"Target {target:.1f}% / Level {current:.1f}% – {STATE_NAMES[command]}")
+        self.mqtt_client.publish(MQTT_TOPIC_CONTROL, command)
+
+    def control_keepalive(self):
+        """Resend the current command when no sample triggered one for a while"""
+        if not self._board_connected or not self._auto_mode:
+            return
+        command = self.control.keepalive()
+        if command is not None:
+            log.debug("Keep-alive %s", command)
+            self.mqtt_client.publish(MQTT_TOPIC_CONTROL, command)
 
     # ============================================================================
     # MANUAL CONTROL
@@ -360,77 +426,77 @@ class WaterLevelControllerWindow(QObject):
         old_target = self._target_level
         self._target_level = new_target
         self.ui.targetLevelDisplay.setText(f"{new_target:.1f}%")
+        self.update_plot_signal.emit()
         self.log_message(f"Target level changed from {old_target:.1f}% to {new_target:.1f}%")
+        self.run_control()
 
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_sensor_message(self, topic, payload):
-        """Process water level messages"""
+    def handle_sensor_message(self, topic, reading):
+        """Process water level readings"""
         try:
-            if payload.startswith("Water Level:"):
-                level_str = payload.split(':')[1].strip().split('%')[0].strip()
-                new_level = float(level_str)
-                
+            if reading is not None:
+                new_level = float(reading.level)
                 self._water_level = new_level
                 self.add_to_history(new_level)
                 self.water_level_changed.emit(new_level)
+                self.update_plot_signal.emit()
+                self.run_control()
         except Exception as e:
-            print(f"Sensor message error: {e}")
-
-    def handle_status_message3(self, topic, payload):
-        """Process board status messages"""
-        if not self._waiting_for_status:
-            return
-        try:
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip().lower()
-                
-                self.status_received = True
-                if status == "connected":
-                    print("Connected to control board")
-                    self._board_connected = True
-                    self.board_connected_signal.emit(True)
-                    if hasattr(self.ui, 'lab_board_SS'):
-                        self.ui.lab_board_SS.setText(board_name)
-                else:
-                    if hasattr(self.ui, 'lab_board_SS'):
-                        self.ui.lab_board_SS.setText("Unknown")
-        except Exception as e:
-            print(f"Status message error: {e}")
+            log.error("Sensor message error: %s", e)
 
     # ============================================================================
     # BOARD STATUS MANAGEMENT
     # ============================================================================
     def request_board_status(self):
         """Request board status"""
-        self.status_received = False
-        self._waiting_for_status = True  # Set flag before requesting
-        self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-        QTimer.singleShot(5000, self.check_status_response)
-
-    def check_status_response(self):
-        """Check for status response"""
-        if not self.status_received and self._waiting_for_status:
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self._status_request = self.mqtt_client.rpc.request(
+            MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=5.0, parse=parse_board_status,
+            correlate=MQTT_STATUS_TOKENS, board=BOARD_WATER_LEVEL)
+        self._status_request.add_done_callback(self.handle_status_reply)
+
+    def handle_status_reply(self, request):
+        """Process the board status reply, or its timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
             self._board_connected = False
             self.board_connected_signal.emit(False)
-        # Always reset the flag after timeout
-        self._waiting_for_status = False
+            return
+        status = request.result()
+        if status.connected:
+            log.info("Connected to control board")
+            self._board_connected = True
+            self.board_connected_signal.emit(True)
+            if hasattr(self.ui, 'lab_board_SS'):
+                self.ui.lab_board_SS.setText(status.board)
+        else:
+            if hasattr(self.ui, 'lab_board_SS'):
+                self.ui.lab_board_SS.setText("Unknown")
+
+    def handle_presence(self, board, status):
+        """Follow the board's presence as it changes, without a status request"""
+        if board != BOARD_WATER_LEVEL or status == UNKNOWN:
+            return
+        self._board_connected = status == ONLINE
+        self.board_connected_signal.emit(self._board_connected)
+        if hasattr(self.ui, 'lab_board_SS'):
+            self.ui.lab_board_SS.setText(PRESENCE_BOARD_NAME if self._board_connected else "Unknown")
+
     # ============================================================================
     # HISTORY MANAGEMENT
     # ============================================================================
     def add_to_history(self, level):
         """Add level to history"""
         current_time = time.time() - self.start_time
-        self.history_timestamps.append(current_time)
-        self.history_levels.append(level)
+        self.history.append(current_time, level)
 
     def clear_history_data(self):
         """Clear history data"""
-        self.history_timestamps.clear()
-        self.history_levels.clear()
+        self.history.clear()
         self.start_time = time.time()
         
         if hasattr(self, 'history_curve'):
@@ -450,17 +516,27 @@ class WaterLevelControllerWindow(QObject):
     def append_log_message(self, message):
         """Append message to log"""
         if hasattr(self.ui, 'logText'):
-            ts = datetime.now().strftime("%H:%M:%S")
-            self.ui.logText.append(f"[{ts}] {message}")
-            sb = self.ui.logText.verticalScrollBar()
-            sb.setValue(sb.maximum())
+            self.ui.logText.append(message)
 
     # ============================================================================
-    # CLEANUP
+    # LIFECYCLE
     # ============================================================================
-    def deactivate(self):
-        print("deactivate P3")
-        """Prepare for shutdown"""
+    def activate(self):
+        """Subscribe and restart control each time the page is shown"""
+        log.info("activate P3")
+        self.setup_mqtt()
+        if hasattr(self, 'history_curve'):
+            self.render_scheduler.register(self.ui.screen_water, self.update_history_plot)
+            self.schedule_plot_update()
+        self.control.reset()
+        if self._auto_mode:
+            self.control_timer.start()
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_WATER_LEVEL, self.mqtt_client.presence.status(BOARD_WATER_LEVEL))
+
+    def suspend(self):
+        """Stop control and unsubscribe when leaving the page; the instance is reused."""
+        log.info("suspend P3")
         try:
             # Send shutdown-related MQTT commands
             self.mqtt_client.publish(MQTT_TOPIC_CONTROL, "FILL_DRAIN_OFF")
@@ -469,8 +545,8 @@ class WaterLevelControllerWindow(QObject):
             # Stop timers if they exist
             if hasattr(self, 'control_timer'):
                 self.control_timer.stop()
-            if hasattr(self, 'plot_timer'):
-                self.plot_timer.stop()
+            self.control.reset(IDLE)
+            self.render_scheduler.unregister(self.update_history_plot)
 
             # Update UI and internal status
             if hasattr(self, 'set_disconnected_ui'):
@@ -479,13 +555,15 @@ class WaterLevelControllerWindow(QObject):
             self._board_connected = False
             if hasattr(self, 'board_connected_signal'):
                 self.board_connected_signal.emit(False)
-            self._waiting_for_status = False
+            if self._status_request is not None:
+                self._status_request.cancel()
+            self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
             # Unsubscribe from MQTT topics
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_SENSOR)
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
+            for topic, token in self._subscriptions:
+                self.mqtt_client.unsubscribe_from_topic(topic, token)
 
-            print("[SENSOR] Project deactivated successfully.")
+            log.info("Project suspended.")
 
         except Exception as e:
-            print(f"[SENSOR] Error during deactivation: {e}")
+            log.error("Error during suspend: %s", e)
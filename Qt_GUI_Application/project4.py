@@ -2,13 +2,21 @@
 #         Imports
 # ========================
 from datetime import datetime, timedelta
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 import pyqtgraph as pg
-from collections import deque
 import time
-import re
 import csv
-from data import MQTT_TOPIC_LOADCELL, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs
+from ring_buffer import RingBuffer
+from decimation import MinMaxPyramid, DecimatedCurve
+from timeseries_store import RecordedCurve
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_LOAD
+from data import MQTT_TOPIC_LOADCELL, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, BOARD_LOAD_CELL, PRESENCE_BOARD_NAME, MQTT_STATUS_TOKENS
+from indicator_style import BOARD_STATUS
+from board_presence import ONLINE, UNKNOWN
+from app_log import get_logger
+
+log = get_logger("load_cell")
 
 
 class LOADCELL(QObject):
@@ -26,29 +34,29 @@ class LOADCELL(QObject):
     # ============================================================================
     # INITIALIZATION METHODS
     # ============================================================================
-    def __init__(self, mqtt_client, ui):
+    def __init__(self, mqtt_client, ui, render_scheduler, store=None):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
+        self.render_scheduler = render_scheduler
+        self.store = store
         
         # Initialize control variables
         self._current_weight = 0.0
         self._board_connected = False
-        self.status_received = False
+        self._status_request = None  # Pending status_request reply (Future)
         
-        # Initialize all components
+        # One-time setup; subscriptions are made by activate()
         self.init_history_tracking()
         self.init_statistics_tracking()
         self.connect_signals()
         self.init_ui()
-        self.setup_mqtt()
-        self.setup_timers()
 
     def init_history_tracking(self):
         """Initialize weight history tracking"""
         self.max_history_points = 100  # Keep last 100 readings
-        self.history_timestamps = deque(maxlen=self.max_history_points)
-        self.history_weights = deque(maxlen=self.max_history_points)
+        self.history = RingBuffer(self.max_history_points, channels=1)  # weight
+        self.long_history = MinMaxPyramid()      # Whole session, decimated for the plot
         self.start_time = time.time()
 
     def init_statistics_tracking(self):
@@ -62,7 +70,7 @@ class LOADCELL(QObject):
         """Connect internal signals to slots for thread-safe operations"""
         self.weight_changed.connect(self.update_weight_ui)
         self.status_update.connect(self.update_status_ui)
-        self.update_plot_signal.connect(self.update_history_plot)
+        self.update_plot_signal.connect(self.schedule_plot_update)
         self.board_connected_signal.connect(self.update_connection_state)
         self.clear_history_signal.connect(self.clear_history_data)
 
@@ -76,21 +84,9 @@ class LOADCELL(QObject):
 
     def setup_mqtt(self):
         """Initialize MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_LOADCELL, self.handle_loadcell_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_message4)
-
-    def setup_timers(self):
-        """Initialize system timers"""
-        # Plot update timer
-        self.plot_timer = QTimer(self)
-        self.plot_timer.timeout.connect(lambda: self.update_plot_signal.emit())
-        self.plot_timer.start(1000)  # Update plot every 1 second
-        
-        # Status check timer (optional periodic status check)
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self.periodic_status_check)
-        # Uncomment to enable periodic status checks
-        # self.status_timer.start(30000)  # Check every 30 seconds
+        self._subscriptions = [
+            (MQTT_TOPIC_LOADCELL, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_LOADCELL, self.handle_loadcell_message, schema=SCHEMA_LOAD)),
+        ]
 
     # ============================================================================
     # UI SETUP METHODS
@@ -115,14 +111,23 @@ class LOADCELL(QObject):
             # Create plot curves
             pen = pg.mkPen(color='#2196F3', width=2)  # Blue line
             self.weight_curve = plot_widget.plot(pen=pen, name='Weight')
+            self.weight_decimator = DecimatedCurve(
+                plot_widget, self.weight_curve, self.long_history,
+                on_view_changed=self.schedule_plot_update)
+
+            # Readings from before this session are read back from the recording
+            recorded_pen = pg.mkPen(color='#90A4AE', width=1)
+            self.recorded_curve = RecordedCurve(
+                plot_widget, plot_widget.plot(pen=recorded_pen, name='Recorded'),
+                self.store, "load_cell", "weight")
             
             # Enable auto-range and add legend
             plot_widget.enableAutoRange('xy', True)
             plot_widget.addLegend()
             
-            print("Weight history plot initialized")
+            log.debug("Weight history plot initialized")
         else:
-            print("Warning: Weight_History_Plot not found in UI")
+            log.warning("Weight_History_Plot not found in UI")
 
     def setup_status_display(self):
         """Setup status display components"""
@@ -146,93 +151,37 @@ class LOADCELL(QObject):
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_loadcell_message(self, topic, payload):
-        """Process incoming load cell data"""
+    def handle_loadcell_message(self, topic, reading):
+        """Process incoming load cell readings"""
         try:
             if topic != MQTT_TOPIC_LOADCELL:
                 return
                 
-            payload_str = str(payload).strip()            
-            
-            if ": " in payload_str:
-                # Extract value (format: "Load: 12.34 kg")
-                _, value_with_unit = payload_str.split(": ", 1)
-                
-                # Extract numeric weight for plotting
-                weight_value = self.extract_weight_value(value_with_unit)
-                
-                if weight_value is not None:
-                    self._current_weight = weight_value
-                    self.add_to_history(weight_value)
-                    self.weight_changed.emit(weight_value, value_with_unit)
-                else:
-                    self.weight_changed.emit(0.0, "ERR")
+            if reading is not None:
+                weight_value = reading.weight
+                self._current_weight = weight_value
+                self.add_to_history(weight_value)
+                self.weight_changed.emit(weight_value, f"{weight_value:.2f} {reading.unit}")
+                self.update_plot_signal.emit()
             else:
                 self.weight_changed.emit(0.0, "ERR")
                 
         except Exception as e:
-            print(f"Error processing load cell message: {e}")
+            log.error("Error processing load cell message: %s", e)
             self.weight_changed.emit(0.0, "ERR")
 
-    def handle_status_message4(self, topic, payload):
-        """Process board status messages"""
-        try:
-            # Skip our own status requests
-            if str(payload).strip() == "status_request":
-                return
-                
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip()
-                
-                # Update board name display
-                if hasattr(self.ui, 'lab_board_LC'):
-                    self.ui.lab_board_LC.setText(board_name)
-                
-                # Update connection state
-                self.status_received = True
-                connected = status.lower() == "connected"
-                self.board_connected_signal.emit(connected)
-                
-                if connected:
-                    print(f"Connected to board: {board_name}")
-                else:
-                    print(f"Board {board_name} status: {status}")
-                    
-        except Exception as e:
-            print(f"Error processing status message: {e}")
-
     # ============================================================================
     # DATA PROCESSING METHODS
     # ============================================================================
-    def extract_weight_value(self, payload_text):
-        """Extract numeric weight value from payload"""
-        try:
-            # Look for patterns like "12.34 kg", "12.34", etc.
-            weight_pattern = r'(\d+\.?\d*)\s*(?:kg|g|lbs?)?'
-            matches = re.findall(weight_pattern, payload_text.lower())
-            
-            if matches:
-                weight = float(matches[0])
-                return weight
-            else:
-                print(f"No numeric weight found in: {payload_text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error extracting weight: {e}")
-            return None
-
     def add_to_history(self, weight_value):
         """Add new weight reading to history"""
         try:
             current_time = time.time() - self.start_time
-            self.history_timestamps.append(current_time)
-            self.history_weights.append(weight_value)
+            self.history.append(current_time, weight_value)
+            self.long_history.append(current_time, weight_value)
             
         except Exception as e:
-            print(f"Error adding weight to history: {e}")
+            log.error("Error adding weight to history: %s", e)
 
     def update_session_statistics(self, weight_value):
         """Track and update session max, min, and average"""
@@ -284,32 +233,27 @@ class LOADCELL(QObject):
         """Update status label"""
         if hasattr(self.ui, 'status_label_LC'):
             self.ui.status_label_LC.setText(text)
-            self.ui.status_label_LC.setStyleSheet(style)
+            if self.ui.status_label_LC.styleSheet() != style:     # Restyling re-polishes the label
+                self.ui.status_label_LC.setStyleSheet(style)
 
     @pyqtSlot()
+    def schedule_plot_update(self):
+        """Mark the history plot dirty for the next rendered frame"""
+        self.render_scheduler.mark_dirty(self.update_history_plot)
+
     def update_history_plot(self):
         """Update the history plot with current data"""
         if not hasattr(self.ui, 'Weight_History_Plot') or not hasattr(self, 'weight_curve'):
             return
             
         try:
-            if len(self.history_timestamps) > 0:
-                # Update the main curve
-                self.weight_curve.setData(
-                    list(self.history_timestamps), 
-                    list(self.history_weights)
-                )
-                
-                # Auto-scale to show recent data
-                if len(self.history_timestamps) > 1:
-                    latest_time = max(self.history_timestamps)
-                    self.ui.Weight_History_Plot.setXRange(
-                        max(0, latest_time - 120),  # Show last 2 minutes
-                        latest_time + 10
-                    )
-                    
+            # Whole-session history, decimated to the plot's pixel width;
+            # auto-range keeps all of it in view until the user zooms in
+            self.weight_decimator.refresh()
+            # Only reached by panning left of the session start (x = 0)
+            self.recorded_curve.refresh(self.start_time, live_start=0.0)
         except Exception as e:
-            print(f"Error updating plot: {e}")
+            log.error("Error updating plot: %s", e)
 
     @pyqtSlot(bool)
     def update_connection_state(self, connected):
@@ -328,23 +272,10 @@ class LOADCELL(QObject):
         """Update UI for connected state"""
         if hasattr(self.ui, 'lab_board_status_LC'):
             self.ui.lab_board_status_LC.setText("Connected")
-            self.ui.lab_board_status_LC.setStyleSheet("""
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """)
+            BOARD_STATUS.set_state(self.ui.lab_board_status_LC, "green")
             
         if hasattr(self.ui, 'led_boardST_4'):
-            self.ui.led_boardST_4.setStyleSheet("""
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """)
+            self.ui.led_boardST_4.set_color("green")
             
         self.status_update.emit(
             "Status: Connected", 
@@ -355,23 +286,10 @@ class LOADCELL(QObject):
         """Update UI for disconnected state"""
         if hasattr(self.ui, 'lab_board_status_LC'):
             self.ui.lab_board_status_LC.setText("Disconnected")
-            self.ui.lab_board_status_LC.setStyleSheet("""
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """)
+            BOARD_STATUS.set_state(self.ui.lab_board_status_LC, "red")
             
         if hasattr(self.ui, 'led_boardST_4'):
-            self.ui.led_boardST_4.setStyleSheet("""
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """)
+            self.ui.led_boardST_4.set_color("red")
             
         self.status_update.emit(
             "Status: Disconnected", 
@@ -384,26 +302,46 @@ class LOADCELL(QObject):
     def request_board_status(self):
         """Request status from hardware"""
         try:
-            self.status_received = False
-            self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-            print("Status request sent")
-            
-            # Set timeout to check for response
-            QTimer.singleShot(5000, self.check_status_response)
+            if self._status_request is not None:
+                self._status_request.cancel()
+            self._status_request = self.mqtt_client.rpc.request(
+                MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=5.0, parse=parse_board_status,
+                correlate=MQTT_STATUS_TOKENS, board=BOARD_LOAD_CELL)
+            self._status_request.add_done_callback(self.handle_status_reply)
+            log.debug("Status request sent")
             
         except Exception as e:
-            print(f"Error requesting board status: {e}")
+            log.error("Error requesting board status: %s", e)
 
-    def check_status_response(self):
-        """Handle status response timeout"""
-        if not self.status_received:
-            print("No status response received - board may be disconnected")
+    def handle_status_reply(self, request):
+        """Process the board status reply, or its timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
+            log.warning("No status response received - board may be disconnected")
             self.board_connected_signal.emit(False)
+            return
+        status = request.result()
 
-    def periodic_status_check(self):
-        """Periodic status check (optional)"""
-        if not self._board_connected:
-            self.request_board_status()
+        # Update board name display
+        if hasattr(self.ui, 'lab_board_LC'):
+            self.ui.lab_board_LC.setText(status.board)
+
+        # Update connection state
+        self.board_connected_signal.emit(status.connected)
+
+        if status.connected:
+            log.info("Connected to board: %s", status.board)
+        else:
+            log.info("Board %s status: %s", status.board, status.status)
+
+    def handle_presence(self, board, status):
+        """Follow the board's presence as it changes, without a status request"""
+        if board != BOARD_LOAD_CELL or status == UNKNOWN:
+            return
+        if hasattr(self.ui, 'lab_board_LC'):
+            self.ui.lab_board_LC.setText(PRESENCE_BOARD_NAME)
+        self.board_connected_signal.emit(status == ONLINE)
 
     # ============================================================================
     # HISTORY MANAGEMENT METHODS
@@ -412,8 +350,8 @@ class LOADCELL(QObject):
     def clear_history_data(self):
         """Clear history data"""
         try:
-            self.history_timestamps.clear()
-            self.history_weights.clear()
+            self.history.clear()
+            self.long_history.clear()
             self.start_time = time.time()
             
             # Reset statistics
@@ -425,10 +363,10 @@ class LOADCELL(QObject):
             if hasattr(self, 'weight_curve'):
                 self.weight_curve.setData([], [])
             
-            print("Weight history cleared")
+            log.info("Weight history cleared")
             
         except Exception as e:
-            print(f"Error clearing history: {e}")
+            log.error("Error clearing history: %s", e)
 
     def clear_weight_history(self):
         """Public method to clear weight history"""
@@ -439,11 +377,10 @@ class LOADCELL(QObject):
         old_max = self.max_history_points
         self.max_history_points = max_points
         
-        # Recreate deques with new max length
-        self.history_timestamps = deque(list(self.history_timestamps), maxlen=max_points)
-        self.history_weights = deque(list(self.history_weights), maxlen=max_points)
+        # Resize the ring buffer, keeping the most recent readings
+        self.history.resize(max_points)
         
-        print(f"Plot range changed from {old_max} to {max_points} points")
+        log.info("Plot range changed from %s to %s points", old_max, max_points)
 
     # ============================================================================
     # DATA EXPORT METHODS
@@ -451,8 +388,8 @@ class LOADCELL(QObject):
     def export_weight_data(self, filename=None):
         """Export weight history to CSV file"""
         try:
-            if len(self.history_weights) == 0:
-                print("No data to export")
+            if len(self.history) == 0:
+                log.warning("No data to export")
                 return None
                 
             if not filename:
@@ -463,11 +400,10 @@ class LOADCELL(QObject):
                 writer = csv.writer(csvfile)
                 writer.writerow(['Timestamp', 'Elapsed Time (s)', 'Weight (kg)'])
                 
-                start_datetime = datetime.now() - timedelta(
-                    seconds=max(self.history_timestamps) if self.history_timestamps else 0
-                )
+                timestamps = self.history.timestamps()
+                start_datetime = datetime.now() - timedelta(seconds=float(timestamps[-1]))
                 
-                for elapsed_time, weight_val in zip(self.history_timestamps, self.history_weights):
+                for elapsed_time, weight_val in zip(timestamps.tolist(), self.history.channel(0).tolist()):
                     actual_time = start_datetime + timedelta(seconds=elapsed_time)
                     writer.writerow([
                         actual_time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -475,11 +411,11 @@ class LOADCELL(QObject):
                         f"{weight_val:.3f}"
                     ])
             
-            print(f"Weight data exported to {filename}")
+            log.info("Weight data exported to %s", filename)
             return filename
             
         except Exception as e:
-            print(f"Error exporting data: {e}")
+            log.error("Error exporting data: %s", e)
             return None
 
     # ============================================================================
@@ -491,15 +427,15 @@ class LOADCELL(QObject):
 
     def get_weight_statistics(self):
         """Get weight statistics"""
-        if len(self.history_weights) == 0:
+        if len(self.history) == 0:
             return None
             
-        weights = list(self.history_weights)
+        weights = self.history.channel(0)
         return {
             'current': self._current_weight,
-            'min': min(weights),
-            'max': max(weights),
-            'avg': sum(weights) / len(weights),
+            'min': float(weights.min()),
+            'max': float(weights.max()),
+            'avg': float(weights.mean()),
             'count': len(weights)
         }
 
@@ -508,37 +444,41 @@ class LOADCELL(QObject):
         return self._board_connected
 
     # ============================================================================
-    # CLEANUP METHODS
+    # LIFECYCLE METHODS
     # ============================================================================
-    def deactivate(self):
-        """Deactivate the load cell controller and clean up resources"""
-        print("deactivate P4")
+    def activate(self):
+        """Subscribe and reset the page each time it is shown"""
+        log.info("activate P4")
+        self._board_connected = False
+        self.setup_mqtt()
+        if hasattr(self, 'weight_curve'):
+            self.render_scheduler.register(self.ui.screen_load_cell, self.update_history_plot)
+            self.render_scheduler.mark_dirty(self.update_history_plot)   # Redraw the kept history
+        self.setup_weight_display()
+        self.setup_status_display()
+        self.set_disconnected_ui()
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_LOAD_CELL, self.mqtt_client.presence.status(BOARD_LOAD_CELL))
+
+    def suspend(self):
+        """Unsubscribe and stop repaints when leaving the page; the session history is kept."""
+        log.info("suspend P4")
 
         try:            
             # Send shutdown-related MQTT commands
             self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "TurnOFF")
 
-            # Stop timers
-            if hasattr(self, 'plot_timer') and self.plot_timer.isActive():
-                self.plot_timer.stop()
+            # Stop plot repaints
+            self.render_scheduler.unregister(self.update_history_plot)
 
-            if hasattr(self, 'status_timer') and self.status_timer.isActive():
-                self.status_timer.stop()
+            if self._status_request is not None:
+                self._status_request.cancel()
+            self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
             # Disconnect MQTT topics
             if self.mqtt_client:
-                self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_LOADCELL)
-                self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
-
-            # Disconnect UI buttons (if needed)
-            if hasattr(self.ui, 'refrech_btn_LC'):
-                self.ui.refrech_btn_LC.clicked.disconnect()
-
-            if hasattr(self.ui, 'clear_history_btn_LC'):
-                self.ui.clear_history_btn_LC.clicked.disconnect()
-
-            if hasattr(self.ui, 'export_data_btn_LC'):
-                self.ui.export_data_btn_LC.clicked.disconnect()
+                for topic, token in self._subscriptions:
+                    self.mqtt_client.unsubscribe_from_topic(topic, token)
 
             # Reset UI
             if hasattr(self.ui, 'loadCell_val_label'):
@@ -546,12 +486,9 @@ class LOADCELL(QObject):
             if hasattr(self.ui, 'lab_board_status_LC'):
                 self.ui.lab_board_status_LC.setText("Inactive")
             if hasattr(self.ui, 'led_boardST_4'):
-                self.ui.led_boardST_4.setStyleSheet("background-color: gray;")
-
-            # Clear history and statistics
-            self.clear_history_data()
+                self.ui.led_boardST_4.set_color("gray")
 
-            print("Load cell controller deactivated.")
+            log.info("Load cell controller suspended.")
 
         except Exception as e:
-            print(f"Error during deactivation: {e}")
\ No newline at end of file
+            log.error("Error during suspend: %s", e)
@@ -1,12 +1,19 @@
 # ========================
 #         Imports
 # ========================
-from data import MQTT_TOPIC_MPU6050, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs
-from PyQt5.QtCore import QTimer, QObject, pyqtSignal, pyqtSlot
+from data import MQTT_TOPIC_MPU6050, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, BOARD_ACCELEROMETER, MQTT_STATUS_TOKENS
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor
 from datetime import datetime
-import json
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_MPU6050
 import pyqtgraph as pg
+from ring_buffer import RingBuffer
+from indicator_style import BOARD_STATUS, board_status_state
+from board_presence import presence_display
+from app_log import get_logger
+
+log = get_logger("mpu6050")
 
 
 class AccelerometerGyroscopeController(QObject):
@@ -25,22 +32,21 @@ class AccelerometerGyroscopeController(QObject):
     # ============================================================================
     # INITIALIZATION
     # ============================================================================
-    def __init__(self, mqtt_client, ui):
+    def __init__(self, mqtt_client, ui, render_scheduler):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
-        self.status_received = False
+        self.render_scheduler = render_scheduler
+        self._status_request = None  # Pending status_request reply (Future)
         
-        # Data buffers for plotting
-        self.accel_data = {'x': [], 'y': [], 'z': []}
-        self.gyro_data = {'x': [], 'y': [], 'z': []}
-        self.time_data = []
+        # Data buffers for plotting: accelX, Y, Z, gyroX, Y, Z indexed by sample number
         self.max_data_points = 100
+        self.plot_data = RingBuffer(self.max_data_points, channels=6)
+        self.sample_index = 0
         
-        # Initialize all components
+        # One-time setup; subscriptions are made by activate()
         self.connect_signals()
-        self.setup_mqtt()
-        self.init_ui()
+        self.init_plots()
         self.setup_ui_connections()
     
     # ============================================================================
@@ -58,14 +64,16 @@ class AccelerometerGyroscopeController(QObject):
 
     def setup_mqtt(self):
         """Initialize MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MPU6050, self.handle_mpu6050_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_response_message)
+        self._subscriptions = [
+            # Displays only need the newest sample per frame, the plot history needs all of them
+            (MQTT_TOPIC_MPU6050, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MPU6050, self.handle_mpu6050_message, conflate=True, schema=SCHEMA_MPU6050)),
+            (MQTT_TOPIC_MPU6050, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MPU6050, self.handle_mpu6050_sample, schema=SCHEMA_MPU6050)),
+        ]
 
     def init_ui(self):
-        """Initialize all UI components"""
+        """Reset the sensor and status displays"""
         self.init_sensor_display()
         self.init_status_display()
-        self.init_plots()
 
     def init_sensor_display(self):
         """Initialize sensor display with default values"""
@@ -174,32 +182,25 @@ class AccelerometerGyroscopeController(QObject):
     @pyqtSlot(float, float, float, float, float, float)
     def update_plots_ui(self, accelX, accelY, accelZ, gyroX, gyroY, gyroZ):
         """Thread-safe plot update"""
-        # Append new data
-        self.accel_data['x'].append(accelX)
-        self.accel_data['y'].append(accelY)
-        self.accel_data['z'].append(accelZ)
-        self.gyro_data['x'].append(gyroX)
-        self.gyro_data['y'].append(gyroY)
-        self.gyro_data['z'].append(gyroZ)
-        self.time_data.append(len(self.time_data))
-
-        # Trim data buffers if needed
-        if len(self.time_data) > self.max_data_points:
-            for axis in ['x', 'y', 'z']:
-                self.accel_data[axis].pop(0)
-                self.gyro_data[axis].pop(0)
-            self.time_data.pop(0)
+        # Append new data; the ring buffer drops the oldest sample when full
+        self.plot_data.append(self.sample_index, accelX, accelY, accelZ, gyroX, gyroY, gyroZ)
+        self.sample_index += 1
+        self.render_scheduler.mark_dirty(self.render_plots)
+
+    def render_plots(self):
+        """Repaint the curves from the plot buffer (called by the render scheduler)"""
+        time_data = self.plot_data.timestamps()
 
         # Update plots if they exist
         if hasattr(self, 'accel_x_curve'):
-            self.accel_x_curve.setData(self.time_data, self.accel_data['x'])
-            self.accel_y_curve.setData(self.time_data, self.accel_data['y'])
-            self.accel_z_curve.setData(self.time_data, self.accel_data['z'])
+            self.accel_x_curve.setData(time_data, self.plot_data.channel(0))
+            self.accel_y_curve.setData(time_data, self.plot_data.channel(1))
+            self.accel_z_curve.setData(time_data, self.plot_data.channel(2))
         
         if hasattr(self, 'gyro_x_curve'):
-            self.gyro_x_curve.setData(self.time_data, self.gyro_data['x'])
-            self.gyro_y_curve.setData(self.time_data, self.gyro_data['y'])
-            self.gyro_z_curve.setData(self.time_data, self.gyro_data['z'])
+            self.gyro_x_curve.setData(time_data, self.plot_data.channel(3))
+            self.gyro_y_curve.setData(time_data, self.plot_data.channel(4))
+            self.gyro_z_curve.setData(time_data, self.plot_data.channel(5))
 
     @pyqtSlot()
     def show_error_state_ui(self):
@@ -225,179 +226,128 @@ class AccelerometerGyroscopeController(QObject):
     # ============================================================================
     def apply_board_status_style(self, color):
         """Apply styling to board status display"""
-        if not hasattr(self.ui, 'lab_board_status_MS'):
-            return
-            
-        style = ""
-        if color == "green":
-            style = """
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        elif color == "red":
-            style = """
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        self.ui.lab_board_status_MS.setStyleSheet(style)
+        if hasattr(self.ui, 'lab_board_status_MS'):
+            BOARD_STATUS.set_state(self.ui.lab_board_status_MS, board_status_state(color))
 
     def apply_led_style(self, color):
         """Apply styling to LED indicator"""
-        if not hasattr(self.ui, 'led_boardST_5'):
-            return
-            
-        style = ""
-        if color == "green":
-            style = """
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """
-        elif color == "red":
-            style = """
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """
-        self.ui.led_boardST_5.setStyleSheet(style)
+        if hasattr(self.ui, 'led_boardST_5'):
+            self.ui.led_boardST_5.set_color(board_status_state(color))
 
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_mpu6050_message(self, topic, payload):
-        """Handle incoming MPU6050 sensor data"""
-        print(f"[MPU6050] Received data - Topic: {topic}, Payload: {payload}")
+    def handle_mpu6050_message(self, topic, reading):
+        """Handle incoming MPU6050 sensor readings (JSON or binary frames)"""
+        log.debug("Received data - Topic: %s, Reading: %s", topic, reading)
         
         if topic == MQTT_TOPIC_MPU6050:
             try:
-                # Parse and validate JSON payload
-                sensor_data = json.loads(payload)
-                print(f"[MPU6050] Parsed data: {sensor_data}")
-                
-                # Extract data with fallback values
-                accelX = sensor_data.get("accelX", 0)
-                accelY = sensor_data.get("accelY", 0)
-                accelZ = sensor_data.get("accelZ", 0)
-                gyroX = sensor_data.get("gyroX", 0)
-                gyroY = sensor_data.get("gyroY", 0)
-                gyroZ = sensor_data.get("gyroZ", 0)
-                temp = sensor_data.get("temp", "--")
+                if reading is None:
+                    log.warning("Invalid payload")
+                    self.error_state_signal.emit()
+                    return
 
                 # Update UI through signals
-                self.accelerometer_data_changed.emit(accelX, accelY, accelZ)
-                self.gyroscope_data_changed.emit(gyroX, gyroY, gyroZ)
-                self.temperature_changed.emit(str(temp))
-                
-                # Update plots
-                self.plot_update_signal.emit(accelX, accelY, accelZ, gyroX, gyroY, gyroZ)
-
-            except json.JSONDecodeError as e:
-                print(f"[MPU6050] JSON decode error: {e}")
-                self.error_state_signal.emit()
+                self.accelerometer_data_changed.emit(reading.accelX, reading.accelY, reading.accelZ)
+                self.gyroscope_data_changed.emit(reading.gyroX, reading.gyroY, reading.gyroZ)
+                self.temperature_changed.emit(str(reading.temp))
+
             except Exception as e:
-                print(f"[MPU6050] Processing error: {e}")
+                log.error("Processing error: %s", e)
                 self.error_state_signal.emit()
         else:
-            print(f"[MPU6050] Unexpected topic: {topic}")
+            log.warning("Unexpected topic: %s", topic)
 
-    def handle_status_response_message(self, topic, payload):
-        """Process board status messages from response topic"""
-        try:
-            print(f"[STATUS] Received message on {topic}: {payload}")
-            
-            if payload.strip() == "status_request":
-                print("[STATUS] Ignoring our own status_request message")
-                return
-                
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip().lower()
-                
-                if status == "connected":
-                    self.board_status_changed.emit(board_name, "Connected", "green")
-                    self.led_status_changed.emit("green")
-                    self.status_received = True
-                else:
-                    self.board_status_changed.emit(board_name, status.capitalize(), "red")
-                    self.led_status_changed.emit("red")
-                    
-        except Exception as e:
-            print(f"[STATUS] Error processing message: {e}")
+    def handle_mpu6050_sample(self, topic, reading):
+        """Feed every MPU6050 sample into the plot history (lossless path)"""
+        if reading is None:
+            return  # Reported by the display path
+
+        self.plot_update_signal.emit(*reading[:6])
 
     # ============================================================================
     # BOARD STATUS MANAGEMENT
     # ============================================================================
     def request_board_status(self):
-        """Send status request to request topic with timeout fallback"""
-        self.status_received = False
-        self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-        print(f"[STATUS] Sent status request to {MQTT_TOPIC_MQTT_Rq}")
-        
-        QTimer.singleShot(3000, self.check_status_response)
-
-    def check_status_response(self):
-        """Check if we received a valid response"""
-        if not self.status_received:
-            print("[STATUS] No response received within timeout period")
+        """Send a status request; its reply or timeout updates the display"""
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self._status_request = self.mqtt_client.rpc.request(
+            MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=3.0, parse=parse_board_status,
+            correlate=MQTT_STATUS_TOKENS, board=BOARD_ACCELEROMETER)
+        self._status_request.add_done_callback(self.handle_status_reply)
+        log.debug("Sent status request to %s", MQTT_TOPIC_MQTT_Rq)
+
+    def handle_status_reply(self, request):
+        """Show the board status from the reply, or disconnected after a timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
+            log.warning("No response received within timeout period")
             self.board_status_changed.emit("Unknown", "Disconnected", "red")
             self.led_status_changed.emit("red")
+            return
+        status = request.result()
+        if status.connected:
+            self.board_status_changed.emit(status.board, "Connected", "green")
+            self.led_status_changed.emit("green")
+        else:
+            self.board_status_changed.emit(status.board, status.status.capitalize(), "red")
+            self.led_status_changed.emit("red")
+
+    def handle_presence(self, board, status):
+        """Show the board's presence as it changes, without a status request"""
+        if board != BOARD_ACCELEROMETER:
+            return
+        display = presence_display(status)
+        if display is not None:
+            board_name, text, color = display
+            self.board_status_changed.emit(board_name, text, color)
+            self.led_status_changed.emit(color)
 
     # ============================================================================
-    # CLEANUP
+    # LIFECYCLE
     # ============================================================================
-    def deactivate(self):
-        """Cleanly deactivate the project, including removing plot legends."""
-        print("deactivate P5")
+    def activate(self):
+        """Subscribe and reset the page each time it is shown"""
+        log.info("activate P5")
+        self.setup_mqtt()
+        self.init_ui()
+        self.render_scheduler.register(self.ui.screen_accelo, self.render_plots)
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_ACCELEROMETER, self.mqtt_client.presence.status(BOARD_ACCELEROMETER))
+
+    def suspend(self):
+        """Unsubscribe and clear the plots when leaving the page; the instance is reused."""
+        log.info("suspend P5")
 
         try:
             # Send shutdown command
             self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "TurnOFF")
+            if self._status_request is not None:
+                self._status_request.cancel()
+            self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
             # Unsubscribe from topics
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MPU6050)
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
+            for topic, token in self._subscriptions:
+                self.mqtt_client.unsubscribe_from_topic(topic, token)
 
             # Reset UI displays
             self.init_sensor_display()
             self.board_status_changed.emit("Unknown", "Disconnected", "red")
             self.led_status_changed.emit("red")
 
-            # Clear plot data buffers
-            self.accel_data = {'x': [], 'y': [], 'z': []}
-            self.gyro_data = {'x': [], 'y': [], 'z': []}
-            self.time_data = []
-
-            # Remove legends and curves without recreating them
-            if hasattr(self, 'accel_plot'):
-                self.accel_plot.clear()  # Removes all items (curves + legend)
-                self.accel_plot.setTitle("Accelerometer Data (g)", color='w', size='14pt', bold=True)
-                self.accel_plot.setLabel('left', 'Acceleration (g)')
-                self.accel_plot.setLabel('bottom', 'Time')
-                self.accel_plot.showGrid(x=True, y=True)
-                # Do NOT recreate curves or legend here
-
-            if hasattr(self, 'gyro_plot'):
-                self.gyro_plot.clear()  # Removes all items (curves + legend)
-                self.gyro_plot.setTitle("Gyroscope Data (°/sec)", color='w', size='14pt', bold=True)
-                self.gyro_plot.setLabel('left', 'Angular Velocity (°/sec)')
-                self.gyro_plot.setLabel('bottom', 'Time')
-                self.gyro_plot.showGrid(x=True, y=True)
-                # Do NOT recreate curves or legend here
-
-            print("[MPU6050] Project deactivated. Legends and curves removed.")
+            # Clear plot data; the curves and legends are kept for the next visit
+            self.render_scheduler.unregister(self.render_plots)
+            self.plot_data.clear()
+            self.sample_index = 0
+            for name in ('accel_x_curve', 'accel_y_curve', 'accel_z_curve',
+                         'gyro_x_curve', 'gyro_y_curve', 'gyro_z_curve'):
+                if hasattr(self, name):
+                    getattr(self, name).setData([], [])
+
+            log.info("Project suspended.")
 
         except Exception as e:
-            print(f"[MPU6050] Error during deactivation: {e}")
\ No newline at end of file
+            log.error("Error during suspend: %s", e)
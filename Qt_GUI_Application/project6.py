@@ -1,12 +1,34 @@
 # ========================
 #         Imports
 # ========================
-from data import MQTT_TOPIC_GAS, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs
-from PyQt5.QtCore import QTimer, QObject, pyqtSignal, pyqtSlot
+from data import MQTT_TOPIC_GAS, MQTT_TOPIC_MQTT_Rq, MQTT_TOPIC_MQTT_Rs, BOARD_GAS_SENSOR, MQTT_STATUS_TOKENS
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor
 from datetime import datetime
-import json
+from payload_parsers import parse_board_status
+from wire_format import SCHEMA_GAS
 import pyqtgraph as pg
+from ring_buffer import RingBuffer
+from decimation import MinMaxPyramid, DecimatedCurve
+from indicator_style import BOARD_STATUS, board_status_state
+from board_presence import presence_display
+from app_log import get_logger
+
+log = get_logger("gas")
+
+
+# ========================
+#       Gas Status
+# ========================
+GAS_STATUS_LEDS = {"danger": "red", "warning": "yellow", "safe": "green"}
+
+
+def gas_status(gas_ppm, danger_threshold, warning_threshold):
+    if gas_ppm > danger_threshold:
+        return "danger"
+    if gas_ppm > warning_threshold:
+        return "warning"
+    return "safe"
 
 
 class GasSensorController(QObject):
@@ -24,26 +46,26 @@ class GasSensorController(QObject):
     # ============================================================================
     # INITIALIZATION
     # ============================================================================
-    def __init__(self, mqtt_client, ui):
+    def __init__(self, mqtt_client, ui, render_scheduler):
         super().__init__()
         self.mqtt_client = mqtt_client
         self.ui = ui
-        self.status_received = False
+        self.render_scheduler = render_scheduler
+        self._status_request = None  # Pending status_request reply (Future)
         
-        # Data buffers for plotting
-        self.gas_data = []
-        self.voltage_data = []
-        self.time_data = []
+        # Data buffers for plotting: gas_ppm, voltage indexed by sample number
         self.max_data_points = 100
+        self.plot_data = RingBuffer(self.max_data_points, channels=2)
+        self.gas_history = MinMaxPyramid()       # Whole-session gas_ppm, decimated for the plot
+        self.sample_index = 0
         
         # Gas concentration thresholds
         self.danger_threshold = 900
         self.warning_threshold = 500
         
-        # Initialize all components
+        # One-time setup; subscriptions are made by activate()
         self.connect_signals()
-        self.setup_mqtt()
-        self.init_ui()
+        self.init_plots()
         self.setup_ui_connections()
     
     # ============================================================================
@@ -60,15 +82,18 @@ class GasSensorController(QObject):
 
     def setup_mqtt(self):
         """Initialize MQTT subscriptions"""
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_GAS, self.handle_gas_message)
-        self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_MQTT_Rs, self.handle_status_response_message)
+        self._subscriptions = [
+            # Displays only need the newest sample per frame, the plot history needs all of them
+            (MQTT_TOPIC_GAS, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_GAS, self.handle_gas_message, conflate=True, schema=SCHEMA_GAS)),
+            (MQTT_TOPIC_GAS, self.mqtt_client.subscribe_to_topic(MQTT_TOPIC_GAS, self.handle_gas_sample, schema=SCHEMA_GAS)),
+        ]
 
     def init_ui(self):
-        """Initialize all UI components"""
+        """Reset the sensor, status and LED displays"""
         self.init_sensor_display()
         self.init_status_display()
-        self.init_plots()
         self.init_led_indicators()
+
     def init_sensor_display(self):
         """Initialize sensor display with default values"""
         if hasattr(self.ui, 'lcdNumberGas'):
@@ -99,8 +124,11 @@ class GasSensorController(QObject):
             self.gas_plot.addLegend()
             self.gas_plot.showGrid(x=True, y=True)
 
-            # Create gas plot curve
+            # Create gas plot curve, fed from the decimated whole-session history
             self.gas_curve = self.gas_plot.plot(pen='r', name="Gas PPM")
+            self.gas_decimator = DecimatedCurve(
+                self.gas_plot, self.gas_curve, self.gas_history,
+                on_view_changed=lambda: self.render_scheduler.mark_dirty(self.render_plots))
 
         # Set up voltage plot
         if hasattr(self.ui, 'volt_plot_widget'):
@@ -134,12 +162,7 @@ class GasSensorController(QObject):
     @pyqtSlot(float)
     def update_gas_leds_ui(self, gas_ppm):
         """Thread-safe LED status update based on gas concentration"""
-        if gas_ppm > self.danger_threshold:
-            self.apply_gas_led_styles("danger")
-        elif gas_ppm > self.warning_threshold:
-            self.apply_gas_led_styles("warning")
-        else:
-            self.apply_gas_led_styles("safe")
+        self.apply_gas_led_styles(gas_status(gas_ppm, self.danger_threshold, self.warning_threshold))
 
     @pyqtSlot(str, str, str)
     def update_board_status_ui(self, board_name, status, color):
@@ -158,23 +181,22 @@ class GasSensorController(QObject):
     @pyqtSlot(float, float)
     def update_plots_ui(self, gas_ppm, voltage):
         """Thread-safe plot update"""
-        # Append new data
-        self.gas_data.append(gas_ppm)
-        self.voltage_data.append(voltage)
-        self.time_data.append(len(self.time_data))
+        # Append new data; the ring buffer drops the oldest sample when full
+        self.plot_data.append(self.sample_index, gas_ppm, voltage)
+        self.gas_history.append(self.sample_index, gas_ppm)
+        self.sample_index += 1
+        self.render_scheduler.mark_dirty(self.render_plots)
 
-        # Trim data buffers if needed
-        if len(self.time_data) > self.max_data_points:
-            self.gas_data.pop(0)
-            self.voltage_data.pop(0)
-            self.time_data.pop(0)
+    def render_plots(self):
+        """Repaint the curves from the plot buffer (called by the render scheduler)"""
+        time_data = self.plot_data.timestamps()
 
         # Update plots if they exist
         if hasattr(self, 'gas_curve'):
-            self.gas_curve.setData(self.time_data, self.gas_data)
+            self.gas_decimator.refresh()
         
         if hasattr(self, 'voltage_curve'):
-            self.voltage_curve.setData(self.time_data, self.voltage_data)
+            self.voltage_curve.setData(time_data, self.plot_data.channel(1))
 
     @pyqtSlot()
     def show_error_state_ui(self):
@@ -189,231 +211,120 @@ class GasSensorController(QObject):
     # STYLE MANAGEMENT
     # ============================================================================
     def apply_gas_led_styles(self, status):
-        """Apply styling to gas concentration LED indicators"""
-        # Define LED styles
-        led_styles = {
-            "active_red": """
-                QLabel {
-                    background-color: qradialgradient(cx:0.5, cy:0.5, radius: 0.6,
-                        fx:0.5, fy:0.5, stop:0 #FF0000, stop:1 #8B0000);
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """,
-            "active_yellow": """
-                QLabel {
-                    background-color: qradialgradient(cx:0.5, cy:0.5, radius: 0.6,
-                        fx:0.5, fy:0.5, stop:0 #FFFF00, stop:1 #CCCC00);
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """,
-            "active_green": """
-                QLabel {
-                    background-color: qradialgradient(cx:0.5, cy:0.5, radius: 0.6,
-                        fx:0.5, fy:0.5, stop:0 #00FF00, stop:1 #008800);
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """,
-            "inactive_red": """
-                QLabel {
-                    background-color: #330000;
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """,
-            "inactive_yellow": """
-                QLabel {
-                    background-color: #333300;
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """,
-            "inactive_green": """
-                QLabel {
-                    background-color: #003300;
-                    border: 2px solid gray;
-                    border-radius: 25px;
-                    min-width: 50px;
-                    min-height: 50px;
-                }
-            """
-        }
-
-        # Apply styles based on status
-        if status == "danger":
-            if hasattr(self.ui, 'led_red'):
-                self.ui.led_red.setStyleSheet(led_styles["active_red"])
-            if hasattr(self.ui, 'led_yellow'):
-                self.ui.led_yellow.setStyleSheet(led_styles["inactive_yellow"])
-            if hasattr(self.ui, 'led_green'):
-                self.ui.led_green.setStyleSheet(led_styles["inactive_green"])
-        elif status == "warning":
-            if hasattr(self.ui, 'led_red'):
-                self.ui.led_red.setStyleSheet(led_styles["inactive_red"])
-            if hasattr(self.ui, 'led_yellow'):
-                self.ui.led_yellow.setStyleSheet(led_styles["active_yellow"])
-            if hasattr(self.ui, 'led_green'):
-                self.ui.led_green.setStyleSheet(led_styles["inactive_green"])
-        else:  # safe
-            if hasattr(self.ui, 'led_red'):
-                self.ui.led_red.setStyleSheet(led_styles["inactive_red"])
-            if hasattr(self.ui, 'led_yellow'):
-                self.ui.led_yellow.setStyleSheet(led_styles["inactive_yellow"])
-            if hasattr(self.ui, 'led_green'):
-                self.ui.led_green.setStyleSheet(led_styles["active_green"])
+        """Light the LED of the gas status ("danger", "warning" or "safe")"""
+        lit = GAS_STATUS_LEDS.get(status, "green")
+        for color, led_name in (("red", "led_red"), ("yellow", "led_yellow"), ("green", "led_green")):
+            if hasattr(self.ui, led_name):
+                getattr(self.ui, led_name).set_color(color if color == lit else f"dark_{color}")
 
     def apply_board_status_style(self, color):
         """Apply styling to board status display"""
-        if not hasattr(self.ui, 'lab_board_status_GS'):
-            return
-            
-        style = ""
-        if color == "green":
-            style = """
-                color: rgb(0, 255, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        elif color == "red":
-            style = """
-                color: rgb(255, 0, 0);
-                font: bold 15px;
-                background-color: transparent;
-                border-radius: 10px;
-            """
-        self.ui.lab_board_status_GS.setStyleSheet(style)
+        if hasattr(self.ui, 'lab_board_status_GS'):
+            BOARD_STATUS.set_state(self.ui.lab_board_status_GS, board_status_state(color))
 
     def apply_board_led_style(self, color):
         """Apply styling to board status LED indicator"""
-        if not hasattr(self.ui, 'led_boardST_6'):
-            return
-            
-        style = ""
-        if color == "green":
-            style = """
-                background-color: rgb(0, 255, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(0, 102, 0);
-            """
-        elif color == "red":
-            style = """
-                background-color: rgb(255, 0, 0);
-                border-radius: 10px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 20px;
-                max-height: 20px;
-                border: 2px solid rgb(128, 0, 0);
-            """
-        self.ui.led_boardST_6.setStyleSheet(style)
+        if hasattr(self.ui, 'led_boardST_6'):
+            self.ui.led_boardST_6.set_color(board_status_state(color))
 
     # ============================================================================
     # MQTT MESSAGE HANDLING
     # ============================================================================
-    def handle_gas_message(self, topic, payload):
-        """Handle incoming gas sensor data"""
-        print(f"[GAS SENSOR] Received data - Topic: {topic}, Payload: {payload}")
+    def handle_gas_message(self, topic, reading):
+        """Handle incoming gas sensor readings (JSON or binary frames)"""
+        log.debug("Received data - Topic: %s, Reading: %s", topic, reading)
         
         if topic == MQTT_TOPIC_GAS:
             try:
-                # Parse and validate JSON payload
-                sensor_data = json.loads(payload)
-                print(f"[GAS SENSOR] Parsed data: {sensor_data}")
-                
-                # Extract data with fallback values
-                gas_ppm = sensor_data.get("gas_ppm", 0)
-                voltage = sensor_data.get("voltage", 0)
+                if reading is None:
+                    log.warning("Invalid payload")
+                    self.error_state_signal.emit()
+                    return
 
                 # Update UI through signals
-                self.gas_data_changed.emit(gas_ppm, voltage)
-                self.led_status_changed.emit(gas_ppm)
-                
-                # Update plots
-                self.plot_update_signal.emit(gas_ppm, voltage)
-
-            except json.JSONDecodeError as e:
-                print(f"[GAS SENSOR] JSON decode error: {e}")
-                self.error_state_signal.emit()
+                self.gas_data_changed.emit(reading.gas_ppm, reading.voltage)
+                self.led_status_changed.emit(reading.gas_ppm)
+
             except Exception as e:
-                print(f"[GAS SENSOR] Processing error: {e}")
+                log.error("Processing error: %s", e)
                 self.error_state_signal.emit()
         else:
-            print(f"[GAS SENSOR] Unexpected topic: {topic}")
+            log.warning("Unexpected topic: %s", topic)
 
-    def handle_status_response_message(self, topic, payload):
-        """Process board status messages from response topic"""
-        try:
-            print(f"[STATUS] Received message on {topic}: {payload}")
-            
-            if payload.strip() == "status_request":
-                print("[STATUS] Ignoring our own status_request message")
-                return
-                
-            if "Board :" in payload and "Status :" in payload:
-                board_part, status_part = payload.split("Status :")
-                board_name = board_part.replace("Board :", "").strip()
-                status = status_part.strip().lower()
-                
-                if status == "connected":
-                    self.board_status_changed.emit(board_name, "Connected", "green")
-                    self.board_led_status_changed.emit("green")
-                    self.status_received = True
-                else:
-                    self.board_status_changed.emit(board_name, status.capitalize(), "red")
-                    self.board_led_status_changed.emit("red")
-                    
-        except Exception as e:
-            print(f"[STATUS] Error processing message: {e}")
+    def handle_gas_sample(self, topic, reading):
+        """Feed every gas sample into the plot history (lossless path)"""
+        if reading is None:
+            return  # Reported by the display path
+
+        self.plot_update_signal.emit(reading.gas_ppm, reading.voltage)
 
     # ============================================================================
     # BOARD STATUS MANAGEMENT
     # ============================================================================
     def request_board_status(self):
-        """Send status request to request topic with timeout fallback"""
-        self.status_received = False
-        self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "status_request")
-        print(f"[STATUS] Sent status request to {MQTT_TOPIC_MQTT_Rq}")
-        
-        QTimer.singleShot(3000, self.check_status_response)
-
-    def check_status_response(self):
-        """Check if we received a valid response"""
-        if not self.status_received:
-            print("[STATUS] No response received within timeout period")
+        """Send a status request; its reply or timeout updates the display"""
+        if self._status_request is not None:
+            self._status_request.cancel()
+        self._status_request = self.mqtt_client.rpc.request(
+            MQTT_TOPIC_MQTT_Rq, "status_request", MQTT_TOPIC_MQTT_Rs, timeout=3.0, parse=parse_board_status,
+            correlate=MQTT_STATUS_TOKENS, board=BOARD_GAS_SENSOR)
+        self._status_request.add_done_callback(self.handle_status_reply)
+        log.debug("Sent status request to %s", MQTT_TOPIC_MQTT_Rq)
+
+    def handle_status_reply(self, request):
+        """Show the board status from the reply, or disconnected after a timeout"""
+        if request.cancelled():
+            return
+        if request.exception() is not None:
+            log.warning("No response received within timeout period")
             self.board_status_changed.emit("Unknown", "Disconnected", "red")
             self.board_led_status_changed.emit("red")
+            return
+        status = request.result()
+        if status.connected:
+            self.board_status_changed.emit(status.board, "Connected", "green")
+            self.board_led_status_changed.emit("green")
+        else:
+            self.board_status_changed.emit(status.board, status.status.capitalize(), "red")
+            self.board_led_status_changed.emit("red")
+
+    def handle_presence(self, board, status):
+        """Show the board's presence as it changes, without a status request"""
+        if board != BOARD_GAS_SENSOR:
+            return
+        display = presence_display(status)
+        if display is not None:
+            board_name, text, color = display
+            self.board_status_changed.emit(board_name, text, color)
+            self.board_led_status_changed.emit(color)
 
     # ============================================================================
-    # CLEANUP
+    # LIFECYCLE
     # ============================================================================
-    def deactivate(self):
-        """Cleanly deactivate the project and clear all curve data"""
-        print("deactivate Gas Sensor")
+    def activate(self):
+        """Subscribe and reset the page each time it is shown"""
+        log.info("activate Gas Sensor")
+        self.setup_mqtt()
+        self.init_ui()
+        self.render_scheduler.register(self.ui.screen_gas_sensor, self.render_plots)
+        self.render_scheduler.mark_dirty(self.render_plots)   # Redraw the kept history
+        self.mqtt_client.presence.board_changed.connect(self.handle_presence)
+        self.handle_presence(BOARD_GAS_SENSOR, self.mqtt_client.presence.status(BOARD_GAS_SENSOR))
+
+    def suspend(self):
+        """Unsubscribe and stop repaints when leaving the page; the plot history is kept."""
+        log.info("suspend Gas Sensor")
 
         try:
             # Send shutdown command
             self.mqtt_client.publish(MQTT_TOPIC_MQTT_Rq, "TurnOFF")
+            if self._status_request is not None:
+                self._status_request.cancel()
+            self.mqtt_client.presence.board_changed.disconnect(self.handle_presence)
 
             # Unsubscribe from topics
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_GAS)
-            self.mqtt_client.unsubscribe_from_topic(MQTT_TOPIC_MQTT_Rs)
+            for topic, token in self._subscriptions:
+                self.mqtt_client.unsubscribe_from_topic(topic, token)
 
             # Reset UI displays
             self.init_sensor_display()
@@ -421,59 +332,10 @@ class GasSensorController(QObject):
             self.board_status_changed.emit("Unknown", "Disconnected", "red")
             self.board_led_status_changed.emit("red")
 
-            # Clear ALL plot data buffers
-            self.gas_data.clear()
-            self.voltage_data.clear()
-            self.time_data.clear()
-
-            # Completely clear and reinitialize gas plot
-            if hasattr(self, 'gas_plot') and hasattr(self.ui, 'gas_plot_widget'):
-                # Clear all items from the plot
-                self.gas_plot.clear()
-                
-                # Remove existing curve reference
-                if hasattr(self, 'gas_curve'):
-                    delattr(self, 'gas_curve')
-                
-                # Reinitialize the gas plot completely
-                self.gas_plot.setBackground(QColor(0, 0, 0, 100))
-                self.gas_plot.setTitle("Gas Concentration (ppm)", color='w', size='14pt', bold=True)
-                self.gas_plot.setLabel('left', 'Concentration (ppm)')
-                self.gas_plot.setLabel('bottom', 'Time')
-                self.gas_plot.addLegend()
-                self.gas_plot.showGrid(x=True, y=True)
-                
-                # Create new empty curve
-                self.gas_curve = self.gas_plot.plot(pen='r', name="Gas PPM")
-                # Ensure curve is empty
-                self.gas_curve.setData([], [])
-
-            # Completely clear and reinitialize voltage plot
-            if hasattr(self, 'voltage_plot') and hasattr(self.ui, 'volt_plot_widget'):
-                # Clear all items from the plot
-                self.voltage_plot.clear()
-                
-                # Remove existing curve reference
-                if hasattr(self, 'voltage_curve'):
-                    delattr(self, 'voltage_curve')
-                
-                # Reinitialize the voltage plot completely
-                self.voltage_plot.setBackground(QColor(0, 0, 0, 100))
-                self.voltage_plot.setTitle("Sensor Voltage (V)", color='w', size='14pt', bold=True)
-                self.voltage_plot.setLabel('left', 'Voltage (V)')
-                self.voltage_plot.setLabel('bottom', 'Time')
-                self.voltage_plot.addLegend()
-                self.voltage_plot.showGrid(x=True, y=True)
-                
-                # Create new empty curve
-                self.voltage_curve = self.voltage_plot.plot(pen='b', name="Voltage")
-                # Ensure curve is empty
-                self.voltage_curve.setData([], [])
-
-            # Reset status flag
-            self.status_received = False
-
-            print("[GAS SENSOR] Project completely deactivated. All curve data cleared and plots reset.")
+            # Stop repaints; the plot data is kept and drawn again by activate()
+            self.render_scheduler.unregister(self.render_plots)
+
+            log.info("Project suspended. Plot history kept.")
 
         except Exception as e:
-            print(f"[GAS SENSOR] Error during deactivation: {e}")
+            log.error("Error during suspend: %s", e)
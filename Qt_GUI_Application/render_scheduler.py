@@ -0,0 +1,123 @@
+# ========================
+#         Imports
+# ========================
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+
+
+# ========================
+#  Render Scheduler Class
+# ========================
+class RenderScheduler(QObject):
+    """Repaints dirty plots at a bounded frame rate.
+
+    Controllers register a render callback together with the stackedWidget
+    page that shows it, and mark it dirty whenever new data arrives. On each
+    frame the scheduler calls the callbacks of dirty plots on the visible
+    page only; plots on hidden pages stay dirty until their page is shown.
+    """
+
+    def __init__(self, stacked_widget, max_fps=30):
+        super().__init__()
+        self._stacked_widget = stacked_widget
+        self._pages = {}                         # Render callback -> page widget
+        self._dirty = {}                         # Dirty render callbacks, in marking order
+
+        # --- Frame Statistics ---
+        self.frames_rendered = 0
+        self.dropped_frames = 0                  # Frames that missed their deadline
+        self.coalesced_updates = 0               # Updates merged into an already pending frame
+        self._frame_times = deque(maxlen=240)
+        self._last_frame = None
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._render_frame)
+        self.set_max_fps(max_fps)
+
+        stacked_widget.currentChanged.connect(self._on_page_changed)
+
+    # ========================
+    #      Configuration
+    # ========================
+    def set_max_fps(self, max_fps):
+        self._max_fps = max_fps
+        self._frame_interval = 1.0 / max_fps
+        self._timer.setInterval(max(1, int(1000 / max_fps)))
+
+    @property
+    def max_fps(self):
+        return self._max_fps
+
+    # ========================
+    #      Registration
+    # ========================
+    def register(self, page, render):
+        # --- Attach a render callback to the page that displays it ---
+        self._pages[render] = page
+
+    def unregister(self, render):
+        self._pages.pop(render, None)
+        self._dirty.pop(render, None)
+
+    def mark_dirty(self, render):
+        # --- Request a repaint at the next frame ---
+        if render in self._dirty:
+            self.coalesced_updates += 1
+            return
+        self._dirty[render] = None
+        if not self._timer.isActive() and self._is_visible(render):
+            self._timer.start()
+
+    # ========================
+    #       Frame Loop
+    # ========================
+    def _is_visible(self, render):
+        page = self._pages.get(render)
+        return page is not None and page is self._stacked_widget.currentWidget()
+
+    @pyqtSlot()
+    def _render_frame(self):
+        now = time.perf_counter()
+        visible = [render for render in self._dirty if self._is_visible(render)]
+        if not visible:
+            # Nothing on screen to repaint: sleep until the next mark or page change
+            self._timer.stop()
+            self._last_frame = None
+            return
+
+        if self._last_frame is not None:
+            late = now - self._last_frame - self._frame_interval
+            if late > self._frame_interval:
+                self.dropped_frames += int(late / self._frame_interval)
+        self._last_frame = now
+
+        for render in visible:
+            del self._dirty[render]
+            render()
+
+        self.frames_rendered += 1
+        self._frame_times.append(now)
+
+    @pyqtSlot(int)
+    def _on_page_changed(self, index):
+        # --- Catch up with updates that arrived while the page was hidden ---
+        if any(self._is_visible(render) for render in self._dirty):
+            self._timer.start()
+
+    # ========================
+    #       Statistics
+    # ========================
+    def fps(self):
+        # --- Frames rendered during the last second ---
+        cutoff = time.perf_counter() - 1.0
+        return sum(1 for t in self._frame_times if t >= cutoff)
+
+    def stats(self):
+        return {
+            "fps": self.fps(),
+            "max_fps": self._max_fps,
+            "frames_rendered": self.frames_rendered,
+            "dropped_frames": self.dropped_frames,
+            "coalesced_updates": self.coalesced_updates,
+        }
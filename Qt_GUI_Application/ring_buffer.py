@@ -0,0 +1,91 @@
+# ========================
+#         Imports
+# ========================
+import numpy as np
+
+
+# ========================
+#    Ring Buffer Class
+# ========================
+class RingBuffer:
+    """Preallocated multi-channel sample history with a timestamp column.
+
+    Every sample is written twice, at its slot and one capacity further, so
+    the most recent samples always form one contiguous slice of the backing
+    array. Appending is O(1) and the accessors return views that can be
+    passed straight to PlotDataItem.setData without copying.
+    """
+
+    def __init__(self, capacity, channels=1, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        self._capacity = capacity
+        self._channels = channels
+        # Row 0 holds the timestamps, rows 1..channels the sample values
+        self._data = np.zeros((channels + 1, 2 * capacity), dtype=dtype)
+        self._pos = 0                            # Next slot to write
+        self._count = 0                          # Number of valid samples
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def channels(self):
+        return self._channels
+
+    # ========================
+    #        Writing
+    # ========================
+    def append(self, timestamp, *values):
+        # --- Store one sample, overwriting the oldest when full ---
+        pos = self._pos
+        column = (timestamp, *values)
+        self._data[:, pos] = column
+        self._data[:, pos + self._capacity] = column
+
+        self._pos = pos + 1 if pos + 1 < self._capacity else 0
+        if self._count < self._capacity:
+            self._count += 1
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
+
+    def resize(self, capacity):
+        # --- Change the capacity, keeping the most recent samples ---
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        kept = self.view()[:, -capacity:].copy()
+        self._capacity = capacity
+        self._data = np.zeros((self._channels + 1, 2 * capacity), dtype=self._data.dtype)
+        self.clear()
+        for column in kept.T:
+            self.append(*column)
+
+    # ========================
+    #     Zero-copy Views
+    # ========================
+    def view(self):
+        # --- All rows (timestamps first) of the valid samples, oldest first ---
+        start = self._pos + self._capacity - self._count
+        return self._data[:, start:start + self._count]
+
+    def timestamps(self):
+        start = self._pos + self._capacity - self._count
+        return self._data[0, start:start + self._count]
+
+    def channel(self, index):
+        start = self._pos + self._capacity - self._count
+        return self._data[index + 1, start:start + self._count]
+
+    def last(self, index=None):
+        # --- Latest timestamp, or latest value of a channel ---
+        if not self._count:
+            return None
+        column = self._pos - 1 + self._capacity
+        row = 0 if index is None else index + 1
+        return self._data[row, column]
@@ -0,0 +1,58 @@
+# ========================
+#         Imports
+# ========================
+from data import *
+from wire_format import SCHEMA_WEATHER, SCHEMA_WATER_LEVEL, SCHEMA_LOAD, SCHEMA_MPU6050, SCHEMA_GAS
+
+
+# Topic -> (series, wire schema, columns). The columns are the leading
+# fields of the schema's reading.
+RECORDED_TOPICS = {
+    MQTT_TOPIC_WATHER:   ("weather", SCHEMA_WEATHER, ("temp_c", "temp_f", "humidity")),
+    MQTT_TOPIC_SENSOR:   ("water_level", SCHEMA_WATER_LEVEL, ("level",)),
+    MQTT_TOPIC_LOADCELL: ("load_cell", SCHEMA_LOAD, ("weight",)),
+    MQTT_TOPIC_MPU6050:  ("mpu6050", SCHEMA_MPU6050, SCHEMA_MPU6050.reading_type._fields),
+    MQTT_TOPIC_GAS:      ("gas", SCHEMA_GAS, SCHEMA_GAS.reading_type._fields),
+}
+
+
+# ========================
+#  Sensor Recorder Class
+# ========================
+class SensorRecorder:
+    """Records every parsed sensor sample into a TimeSeriesRecorder.
+
+    The handlers run on the MQTT network thread, so recording neither waits
+    for nor loads the GUI thread, and it keeps going whichever dashboard
+    page is open.
+    """
+
+    def __init__(self, mqtt_client, recorder):
+        self.mqtt_client = mqtt_client
+        self.recorder = recorder
+        self.parse_errors = 0
+        self._subscriptions = []
+
+        for topic, (series, schema, columns) in RECORDED_TOPICS.items():
+            recorder.add_series(series, columns)
+            handler = self._make_handler(series, len(columns))
+            token = mqtt_client.subscribe_to_topic(topic, handler, on_network_thread=True, schema=schema)
+            self._subscriptions.append((topic, token))
+
+    def _make_handler(self, series, width):
+        record = self.recorder.record
+
+        def handle(topic, reading):
+            if reading is None:
+                self.parse_errors += 1
+                return
+            record(series, reading[:width])
+
+        return handle
+
+    def close(self):
+        # --- Stop recording and flush the samples still queued ---
+        for topic, token in self._subscriptions:
+            self.mqtt_client.unsubscribe_from_topic(topic, token)
+        self._subscriptions = []
+        self.recorder.close()
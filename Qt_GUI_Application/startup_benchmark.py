@@ -0,0 +1,148 @@
+# ========================
+#         Imports
+# ========================
+import time
+
+START = time.perf_counter()                      # Before any Qt import
+
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Headless; children inherit it
+
+# Imported only once a screen needs them
+PROJECT_MODULES = ("project1", "project2", "project3", "project4", "project5", "project6")
+LAZY_MODULES = ("pyqtgraph",) + PROJECT_MODULES
+
+PHASES = ("imports", "setupUi", "first frame")
+
+# Start-up budget in milliseconds, checked by --check on the offscreen
+# platform. "imports" and "first frame" are counted from interpreter
+# start, "setupUi" is the window construction alone.
+BUDGET_MS = {"imports": 400, "setupUi": 100, "first frame": 600}
+
+
+# ========================
+#      Start-up Phases
+# ========================
+# Every run starts a fresh interpreter, so module imports and Qt start-up
+# are part of the measured time, as they are on the panel PCs.
+def startup(eager):
+    # --- Import the application, build its window and time each phase ---
+    import main                                  # Everything main.py imports at start-up
+    from PyQt5.QtCore import QEvent, QObject
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+
+    if eager:                                    # What main.py and setupUi used to do
+        for module in LAZY_MODULES:
+            importlib.import_module(module)
+    phases = {"imports": (time.perf_counter() - START) * 1000}
+
+    class PaintWatcher(QObject):
+        painted = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and self.painted is None:
+                self.painted = time.perf_counter()
+            return False
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    started = time.perf_counter()
+    window = QMainWindow()
+    ui = main.Ui_MainWindow()
+    ui.setupUi(window)
+    if eager:
+        ui.ensureAllPages()
+    phases["setupUi"] = (time.perf_counter() - started) * 1000
+
+    watcher = PaintWatcher()
+    ui.stackedWidget.currentWidget().installEventFilter(watcher)
+    window.show()
+    while watcher.painted is None:
+        app.processEvents()
+    phases["first frame"] = (watcher.painted - START) * 1000
+    return {"phases": phases, "loaded": [module for module in LAZY_MODULES if module in sys.modules]}
+
+
+def measure(eager, runs=5):
+    # --- Start-up results of fresh processes ---
+    results = []
+    for _ in range(runs):
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", "eager" if eager else "lazy"],
+                               capture_output=True, text=True, check=True, cwd=HERE)
+        results.append(json.loads(child.stdout.splitlines()[-1]))
+    return results
+
+
+def medians(results):
+    return {phase: statistics.median(result["phases"][phase] for result in results) for phase in PHASES}
+
+
+# ========================
+#     Import Breakdown
+# ========================
+def import_breakdown():
+    # --- Cumulative import time of each module main.py imports, in ms ---
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                           capture_output=True, text=True, check=True, cwd=HERE)
+    direct = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():     # Header line
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            direct.append((name.strip(), int(cumulative) / 1000))
+        elif depth == 0:
+            if name.strip() == "main":
+                return sorted(direct, key=lambda item: item[1], reverse=True)
+            direct = []
+    return []
+
+
+# ========================
+#       Budget Check
+# ========================
+def check(runs=5):
+    # --- Exit status 1 when the lazy start-up is over budget ---
+    results = measure(False, runs)
+    times = medians(results)
+    problems = [f"{phase} took {times[phase]:.0f} ms, budget {BUDGET_MS[phase]} ms"
+                for phase in PHASES if times[phase] > BUDGET_MS[phase]]
+    loaded = sorted({module for result in results for module in result["loaded"]})
+    if loaded:
+        problems.append(f"imported before a screen needed them: {', '.join(loaded)}")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("OK: " + ", ".join(f"{phase} {times[phase]:.0f}/{BUDGET_MS[phase]} ms" for phase in PHASES))
+    return 1 if problems else 0
+
+
+def main(runs=5):
+    print(f"Start-up, median of {runs} fresh processes, in ms")
+    print(f"  {'':<28} {'imports':>8} {'setupUi':>8} {'first frame':>12}")
+    for label, eager in (("eager (before)", True), ("lazy (after)", False)):
+        times = medians(measure(eager, runs))
+        print(f"  {label:<28} {times['imports']:8.0f} {times['setupUi']:8.0f} {times['first frame']:12.0f}")
+
+    print("\nImport time of main.py's imports, cumulative ms")
+    for name, cumulative in import_breakdown()[:12]:
+        print(f"  {name:<28} {cumulative:8.1f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        print(json.dumps(startup(sys.argv[2] == "eager")))
+    elif sys.argv[1:2] == ["--check"]:
+        sys.exit(check())
+    else:
+        main()
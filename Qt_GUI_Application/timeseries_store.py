@@ -0,0 +1,392 @@
+# ========================
+#         Imports
+# ========================
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from app_log import get_logger
+
+log = get_logger("recorder")
+
+
+# ========================
+#      Store Layout
+# ========================
+# <root>/<series>/meta.json      {"version": 1, "dtype": "<f8", "columns": [...]}
+# <root>/<series>/time.f8        Timestamps (seconds since the epoch), increasing
+# <root>/<series>/time.idx       Sparse index: first timestamp of every BLOCK_SIZE samples
+# <root>/<series>/<column>.f8    One file per value column
+#
+# Every file is a headerless array of little-endian float64, so each one can
+# be opened with np.memmap and read without parsing.
+FORMAT_VERSION = 1
+DTYPE = np.dtype("<f8")
+BLOCK_SIZE = 1024
+TIME_FILE = "time.f8"
+INDEX_FILE = "time.idx"
+META_FILE = "meta.json"
+
+
+# ========================
+#   Monotonic Timestamps
+# ========================
+class MonotonicClock:
+    """Wall-clock timestamps that never go backwards.
+
+    The wall clock is read once; later timestamps add the elapsed
+    time.monotonic() to it, so NTP steps or DST changes cannot reorder
+    samples. Timestamps are strictly increasing across threads.
+    """
+
+    def __init__(self):
+        self._wall_anchor = time.time()
+        self._mono_anchor = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def now(self):
+        t = self._wall_anchor + (time.monotonic() - self._mono_anchor)
+        with self._lock:
+            if t <= self._last:
+                t = np.nextafter(self._last, np.inf)
+            self._last = t
+        return float(t)
+
+    def not_before(self, t):
+        # --- Later timestamps come after t, e.g. the end of an earlier recording ---
+        with self._lock:
+            self._last = max(self._last, t)
+
+
+# ========================
+#   Time-series Store Class
+# ========================
+class TimeSeriesStore:
+    """Append-only columnar store of float64 sensor series on disk."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._columns = {}                       # Series -> column names
+        self._tails = {}                         # Series -> (committed samples, last timestamp)
+
+    def series(self):
+        # --- Names of every series recorded under the root ---
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, META_FILE))
+        )
+
+    def __contains__(self, series):
+        return os.path.isfile(os.path.join(self.root, series, META_FILE))
+
+    def columns(self, series):
+        if series not in self._columns:
+            with open(os.path.join(self.root, series, META_FILE)) as f:
+                meta = json.load(f)
+            if meta.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported store version for series '{series}'")
+            self._columns[series] = tuple(meta["columns"])
+        return self._columns[series]
+
+    def create_series(self, series, columns):
+        # --- Create the series, or check an existing one has the same columns ---
+        path = os.path.join(self.root, series)
+        if os.path.isfile(os.path.join(path, META_FILE)):
+            if self.columns(series) != tuple(columns):
+                raise ValueError(f"Series '{series}' already exists with other columns")
+            return
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump({"version": FORMAT_VERSION, "dtype": DTYPE.str, "columns": list(columns)}, f)
+        self._columns[series] = tuple(columns)
+
+    def append_batch(self, series, timestamps, values):
+        # --- Append N samples: timestamps (N,), values (N, columns) ---
+        columns = self.columns(series)
+        timestamps = np.ascontiguousarray(timestamps, dtype=DTYPE)
+        values = np.asarray(values, dtype=DTYPE).reshape(len(timestamps), len(columns))
+        if not len(timestamps):
+            return
+        first, last = self._tail(series)
+
+        # range() and the sparse index rely on sorted timestamps, also
+        # across sessions
+        if timestamps[0] < last or np.any(np.diff(timestamps) < 0):
+            raise ValueError(f"Timestamps of series '{series}' go backwards")
+
+        # Value columns are written before the timestamps, and the timestamps
+        # before the index, so a reader never sees a timestamp whose values
+        # are not on disk yet.
+        path = os.path.join(self.root, series)
+        try:
+            for index, column in enumerate(columns):
+                with open(os.path.join(path, column + ".f8"), "ab") as f:
+                    f.write(np.ascontiguousarray(values[:, index]).tobytes())
+            with open(os.path.join(path, TIME_FILE), "ab") as f:
+                f.write(timestamps.tobytes())
+
+            # --- Index the samples that open a new block ---
+            block_starts = timestamps[(-first) % BLOCK_SIZE::BLOCK_SIZE]
+            if len(block_starts):
+                with open(os.path.join(path, INDEX_FILE), "ab") as f:
+                    f.write(block_starts.tobytes())
+        except BaseException:
+            self._tails.pop(series, None)        # Repaired by the next append
+            raise
+        self._tails[series] = (first + len(timestamps), float(timestamps[-1]))
+
+    def last_timestamp(self, series):
+        # --- Newest committed timestamp, -inf for an empty series ---
+        return self._tail(series)[1]
+
+    def _tail(self, series):
+        # --- Committed sample count and last timestamp, repairing the files once ---
+        tail = self._tails.get(series)
+        if tail is None:
+            tail = self._tails[series] = self._repair(series)
+        return tail
+
+    def _repair(self, series):
+        # --- Cut the files back to the samples complete in every column ---
+        # A crash between the column writes of append_batch leaves some
+        # files longer than others; appending after them would shift every
+        # later value against its timestamp.
+        path = os.path.join(self.root, series)
+        files = [os.path.join(path, column + ".f8") for column in self.columns(series)]
+        files.append(os.path.join(path, TIME_FILE))
+        count = min(os.path.getsize(name) if os.path.exists(name) else 0 for name in files) // DTYPE.itemsize
+        for name in files:
+            with open(name, "ab") as f:
+                if f.tell() != count * DTYPE.itemsize:
+                    log.warning("Truncating %s to %d samples", name, count)
+                    f.truncate(count * DTYPE.itemsize)
+
+        # --- The index must hold exactly one entry per block of time.f8 ---
+        timestamps = np.memmap(files[-1], dtype=DTYPE, mode="r", shape=(count,)) if count else np.empty(0, DTYPE)
+        index_path = os.path.join(path, INDEX_FILE)
+        block_starts = timestamps[::BLOCK_SIZE]
+        indexed = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        if indexed != block_starts.nbytes:
+            log.warning("Rebuilding the block index of series '%s'", series)
+            with open(index_path, "wb") as f:
+                f.write(block_starts.tobytes())
+        return count, float(timestamps[-1]) if count else -np.inf
+
+    def count(self, series):
+        # --- Number of complete samples in a series ---
+        path = os.path.join(self.root, series)
+        sizes = [os.path.getsize(os.path.join(path, TIME_FILE))]
+        sizes += [os.path.getsize(os.path.join(path, column + ".f8")) for column in self.columns(series)]
+        return min(sizes) // DTYPE.itemsize
+
+    def load(self, series):
+        # --- Memory-map a whole series: (timestamps, {column: values}) ---
+        count = self.count(series)
+        path = os.path.join(self.root, series)
+        if not count:
+            empty = np.empty(0, dtype=DTYPE)
+            return empty, {column: empty for column in self.columns(series)}
+
+        def mapped(name):
+            return np.memmap(os.path.join(path, name), dtype=DTYPE, mode="r", shape=(count,))
+
+        return mapped(TIME_FILE), {column: mapped(column + ".f8") for column in self.columns(series)}
+
+    # ========================
+    #     Range Queries
+    # ========================
+    def block_index(self, series, timestamps=None):
+        # --- First timestamp of every block, rebuilt if the index file lags ---
+        count = self.count(series) if timestamps is None else len(timestamps)
+        blocks = -(-count // BLOCK_SIZE)
+        index_path = os.path.join(self.root, series, INDEX_FILE)
+        indexed = os.path.getsize(index_path) // DTYPE.itemsize if os.path.exists(index_path) else 0
+        if indexed >= blocks:
+            return np.fromfile(index_path, dtype=DTYPE, count=blocks)
+        if timestamps is None:
+            timestamps = self.load(series)[0]
+        return np.array(timestamps[::BLOCK_SIZE])
+
+    def range(self, series, t0=None, t1=None, max_points=None):
+        """Samples with t0 <= t <= t1 as (timestamps, {column: values}).
+
+        Only the index and the blocks at both ends are searched; the result
+        is a memory-mapped view of the files. With max_points, longer ranges
+        are reduced to per-bucket min/max pairs instead.
+        """
+        timestamps, values = self.load(series)
+        if not len(timestamps):
+            return timestamps, values
+
+        index = self.block_index(series, timestamps)
+        start = 0 if t0 is None else self._search(timestamps, index, t0, "left")
+        stop = len(timestamps) if t1 is None else self._search(timestamps, index, t1, "right")
+        timestamps = timestamps[start:stop]
+        values = {column: data[start:stop] for column, data in values.items()}
+
+        if max_points is not None and len(timestamps) > max_points:
+            return _decimate(timestamps, values, max_points)
+        return timestamps, values
+
+    @staticmethod
+    def _search(timestamps, index, t, side):
+        # --- Binary search the sparse index, then inside one block ---
+        block = max(int(np.searchsorted(index, t, side="right")) - 1, 0)
+        lo = block * BLOCK_SIZE
+        hi = min(lo + BLOCK_SIZE, len(timestamps))
+        return lo + int(np.searchsorted(timestamps[lo:hi], t, side=side))
+
+
+def _decimate(timestamps, values, max_points):
+    # --- Per-bucket (min, max) pairs, drawn as vertical strokes ---
+    buckets = max(max_points // 2, 1)
+    size = -(-len(timestamps) // buckets)
+    starts = np.arange(0, len(timestamps), size)
+    x = np.repeat(timestamps[starts], 2)
+    decimated = {}
+    for column, data in values.items():
+        y = np.empty(len(x))
+        y[0::2] = np.minimum.reduceat(data, starts)
+        y[1::2] = np.maximum.reduceat(data, starts)
+        decimated[column] = y
+    return x, decimated
+
+
+# ========================
+#   Background Recorder
+# ========================
+class TimeSeriesRecorder:
+    """Batches samples on a writer thread and appends them to a store.
+
+    record() only timestamps the sample and puts it on a queue, so it can be
+    called from the MQTT network thread at kHz rates. The writer thread
+    flushes once batch_size samples of a series are pending or every
+    flush_interval seconds, whichever comes first.
+    """
+
+    _STOP = object()
+
+    def __init__(self, store, flush_interval=1.0, batch_size=1024):
+        self.store = store
+        self.clock = MonotonicClock()
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.recorded_samples = 0
+        self.write_errors = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="TimeSeriesRecorder", daemon=True)
+        self._thread.start()
+
+    def add_series(self, series, columns):
+        self.store.create_series(series, columns)
+        # A wall clock set back since the last session must not produce
+        # timestamps the store rejects
+        self.clock.not_before(self.store.last_timestamp(series))
+
+    def record(self, series, values, timestamp=None):
+        # --- Queue one sample; safe to call from any thread ---
+        if timestamp is None:
+            timestamp = self.clock.now()
+        self._queue.put((series, timestamp, values))
+
+    def close(self):
+        # --- Flush everything still queued and stop the writer thread ---
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    # ========================
+    #      Writer Thread
+    # ========================
+    def _run(self):
+        pending = {}                             # Series -> ([timestamps], [values])
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(pending)
+                return
+
+            if item is not None:
+                series, timestamp, values = item
+                batch = pending.setdefault(series, ([], []))
+                batch[0].append(timestamp)
+                batch[1].append(values)
+                if len(batch[0]) >= self.batch_size:
+                    self._flush({series: pending.pop(series)})
+
+            if time.monotonic() >= deadline:
+                self._flush(pending)
+                pending = {}
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, pending):
+        for series, (timestamps, values) in pending.items():
+            if not timestamps:
+                continue
+            try:
+                self.store.append_batch(series, timestamps, values)
+                self.recorded_samples += len(timestamps)
+            except (OSError, ValueError) as e:
+                self.write_errors += 1
+                log.error("Error recording series '%s': %s", series, e)
+
+
+# ========================
+#   Recorded Curve Class
+# ========================
+class RecordedCurve:
+    """Feeds a PlotDataItem with recorded samples for the visible x range.
+
+    Plots keep only recent samples in memory; this fills the part of the
+    view that lies before live_start from the store, so the user can pan
+    back through everything that was recorded. It stays empty while x
+    auto-range is on. Plot x values are seconds relative to time_origin
+    (an epoch timestamp).
+    """
+
+    def __init__(self, plot_widget, curve, store, series, column):
+        self._view_box = plot_widget.getViewBox()
+        self.curve = curve
+        self.store = store
+        self.series = series
+        self.column = column
+        self._last_query = None
+
+    def refresh(self, time_origin, live_start=None):
+        if self._view_box.autoRangeEnabled()[0]:
+            # Auto-range frames the live data; recorded samples would widen it
+            self.clear()
+            return
+
+        x0, x1 = self._view_box.viewRange()[0]
+        if live_start is not None:
+            x1 = min(x1, live_start)
+        if self.store is None or x1 <= x0 or self.series not in self.store:
+            self.clear()
+            return
+
+        # --- Skip the query when neither the view nor the recording changed ---
+        max_points = max(int(self._view_box.width()), 100)
+        query = (time_origin, x0, x1, max_points, self.store.count(self.series))
+        if query == self._last_query:
+            return
+        self._last_query = query
+
+        timestamps, values = self.store.range(self.series, time_origin + x0, time_origin + x1, max_points)
+        self.curve.setData(timestamps - time_origin, values[self.column])
+
+    def clear(self):
+        if self._last_query is not None:
+            self._last_query = None
+            self.curve.setData([], [])
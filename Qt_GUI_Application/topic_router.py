@@ -0,0 +1,208 @@
+# ========================
+#         Imports
+# ========================
+import itertools
+import sys
+import time
+
+
+# ========================
+#      Trie Node
+# ========================
+class _TopicNode:
+    __slots__ = ("children", "subscribers", "handlers")
+
+    def __init__(self):
+        self.children = {}                       # Topic level -> child node
+        self.subscribers = {}                    # Token -> handler, in subscription order
+        self.handlers = ()                       # Precomputed fan-out tuple of subscribers
+
+    def rebuild(self):
+        # O(subscribers of this filter); see the TopicRouter docstring
+        self.handlers = tuple(self.subscribers.values())
+
+
+# ========================
+#     Topic Router Class
+# ========================
+class TopicRouter:
+    """Topic-filter trie resolving MQTT topics to handlers.
+
+    Filters may use the MQTT '+' (single level) and '#' (multi level)
+    wildcards. Resolving a topic walks one trie path per matching wildcard
+    branch, so the cost depends on the topic depth, not on the number of
+    registered filters. Each filter holds an ordered list of subscribers
+    that is added to and removed from by token.
+
+    Adding or removing a subscriber is not constant time: it rebuilds the
+    filter's fan-out tuple, O(subscribers on that filter), so that match()
+    hands out a ready tuple without copying per message. Subscriptions
+    change on page switches while messages arrive at kHz rates, and a
+    filter has a handful of subscribers, so the copy is the cheaper side.
+    """
+
+    def __init__(self, token_counter=None):
+        self._root = _TopicNode()
+        self._tokens = {}                        # Token -> (filter, node)
+        # Routers sharing a counter hand out tokens that never collide
+        self._next_token = token_counter or itertools.count(1)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __contains__(self, topic_filter):
+        node = self._find(topic_filter)
+        return node is not None and bool(node.subscribers)
+
+    # ========================
+    #    Filter Management
+    # ========================
+    def add(self, topic_filter, handler):
+        # --- Append handler to the filter's subscribers, return its token ---
+        self._validate(topic_filter)
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+
+        token = next(self._next_token)
+        node.subscribers[token] = handler
+        node.rebuild()
+        self._tokens[token] = (topic_filter, node)
+        return token
+
+    def filter_of(self, token):
+        # --- Filter the token was registered on, None if unknown ---
+        entry = self._tokens.get(token)
+        return None if entry is None else entry[0]
+
+    def remove(self, token):
+        # --- Remove a single subscription, leaving other subscribers in place ---
+        entry = self._tokens.pop(token, None)
+        if entry is None:
+            return False
+        topic_filter, node = entry
+        del node.subscribers[token]
+        node.rebuild()
+        if not node.subscribers:
+            self._prune(topic_filter)
+        return True
+
+    def remove_filter(self, topic_filter):
+        # --- Remove every subscription registered on the filter ---
+        node = self._find(topic_filter)
+        if node is None or not node.subscribers:
+            return False
+        for token in node.subscribers:
+            del self._tokens[token]
+        node.subscribers.clear()
+        node.rebuild()
+        self._prune(topic_filter)
+        return True
+
+    def _prune(self, topic_filter):
+        # --- Drop nodes left without subscribers or children ---
+        path = [self._root]
+        levels = topic_filter.split("/")
+        for level in levels:
+            path.append(path[-1].children[level])
+
+        for i in range(len(levels), 0, -1):
+            node = path[i]
+            if node.subscribers or node.children:
+                break
+            del path[i - 1].children[levels[i - 1]]
+
+    def _find(self, topic_filter):
+        node = self._root
+        for level in topic_filter.split("/"):
+            node = node.children.get(level)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _validate(topic_filter):
+        if not topic_filter:
+            raise ValueError("Topic filter must not be empty")
+        levels = topic_filter.split("/")
+        for i, level in enumerate(levels):
+            if level == "#" and i != len(levels) - 1:
+                raise ValueError(f"'#' must be the last level of filter '{topic_filter}'")
+            if level not in ("+", "#") and ("+" in level or "#" in level):
+                raise ValueError(f"Wildcards must occupy a whole level in filter '{topic_filter}'")
+
+    # ========================
+    #      Topic Matching
+    # ========================
+    def match(self, topic):
+        # --- Return the handlers of all filters matching the topic ---
+        levels = topic.split("/")
+        depth = len(levels)
+        # Topics starting with '$' are never matched by leading wildcards
+        wildcards = not topic.startswith("$")
+        matched = []
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, i = stack.pop()
+            children = node.children
+
+            if wildcards or i > 0:
+                multi = children.get("#")
+                if multi is not None and multi.handlers:
+                    matched.append(multi.handlers)
+
+            if i == depth:
+                if node.handlers:
+                    matched.append(node.handlers)
+                continue
+
+            child = children.get(levels[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            if wildcards or i > 0:
+                single = children.get("+")
+                if single is not None:
+                    stack.append((single, i + 1))
+
+        # A single matching filter hands out its precomputed tuple as-is
+        if len(matched) == 1:
+            return matched[0]
+        return tuple(itertools.chain.from_iterable(matched))
+
+
+# ========================
+#     Micro-benchmark
+# ========================
+def _benchmark(messages=1_000_000, filters=10_000):
+    router = TopicRouter()
+    received = [0]
+
+    def handler(topic, payload):
+        received[0] += 1
+
+    # --- Fleet-style filters: one exact topic per board plus a few wildcards ---
+    for n in range(filters - 3):
+        router.add(f"site/{n % 100}/board{n}/sensor", handler)
+    router.add("site/+/+/sensor", handler)
+    router.add("site/#", handler)
+    router.add("arduino/#", handler)
+
+    topics = [f"site/{n % 100}/board{n}/sensor" for n in range(0, filters - 3, 7)]
+    start = time.perf_counter()
+    for i in range(messages):
+        topic = topics[i % len(topics)]
+        for h in router.match(topic):
+            h(topic, "")
+    elapsed = time.perf_counter() - start
+
+    print(f"{messages} messages against {len(router)} filters: "
+          f"{elapsed:.2f} s ({elapsed / messages * 1e9:.0f} ns/message, "
+          f"{received[0]} handler calls)")
+
+
+if __name__ == "__main__":
+    _benchmark(*(int(arg) for arg in sys.argv[1:3]))
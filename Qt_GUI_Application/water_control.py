@@ -0,0 +1,341 @@
+# ========================
+#         Imports
+# ========================
+import random
+import time
+from typing import NamedTuple
+
+
+# ========================
+#     Valve Commands
+# ========================
+# Messages understood by the water level board on MQTT_TOPIC_CONTROL
+IDLE = "FILL_DRAIN_OFF"
+FILL = "FILL_ON DRAIN_OFF"
+DRAIN = "FILL_OFF DRAIN_ON"
+
+STATE_NAMES = {IDLE: "IDLE", FILL: "FILLING", DRAIN: "DRAINING"}
+
+
+# ========================
+#      Control Laws
+# ========================
+# A control law maps the level, the target and the current valve state to
+# the next valve state. PARAMS lists the tunable attributes of each law as
+# (attribute, label, minimum, maximum, step) for the settings UI.
+class BangBangLaw:
+    """On/off control with a deadband around the target.
+
+    Valves start once the level leaves target +/- deadband and stop as
+    soon as it reaches the target, so sensor noise around the target does
+    not toggle them.
+    """
+
+    name = "Bang-bang"
+    PARAMS = (("deadband", "Deadband %", 0.0, 20.0, 0.5),)
+
+    def __init__(self, deadband=2.0):
+        self.deadband = deadband
+
+    def reset(self):
+        pass
+
+    def decide(self, level, target, state, dt):
+        band = self.deadband
+        if state == FILL:
+            return IDLE if level >= target else FILL
+        if state == DRAIN:
+            return IDLE if level <= target else DRAIN
+        if level < target - band:
+            return FILL
+        if level > target + band:
+            return DRAIN
+        return IDLE
+
+
+class PIDLaw:
+    """PID on the level error, driving the on/off valves by time proportioning.
+
+    The output u is clamped to [-1, 1] and sets the share of each `cycle`
+    seconds a valve stays open: u = 0.25 fills for the first quarter of the
+    cycle, u <= -1 drains all the time. Far from the target the output
+    saturates and the valve stays open like with bang-bang; within 1 / kp
+    percent of it the flow tapers off, and the integral settles on the duty
+    that balances a steady outflow. The derivative acts on the low-pass
+    filtered level, not on the error, so target steps do not kick it.
+    Anti-windup: the integral is frozen while the output is saturated in the
+    direction of the error, and clamped to +/- 1 / ki.
+    """
+
+    name = "PID"
+    PARAMS = (
+        ("kp", "Kp", 0.0, 10.0, 0.05),
+        ("ki", "Ki", 0.0, 2.0, 0.005),
+        ("kd", "Kd", 0.0, 10.0, 0.05),
+        ("cycle", "Cycle s", 1.0, 60.0, 0.5),
+    )
+
+    def __init__(self, kp=0.2, ki=0.002, kd=0.1, cycle=6.0, smoothing=0.5):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.cycle = cycle
+        self.smoothing = smoothing               # Weight of the newest level in the filter
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self._filtered = None
+        self._phase = 0.0                        # Seconds into the current cycle
+        self.output = 0.0
+
+    def decide(self, level, target, state, dt):
+        error = target - level
+        previous = self._filtered
+        self._filtered = level if previous is None else previous + self.smoothing * (level - previous)
+        rate = 0.0 if previous is None or dt <= 0 else (self._filtered - previous) / dt
+
+        unclamped = self.kp * error + self.ki * self.integral - self.kd * rate
+        u = max(-1.0, min(1.0, unclamped))
+        # Integrate unless that would push a saturated output further
+        if self.ki > 0 and (u == unclamped or (u > 0) != (error > 0)):
+            limit = 1.0 / self.ki
+            self.integral = max(-limit, min(limit, self.integral + error * dt))
+        self.output = u
+
+        # --- Open the valve for the first |u| of each cycle ---
+        self._phase = (self._phase + dt) % self.cycle
+        if self._phase >= abs(u) * self.cycle:
+            return IDLE
+        return FILL if u > 0 else DRAIN
+
+
+class PILaw(PIDLaw):
+    """PID law without the derivative term."""
+
+    name = "PI"
+    PARAMS = tuple(param for param in PIDLaw.PARAMS if param[0] != "kd")
+
+    def __init__(self, kp=0.2, ki=0.002, cycle=6.0):
+        super().__init__(kp, ki, 0.0, cycle)
+
+
+CONTROL_LAWS = {law.name: law for law in (BangBangLaw, PILaw, PIDLaw)}
+
+
+# ========================
+#     Control Engine
+# ========================
+class ControlEngine:
+    """Runs a control law and decides what to publish.
+
+    update() is meant to run on every sample and returns the command to
+    publish, or None: only a change of valve state is published, plus a
+    keep-alive resend of the current command once nothing has been sent
+    for keepalive_interval seconds. The law can be swapped at any time.
+    """
+
+    def __init__(self, law=None, keepalive_interval=5.0, clock=time.monotonic):
+        self.law = law or BangBangLaw()
+        self.keepalive_interval = keepalive_interval
+        self._clock = clock
+        self.state = IDLE
+        self.commands_sent = 0
+        self._last_sent = None                   # Clock time of the last command, None forces a send
+        self._last_update = None
+
+    def set_law(self, law):
+        # --- Switch laws; the new one starts from a clean state ---
+        law.reset()
+        self.law = law
+        self._last_update = None
+
+    def update(self, level, target, now=None):
+        now = self._clock() if now is None else now
+        dt = 0.0 if self._last_update is None else now - self._last_update
+        self._last_update = now
+        state = self.law.decide(level, target, self.state, dt)
+        if state != self.state or self._last_sent is None:
+            self.state = state
+            return self._send(now)
+        return self.keepalive(now)
+
+    def keepalive(self, now=None):
+        # --- Resend the current command if nothing went out for a while ---
+        now = self._clock() if now is None else now
+        if self._last_sent is not None and now - self._last_sent >= self.keepalive_interval:
+            return self._send(now)
+        return None
+
+    def reset(self, state=IDLE):
+        # --- Forget what was sent: the next update publishes again ---
+        self.state = state
+        self._last_sent = None
+        self._last_update = None
+        self.law.reset()
+
+    def _send(self, now):
+        self._last_sent = now
+        self.commands_sent += 1
+        return self.state
+
+
+# ========================
+#     Tank Simulator
+# ========================
+class TankSimulator:
+    """Tank with on/off fill and drain valves and a noisy level sensor.
+
+    Commands take effect after `latency` seconds, like an MQTT round trip,
+    and samples are integer percentages like the board's "Water Level: %d".
+    `leak` is a steady outflow, like water drawn from the tank.
+    """
+
+    def __init__(self, level=20.0, fill_rate=2.0, drain_rate=2.5, latency=0.3,
+                 noise=0.6, leak=0.0, seed=0):
+        self.level = level
+        self.fill_rate = fill_rate               # Percent per second
+        self.drain_rate = drain_rate
+        self.leak = leak                         # Steady outflow, percent per second
+        self.latency = latency
+        self.noise = noise
+        self.valves = IDLE
+        self.valve_switches = 0
+        self._pending = []                       # (apply time, command)
+        self._rng = random.Random(seed)
+
+    def command(self, now, command):
+        self._pending.append((now + self.latency, command))
+
+    def step(self, now, dt):
+        while self._pending and self._pending[0][0] <= now:
+            command = self._pending.pop(0)[1]
+            if command != self.valves:
+                self.valve_switches += 1
+                self.valves = command
+        if self.valves == FILL:
+            self.level = min(100.0, self.level + self.fill_rate * dt)
+        elif self.valves == DRAIN:
+            self.level -= self.drain_rate * dt
+        self.level = max(0.0, self.level - self.leak * dt)
+
+    def sample(self):
+        noisy = self.level + self._rng.uniform(-self.noise, self.noise)
+        return float(min(100, max(0, round(noisy))))
+
+
+class SimulationResult(NamedTuple):
+    commands: int                                # Published commands
+    valve_switches: int                          # Valve changes at the board
+    switches_per_minute: float
+    overshoot: float                             # Worst overshoot past a target, percent
+    settling_time: float                         # Worst time to stay within settle_band, seconds (inf if never)
+    tracking_error: float                        # Mean |level - target| once within settle_band, percent
+
+
+def simulate(policy, setpoints, duration, sample_period=0.5, dt=0.01, settle_band=2.0, **tank_options):
+    """Run a control policy against a TankSimulator.
+
+    policy(now, level, target) is called for every sample and returns the
+    command to publish or None. setpoints(now) gives the target. The run is
+    deterministic for given tank options.
+    """
+    tank = TankSimulator(**tank_options)
+    commands = 0
+    overshoot = 0.0
+    next_sample = 0.0
+    target, direction = None, 0
+    step_time = last_outside = 0.0
+    settling = []
+    settled = False
+    error_sum = error_count = 0
+    steps = int(round(duration / dt))
+    for i in range(steps):
+        now = i * dt
+        new_target = setpoints(now)
+        if new_target != target:
+            if target is not None:
+                settling.append(last_outside - step_time if last_outside < now - dt else float("inf"))
+            target = new_target
+            direction = 1 if target > tank.level else -1
+            step_time = last_outside = now
+            settled = False
+        tank.step(now, dt)
+        # Overshoot: how far the true level ends up past the target it moved towards
+        overshoot = max(overshoot, direction * (tank.level - target))
+        error = abs(tank.level - target)
+        if error > settle_band:
+            last_outside = now
+        else:
+            settled = True
+        if settled:
+            error_sum += error
+            error_count += 1
+        if now >= next_sample - 1e-9:
+            next_sample += sample_period
+            command = policy(now, tank.sample(), target)
+            if command is not None:
+                commands += 1
+                tank.command(now, command)
+    settling.append(last_outside - step_time if last_outside < now else float("inf"))
+    return SimulationResult(commands, tank.valve_switches, tank.valve_switches / (duration / 60),
+                            overshoot, max(settling), error_sum / error_count if error_count else float("inf"))
+
+
+# ========================
+#        Benchmark
+# ========================
+def _legacy_policy():
+    # --- The old 500 ms timer: publish every tick, compare without hysteresis ---
+    state = {"next_tick": 0.0}
+
+    def policy(now, level, target):
+        if now < state["next_tick"] - 1e-9:
+            return None
+        state["next_tick"] += 0.5
+        if level > target:
+            return DRAIN
+        if level < target:
+            return FILL
+        return IDLE
+    return policy
+
+
+def _engine_policy(law):
+    engine = ControlEngine(law)
+    return lambda now, level, target: engine.update(level, target, now)
+
+
+def _benchmark(duration=600.0):
+    # --- Step the target between 30% and 70% every two minutes ---
+    def setpoints(now):
+        return 70.0 if int(now // 120) % 2 == 0 else 30.0
+
+    # With on/off valves, PI and PID trade valve switches for less overshoot
+    # and a smaller error once settled; against a steady outflow bang-bang
+    # keeps sawing below the target while the integral holds it. The
+    # derivative does not pay off on the noisy 1% level sensor.
+    tanks = {
+        "fast tank, 0.3 s latency": dict(fill_rate=2.0, drain_rate=2.5, latency=0.3),
+        "slow tank, 1.5 s latency": dict(fill_rate=0.8, drain_rate=1.0, latency=1.5),
+        "slow tank, 0.2 %/s outflow": dict(fill_rate=0.8, drain_rate=1.0, latency=1.5, leak=0.2),
+    }
+    for tank_name, tank in tanks.items():
+        print(f"{tank_name}, {duration:.0f} s, target 30% <-> 70%")
+        print(f"{'policy':>20} {'commands':>9} {'switches':>9} {'per min':>8} {'overshoot %':>12} "
+              f"{'settling s':>11} {'error %':>8}")
+        policies = [
+            ("500 ms timer", _legacy_policy()),
+            ("bang-bang, band 2", _engine_policy(BangBangLaw(2.0))),
+            ("PI", _engine_policy(PILaw())),
+            ("PID", _engine_policy(PIDLaw())),
+        ]
+        for name, policy in policies:
+            result = simulate(policy, setpoints, duration, **tank)
+            print(f"{name:>20} {result.commands:9d} {result.valve_switches:9d} {result.switches_per_minute:8.1f} "
+                  f"{result.overshoot:12.2f} {result.settling_time:11.1f} {result.tracking_error:8.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,174 @@
+# ========================
+#         Imports
+# ========================
+import struct
+from functools import partial
+
+from payload_parsers import (
+    LedEvent, WeatherReading, WaterLevelReading, LoadReading, MpuReading, GasReading,
+    parse_led_event, parse_weather, parse_water_level, parse_load, decode_mpu6050, decode_gas,
+)
+
+
+# ========================
+#      Frame Layout
+# ========================
+# byte 0     MAGIC (0xA5; no text or JSON payload starts with it)
+# byte 1     VERSION
+# byte 2     schema id
+# byte 3..   body, little-endian struct of the schema
+#
+# Boards keep publishing the text formats until they are asked for frames
+# with "wire_format <topic> binary <version> <schema id>" on mqtt/request,
+# and go back to text on "wire_format <topic> text". Receivers detect the
+# format of every message, so both can arrive on the same topic.
+MAGIC = 0xA5
+VERSION = 1
+HEADER_SIZE = 3
+_MAGIC_BYTE = bytes((MAGIC,))
+
+WIRE_TEXT = "text"
+WIRE_BINARY = "binary"
+
+_tuple = tuple.__new__
+
+
+# ========================
+#     Schema Class
+# ========================
+class Schema:
+    """Binary body layout and text fallback of one sensor payload."""
+
+    def __init__(self, schema_id, name, body_format, reading_type, parse_text,
+                 from_values=None, to_values=None):
+        self.id = schema_id
+        self.name = name
+        self.body = struct.Struct("<" + body_format)
+        self.header = bytes((MAGIC, VERSION, schema_id))
+        self.size = HEADER_SIZE + self.body.size
+        self.reading_type = reading_type
+        self.parse_text = parse_text
+        # By default the body fields are the reading fields, in order
+        self.from_values = from_values or partial(_tuple, reading_type)
+        self.to_values = to_values or tuple
+
+    def __repr__(self):
+        return f"Schema({self.id}, {self.name!r}, {self.body.format!r})"
+
+
+def _text(parser):
+    # --- Text parsers take str; payloads arrive as bytes ---
+    def parse(payload):
+        try:
+            return parser(payload.decode())
+        except UnicodeDecodeError:
+            return None
+    return parse
+
+
+SCHEMA_LED = Schema(1, "led", "B?", LedEvent, _text(parse_led_event))
+SCHEMA_WEATHER = Schema(2, "weather", "3f", WeatherReading, _text(parse_weather))
+SCHEMA_WATER_LEVEL = Schema(3, "water_level", "B", WaterLevelReading, _text(parse_water_level),
+                            to_values=lambda reading: (round(reading.level),))
+SCHEMA_LOAD = Schema(4, "load", "f", LoadReading, _text(parse_load),
+                     from_values=lambda values: LoadReading(values[0], "kg"),
+                     to_values=lambda reading: (reading.weight,))
+SCHEMA_MPU6050 = Schema(5, "mpu6050", "7f", MpuReading, decode_mpu6050)
+SCHEMA_GAS = Schema(6, "gas", "2f", GasReading, decode_gas)
+
+SCHEMAS = {schema.id: schema for schema in (
+    SCHEMA_LED, SCHEMA_WEATHER, SCHEMA_WATER_LEVEL, SCHEMA_LOAD, SCHEMA_MPU6050, SCHEMA_GAS)}
+
+
+# ========================
+#   Encoding / Decoding
+# ========================
+def is_binary(payload):
+    return payload[:1] == _MAGIC_BYTE
+
+
+def encode(schema, reading):
+    # --- Binary frame for a reading of the schema ---
+    return schema.header + schema.body.pack(*schema.to_values(reading))
+
+
+def decode(payload):
+    # --- Reading of any schema from a binary frame, or None ---
+    if len(payload) < HEADER_SIZE or payload[0] != MAGIC or payload[1] != VERSION:
+        return None
+    schema = SCHEMAS.get(payload[2])
+    if schema is None or len(payload) != schema.size:
+        return None
+    return schema.from_values(schema.body.unpack_from(payload, HEADER_SIZE))
+
+
+def read(schema, payload):
+    """Typed reading of the schema from a binary frame or its text format.
+
+    Returns None for a frame of another schema or version, or for text
+    that does not parse.
+    """
+    if payload[:1] != _MAGIC_BYTE:
+        return schema.parse_text(payload)
+    if payload[:HEADER_SIZE] != schema.header or len(payload) != schema.size:
+        return None
+    return schema.from_values(schema.body.unpack_from(payload, HEADER_SIZE))
+
+
+def format_request(topic, wire_format, schema=None):
+    # --- Message asking the publisher of topic to switch format ---
+    if wire_format == WIRE_BINARY:
+        return f"wire_format {topic} {WIRE_BINARY} {VERSION} {schema.id}"
+    return f"wire_format {topic} {WIRE_TEXT}"
+
+
+# ========================
+#        Benchmark
+# ========================
+def _benchmark(count=200_000):
+    # --- Bytes and decode time per sample, text payloads vs binary frames ---
+    import random
+    import time
+
+    rng = random.Random(0)
+
+    def weather():
+        t = rng.uniform(-40, 80)
+        return WeatherReading(t, t * 9 / 5 + 32, rng.uniform(0, 100))
+
+    samples = {
+        SCHEMA_LED: lambda: LedEvent(rng.randint(1, 5), rng.random() < 0.5),
+        SCHEMA_WEATHER: weather,
+        SCHEMA_WATER_LEVEL: lambda: WaterLevelReading(rng.randint(0, 100)),
+        SCHEMA_LOAD: lambda: LoadReading(rng.uniform(0, 50), "kg"),
+        SCHEMA_MPU6050: lambda: MpuReading(*(rng.uniform(-10, 40) for _ in range(7))),
+        SCHEMA_GAS: lambda: GasReading(rng.uniform(0, 1000), rng.uniform(0, 3.3)),
+    }
+    # The firmware's text formats, as built with String(value, decimals)
+    as_text = {
+        SCHEMA_LED: lambda r: f"leds{r.led} {'ON' if r.on else 'OFF'}",
+        SCHEMA_WEATHER: lambda r: f"Temperature: {r.temp_c:.1f}°C, Temperature: {r.temp_f:.1f}°F, Humidity: {r.humidity:.1f}%",
+        SCHEMA_WATER_LEVEL: lambda r: f"Water Level: {r.level}",
+        SCHEMA_LOAD: lambda r: f"Load: {r.weight:.2f} kg",
+        SCHEMA_MPU6050: lambda r: '{"accelX":%.2f,"accelY":%.2f,"accelZ":%.2f,"gyroX":%.2f,"gyroY":%.2f,"gyroZ":%.2f,"temp":%.2f}' % r,
+        SCHEMA_GAS: lambda r: '{"gas_ppm":%d,"voltage":%.2f}' % r,
+    }
+
+    print(f"{'schema':>12} {'text B':>7} {'binary B':>8} {'text ns':>8} {'binary ns':>9}")
+    for schema, make in samples.items():
+        readings = [make() for _ in range(count)]
+        text = [as_text[schema](r).encode() for r in readings]
+        frames = [encode(schema, r) for r in readings]
+
+        timings = []
+        for payloads in (text, frames):
+            start = time.perf_counter()
+            for payload in payloads:
+                read(schema, payload)
+            timings.append((time.perf_counter() - start) / count * 1e9)
+        text_bytes = sum(map(len, text)) / count
+        print(f"{schema.name:>12} {text_bytes:7.1f} {schema.size:8d} {timings[0]:8.0f} {timings[1]:9.0f}")
+
+
+if __name__ == "__main__":
+    _benchmark()